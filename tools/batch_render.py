@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+VHF Batch Renderer (CC-116)
+Render every ontology in a directory to HTML/PNG/SVG across a process pool.
+
+Usage:
+    python batch_render.py ../PBS/ONTOLOGIES                     # HTML + PNG into rendered/
+    python batch_render.py ../PBS/ONTOLOGIES -o out -f html svg  # Choose outputs
+    python batch_render.py ../PBS/ONTOLOGIES --workers 4 --force # Re-render everything
+
+Outputs whose input file and render options are unchanged since the last
+run are skipped (tracked in <output>/.render-manifest.json).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Add tools to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ontology_cache import default_cache, file_digest
+
+FORMATS = ('html', 'png', 'svg')
+DEFAULT_FORMATS = ('html', 'png')
+ONTOLOGY_PATTERNS = ('*.json', '*.jsonld')
+MANIFEST_NAME = '.render-manifest.json'
+
+
+@dataclass
+class RenderResult:
+    """Outcome of rendering one ontology file."""
+    path: str
+    outputs: Dict[str, str] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+    skipped: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if every requested output was rendered or up to date."""
+        return self.error is None
+
+    @property
+    def seconds(self) -> float:
+        """Total render time (load, build and all formats)."""
+        return sum(self.timings.values())
+
+
+def find_ontologies(input_dir: str | Path, exclude: Optional[str | Path] = None) -> List[Path]:
+    """
+    Ontology files (*.json, *.jsonld) under a directory, sorted.
+
+    Args:
+        input_dir: Directory searched recursively
+        exclude: Directory to leave out (e.g. an output directory inside input_dir)
+    """
+    root = Path(input_dir)
+    skip = Path(exclude).resolve() if exclude is not None else None
+    found = set()
+    for pattern in ONTOLOGY_PATTERNS:
+        for p in root.rglob(pattern):
+            if not p.is_file() or p.name == MANIFEST_NAME:
+                continue
+            if skip is not None and p.resolve().is_relative_to(skip):
+                continue
+            found.add(p)
+    return sorted(found)
+
+
+def _output_stems(root: Path, paths: Sequence[Path]) -> Dict[Path, str]:
+    """
+    Output path (relative, without format suffix) per input file.
+
+    Inputs map to their path minus the extension (sub/b.jsonld -> sub/b);
+    files sharing a stem in one directory (foo.json, foo.jsonld) keep their
+    full name (foo.json, foo.jsonld) so neither overwrites the other.
+    """
+    stems = {path: path.relative_to(root).with_suffix('').as_posix() for path in paths}
+    counts: Dict[str, int] = {}
+    for stem in stems.values():
+        counts[stem] = counts.get(stem, 0) + 1
+    return {
+        path: stem if counts[stem] == 1 else path.relative_to(root).as_posix()
+        for path, stem in stems.items()
+    }
+
+
+def render_batch(
+    input_dir: str | Path,
+    output_dir: str | Path = 'rendered',
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    workers: Optional[int] = None,
+    force: bool = False,
+    layout: str = 'spring'
+) -> List[RenderResult]:
+    """
+    Render all ontologies in a directory.
+
+    Args:
+        input_dir: Directory searched recursively for ontology files
+        output_dir: Directory for outputs (mirrors the input tree)
+        formats: Any of html, png, svg
+        workers: Worker processes (default: CPU count; 1 renders in-process)
+        force: Re-render outputs even if their input is unchanged
+        layout: Layout for static images (see OntologyVisualiser.render_matplotlib)
+
+    Returns:
+        One RenderResult per ontology file, in path order
+    """
+    unknown = set(formats) - set(FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown formats: {sorted(unknown)} (expected any of {FORMATS})")
+
+    root = Path(input_dir)
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest(out)
+    options = {'layout': layout}
+
+    results: List[Optional[RenderResult]] = []
+    jobs: List[Tuple[int, Tuple]] = []
+    fingerprints: Dict[str, Dict[str, Any]] = {}
+    paths = find_ontologies(root, exclude=out)
+    stems = _output_stems(root, paths)
+    for path in paths:
+        key = path.relative_to(root).as_posix()
+        entry = manifest.get(key, {})
+        fingerprint = _fingerprint(path, entry)
+        fingerprints[key] = fingerprint
+
+        targets = {fmt: out / f'{stems[path]}.{fmt}' for fmt in formats}
+        fresh = (not force and entry.get('digest') == fingerprint['digest']
+                 and entry.get('options') == options)
+        todo = [fmt for fmt, target in targets.items()
+                if not (fresh and fmt in entry.get('outputs', {}) and target.exists())]
+
+        result = RenderResult(str(path), skipped=[fmt for fmt in formats if fmt not in todo])
+        result.outputs = {fmt: str(targets[fmt]) for fmt in result.skipped}
+        results.append(result)
+        if todo:
+            jobs.append((len(results) - 1, (str(path), {fmt: str(targets[fmt]) for fmt in todo}, options)))
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        # Rendered in-process: leave the caller's matplotlib backend alone
+        outcomes = [_render_worker(job) for _, job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            outcomes = list(pool.map(_render_worker, [job for _, job in jobs]))
+
+    for (i, _), (outputs, timings, error) in zip(jobs, outcomes):
+        results[i].outputs.update(outputs)
+        results[i].timings = timings
+        results[i].error = error
+
+    # Remember what is now up to date
+    for result in results:
+        key = Path(result.path).relative_to(root).as_posix()
+        if not result.ok:
+            manifest.pop(key, None)
+            continue
+        entry = manifest.get(key, {})
+        if entry.get('digest') != fingerprints[key]['digest'] or entry.get('options') != options:
+            entry = {'outputs': {}}
+        entry.update(fingerprints[key], options=options)
+        entry['outputs'].update(
+            {fmt: Path(target).relative_to(out).as_posix() for fmt, target in result.outputs.items()}
+        )
+        manifest[key] = entry
+    _write_manifest(out, manifest)
+
+    return results
+
+
+def print_summary(results: List[RenderResult]) -> None:
+    """Print per-file timings and totals."""
+    print(f"{'file':<48} {'status':<10} {'seconds':>8}  details")
+    for r in results:
+        name = Path(r.path).name
+        if not r.ok:
+            status, details = 'FAILED', r.error
+        elif not r.timings:
+            status, details = 'skipped', 'unchanged'
+        else:
+            status = 'rendered'
+            details = ' '.join(f"{step}={seconds:.2f}s" for step, seconds in r.timings.items())
+            if r.skipped:
+                details += f" (unchanged: {', '.join(r.skipped)})"
+        print(f"{name:<48} {status:<10} {r.seconds:>8.2f}  {details}")
+
+    rendered = sum(1 for r in results if r.ok and r.timings)
+    failed = sum(1 for r in results if not r.ok)
+    print(f"\n{len(results)} files: {rendered} rendered, {len(results) - rendered - failed} skipped, "
+          f"{failed} failed; {sum(r.seconds for r in results):.2f}s total render time")
+
+
+def _fingerprint(path: Path, entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Size, mtime and content digest; the digest is reused when size and mtime match."""
+    stat = path.stat()
+    if entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('digest'):
+        digest = entry['digest']
+    else:
+        digest = file_digest(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+
+
+def _read_manifest(output_dir: Path) -> Dict[str, Any]:
+    """Previous run's manifest, or an empty one."""
+    try:
+        with open(output_dir / MANIFEST_NAME, encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if isinstance(manifest, dict) else {}
+
+
+def _write_manifest(output_dir: Path, manifest: Dict[str, Any]) -> None:
+    """Atomically replace the manifest."""
+    path = output_dir / MANIFEST_NAME
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def _init_worker() -> None:
+    """Use the non-interactive Agg backend in render processes."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg', force=True)
+    except ImportError:
+        pass
+
+
+@contextmanager
+def _working_directory(path: Path) -> Iterator[None]:
+    """Temporarily change the current directory."""
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _render_worker(job: Tuple[str, Dict[str, str], Dict[str, Any]]) -> Tuple[Dict[str, str], Dict[str, float], Optional[str]]:
+    """Process pool entry point: load, build and render one file, returning (outputs, timings, error)."""
+    from ontology_loader import OntologyLoader
+    from graph_builder import OntologyGraphBuilder
+    from layout_engine import LayoutEngine, default_layout_cache
+    from visualiser import OntologyVisualiser
+
+    path, targets, options = job
+    outputs: Dict[str, str] = {}
+    timings: Dict[str, float] = {}
+    try:
+        start = time.perf_counter()
+        ontology = OntologyLoader(cache=default_cache()).load_file(path)
+        G = OntologyGraphBuilder().build_graph(ontology)
+        timings['load'] = time.perf_counter() - start
+
+        vis = OntologyVisualiser(layout_engine=LayoutEngine(default_layout_cache()))
+        for fmt, target in targets.items():
+            start = time.perf_counter()
+            Path(target).parent.mkdir(parents=True, exist_ok=True)
+            if fmt == 'html':
+                # pyvis copies its JS/CSS into ./lib, which the page links relatively
+                html = Path(target).resolve()
+                with _working_directory(html.parent):
+                    vis.render_pyvis(G, str(html))
+            else:
+                vis.render_matplotlib(G, target, layout=options['layout'])
+            timings[fmt] = time.perf_counter() - start
+            outputs[fmt] = target
+    except Exception as e:
+        return outputs, timings, f"{type(e).__name__}: {e}"
+    return outputs, timings, None
+
+
+def main(argv: List[str] = None) -> int:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('input_dir', help='Directory of ontology files (searched recursively)')
+    parser.add_argument('-o', '--output-dir', default='rendered')
+    parser.add_argument('-f', '--formats', nargs='+', choices=FORMATS, default=list(DEFAULT_FORMATS))
+    parser.add_argument('-w', '--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--layout', default='spring', help='Layout for PNG/SVG output')
+    parser.add_argument('--force', action='store_true', help='Re-render unchanged inputs')
+    args = parser.parse_args(argv)
+
+    results = render_batch(
+        args.input_dir, args.output_dir, formats=args.formats,
+        workers=args.workers, force=args.force, layout=args.layout
+    )
+    print_summary(results)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
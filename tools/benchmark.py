@@ -0,0 +1,395 @@
+#!/usr/bin/env python3
+"""
+VHF Ontology Tools Benchmarks (CC-111)
+Timing harness for the graph pipeline on synthetic ontologies.
+
+Usage:
+    python benchmark.py build                          # 10k, 100k, 1M entities
+    python benchmark.py build --sizes 10000 50000      # Custom sizes
+    python benchmark.py build --compact --baseline     # Columnar store, compare per-item build
+    python benchmark.py layout --sizes 10000 100000    # Multilevel layout time
+    python benchmark.py eligibility --sizes 100000     # Recipe eligibility queries/s
+    python benchmark.py nutrition --sizes 100000       # Macro target scoring time
+    python benchmark.py mealplan --clients 50          # Weekly meal plans per second
+    python benchmark.py substitution --sizes 100000    # Eligible alternative lookup time
+    python benchmark.py relations --sizes 100000       # Relation index vs edge scan
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+import networkx as nx
+
+# Add tools to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from ontology_loader import Ontology, Entity, Relationship
+from ontology_store import OntologyStore, entity_rows, relationship_rows
+from graph_builder import OntologyGraphBuilder
+from layout_engine import multilevel_layout
+from recipe_eligibility import ClientProfile, RecipeEligibilityIndex
+from nutrition import MacroTarget, NutritionTable, bitset_mask
+from meal_planner import MealPlanner
+from recipe_substitution import SubstitutionIndex
+from relation_index import RelationIndex
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+ENTITY_TYPES = ['Core', 'Framework', 'Supporting', 'Class', 'Agent']
+
+RECIPE_DIETS = [f"diet:d{i}" for i in range(30)]
+RECIPE_ALLERGENS = [f"client:allergen-a{i}" for i in range(14)]
+RECIPE_THEMES = [f"theme:T{i}" for i in range(16)]
+
+
+def synthetic_ontology(
+    n_entities: int,
+    edges_per_entity: float = 2.0,
+    seed: int = 0,
+    compact: bool = False
+) -> Ontology:
+    """
+    Generate a random ontology with a class hierarchy and cross links.
+
+    About 1% of relationship endpoints and parents point outside the
+    ontology so placeholder node creation is exercised too.
+
+    Args:
+        n_entities: Number of entities
+        edges_per_entity: Average relationships per entity
+        seed: Random seed
+        compact: Store entities/relationships in an OntologyStore
+
+    Returns:
+        Synthetic Ontology
+    """
+    rng = random.Random(seed)
+
+    def ref(i: int) -> str:
+        return f"ext:E{i}" if rng.random() < 0.01 else f"syn:E{i}"
+
+    entities = [
+        Entity(
+            id=f"syn:E{i}",
+            label=f"Entity {i}",
+            description=f"Synthetic entity {i}",
+            entity_type=ENTITY_TYPES[i % len(ENTITY_TYPES)],
+            parent_class=ref(rng.randrange(i)) if i and rng.random() < 0.5 else None
+        )
+        for i in range(n_entities)
+    ]
+    relationships = []
+    for r in range(int(n_entities * edges_per_entity)):
+        source = ref(rng.randrange(n_entities))
+        target = ref(rng.randrange(n_entities))
+        relationships.append(Relationship(f"syn:rel{r}", f"relatesTo{r % 16}", source, target))
+
+    if compact:
+        store = OntologyStore.from_items(entities, relationships)
+        entities, relationships = store.entities, store.relationships
+
+    return Ontology(
+        id="syn:ontology",
+        name=f"Synthetic {n_entities}",
+        version="1.0.0",
+        description="Synthetic benchmark ontology",
+        context={"syn": "https://example.org/synthetic/"},
+        entities=entities,
+        relationships=relationships
+    )
+
+
+def synthetic_recipes(n_recipes: int, seed: int = 0) -> Ontology:
+    """
+    Generate a recipe catalogue shaped like the Recipe & Meal Plan test data.
+
+    Each recipe suits about a third of RECIPE_DIETS (some conditionally),
+    excludes most RECIPE_ALLERGENS, belongs to one to three themes and has
+    a nutrition block with string values ("380 kcal", "42g", "180mg").
+
+    Args:
+        n_recipes: Number of recipes
+        seed: Random seed
+
+    Returns:
+        Ontology of recipe:Recipe individuals and their references
+    """
+    rng = random.Random(seed)
+    entities = []
+    relationships = []
+
+    def link(source: str, predicate: str, target: str, description: str = "") -> None:
+        relationships.append(Relationship(f"{source}|{predicate}|{target}", predicate, source, target, "", description))
+
+    for i in range(n_recipes):
+        recipe = f"recipe:syn-{i}"
+        entities.append(Entity(recipe, f"Recipe {i}", entity_type="recipe:Recipe"))
+        for diet in rng.sample(RECIPE_DIETS, rng.randint(5, 15)):
+            link(recipe, 'recipe:suitableForDietType', diet, "note: with substitution" if rng.random() < 0.1 else "")
+        for allergen in RECIPE_ALLERGENS:
+            if rng.random() < 0.8:
+                link(recipe, 'recipe:excludesAllergen', allergen)
+        for theme in rng.sample(RECIPE_THEMES, rng.randint(1, 3)):
+            link(recipe, 'recipe:belongsToTheme', theme)
+
+        protein, carbs, fat = rng.randint(5, 60), rng.randint(5, 90), rng.randint(3, 40)
+        nutrition = f"{recipe}/nutrition"
+        entities.append(Entity(nutrition, "nutrition", entity_type="NutritionInformation", properties={
+            'calories': f"{4 * (protein + carbs) + 9 * fat} kcal",
+            'proteinContent': f"{protein}g",
+            'carbohydrateContent': f"{carbs}g",
+            'fatContent': f"{fat}g",
+            'fiberContent': f"{rng.randint(0, 15)}g",
+            'sodiumContent': f"{rng.randint(50, 1200)}mg",
+        }))
+        link(recipe, 'nutrition', nutrition)
+
+    return Ontology(
+        id="syn:recipes",
+        name=f"Synthetic recipes {n_recipes}",
+        version="1.0.0",
+        description="Synthetic recipe catalogue",
+        context={"recipe": "https://viridian.app/ontology/vhf/recipe/"},
+        entities=entities,
+        relationships=relationships
+    )
+
+
+def build_graph_per_item(ontology: Ontology) -> nx.DiGraph:
+    """Reference builder inserting one node/edge per call (pre-batching behaviour)."""
+    builder = OntologyGraphBuilder()
+    G = nx.DiGraph()
+    for entity_id, label, description, entity_type, properties, _ in entity_rows(ontology.entities):
+        G.add_node(entity_id, label=label, description=description, entity_type=entity_type,
+                   properties=properties, node_type='entity',
+                   color=builder._get_entity_color(entity_type))
+    for rel_id, label, source, target, cardinality, description in relationship_rows(ontology.relationships):
+        if source and target:
+            if source not in G:
+                G.add_node(source, label=source, node_type='entity')
+            if target not in G:
+                G.add_node(target, label=target, node_type='entity')
+            G.add_edge(source, target, id=rel_id, label=label, cardinality=cardinality,
+                       description=description, edge_type='relationship', color='#666666')
+    for entity_id, _, _, _, _, parent_id in entity_rows(ontology.entities):
+        if parent_id:
+            if parent_id not in G:
+                G.add_node(parent_id, label=parent_id, node_type='external')
+            G.add_edge(entity_id, parent_id, label='subClassOf', edge_type='inheritance',
+                       color='#999999', style='dashed')
+    return G
+
+
+def time_call(func: Callable, *args, repeat: int = 1) -> Tuple[float, object]:
+    """Best wall-clock time over repeat runs, with the last result."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def bench_build(sizes: List[int], compact: bool = False, baseline: bool = False, repeat: int = 1) -> None:
+    """Print graph build times for synthetic ontologies of each size."""
+    builder = OntologyGraphBuilder()
+    header = f"{'entities':>10} {'rels':>10} {'nodes':>10} {'edges':>10} {'build (s)':>10}"
+    if baseline:
+        header += f" {'per-item (s)':>13} {'speedup':>8}"
+    print(header)
+
+    for n in sizes:
+        ontology = synthetic_ontology(n, compact=compact)
+        elapsed, G = time_call(builder.build_graph, ontology, repeat=repeat)
+        line = (f"{n:>10,} {len(ontology.relationships):>10,} "
+                f"{G.number_of_nodes():>10,} {G.number_of_edges():>10,} {elapsed:>10.2f}")
+        del G
+
+        if baseline:
+            reference, _ = time_call(build_graph_per_item, ontology, repeat=repeat)
+            line += f" {reference:>13.2f} {reference / elapsed:>7.2f}x"
+        print(line, flush=True)
+
+
+def bench_layout(sizes: List[int], layered: bool = False, repeat: int = 1) -> None:
+    """Print multilevel layout times for graphs of synthetic ontologies of each size."""
+    builder = OntologyGraphBuilder()
+    print(f"{'entities':>10} {'nodes':>10} {'edges':>10} {'layout (s)':>11}")
+
+    for n in sizes:
+        G = builder.build_graph(synthetic_ontology(n))
+        elapsed, _ = time_call(lambda: multilevel_layout(G, seed=0, layered=layered), repeat=repeat)
+        print(f"{n:>10,} {G.number_of_nodes():>10,} {G.number_of_edges():>10,} {elapsed:>11.2f}", flush=True)
+
+
+def bench_eligibility(sizes: List[int], queries: int = 10_000) -> None:
+    """Print recipe eligibility index build time and client query throughput."""
+    rng = random.Random(1)
+    profiles = [
+        ClientProfile(
+            f"client:{i}",
+            diets=rng.sample(RECIPE_DIETS, rng.randint(0, 2)),
+            allergens=rng.sample(RECIPE_ALLERGENS, rng.randint(0, 3)),
+            themes=rng.sample(RECIPE_THEMES, rng.randint(0, 3))
+        )
+        for i in range(queries)
+    ]
+    print(f"{'recipes':>10} {'build (s)':>10} {'queries/s':>11} {'mean eligible':>14}")
+
+    for n in sizes:
+        ontology = synthetic_recipes(n)
+        build_time, index = time_call(RecipeEligibilityIndex.from_ontology, ontology)
+        del ontology
+
+        start = time.perf_counter()
+        counts = [index.count(index.eligible_for(profile, require_theme=True)) for profile in profiles]
+        elapsed = time.perf_counter() - start
+        print(f"{n:>10,} {build_time:>10.2f} {len(profiles) / elapsed:>11,.0f} {sum(counts) / len(counts):>14,.0f}",
+              flush=True)
+
+
+def bench_nutrition(sizes: List[int], queries: int = 100) -> None:
+    """Print nutrition parse time and time to rank every recipe against a macro target."""
+    rng = random.Random(2)
+    targets = [
+        MacroTarget(rng.randint(1400, 3000), rng.randint(60, 200), rng.randint(100, 400), rng.randint(40, 120))
+        for _ in range(queries)
+    ]
+    profile = ClientProfile("client:bench", diets=RECIPE_DIETS[:1], allergens=RECIPE_ALLERGENS[:2])
+    print(f"{'recipes':>10} {'parse (s)':>10} {'score (ms)':>11} {'top 10 (ms)':>12} {'eligible top 10 (ms)':>21}")
+
+    for n in sizes:
+        ontology = synthetic_recipes(n)
+        parse_time, table = time_call(NutritionTable.from_ontology, ontology)
+        index = RecipeEligibilityIndex.from_ontology(ontology)
+        del ontology
+
+        score_time = min(time_call(table.score, target)[0] for target in targets)
+        rank_time = min(time_call(table.rank, target, 10)[0] for target in targets)
+        eligible = bitset_mask(index.eligible_for(profile), len(table))
+        eligible_time = min(time_call(table.rank, target, 10, eligible)[0] for target in targets)
+        print(f"{n:>10,} {parse_time:>10.2f} {score_time * 1e3:>11.2f} {rank_time * 1e3:>12.2f} "
+              f"{eligible_time * 1e3:>21.2f}", flush=True)
+
+
+def bench_mealplan(sizes: List[int], clients: int = 50, workers: int = None) -> None:
+    """Print weekly meal plan throughput, in-process and across workers."""
+    rng = random.Random(3)
+    requests = [
+        (ClientProfile(f"client:{i}", diets=rng.sample(RECIPE_DIETS, rng.randint(0, 2)),
+                       allergens=rng.sample(RECIPE_ALLERGENS, rng.randint(0, 3))),
+         MacroTarget(rng.randint(1400, 3000), rng.randint(60, 200), rng.randint(100, 400), rng.randint(40, 120)))
+        for i in range(clients)
+    ]
+    print(f"{'recipes':>10} {'plans/s':>9} {'plans/s (pool)':>15} {'complete':>9} {'timed out':>10}")
+
+    for n in sizes:
+        planner = MealPlanner.from_ontology(synthetic_recipes(n))
+        serial_time, plans = time_call(planner.plan_many, requests, 1)
+        pool_time, _ = time_call(planner.plan_many, requests, workers)
+        print(f"{n:>10,} {clients / serial_time:>9.1f} {clients / pool_time:>15.1f} "
+              f"{sum(plan.complete for plan in plans):>9} {sum(plan.timed_out for plan in plans):>10}", flush=True)
+
+
+def bench_substitution(sizes: List[int], queries: int = 10_000) -> None:
+    """Print substitution index build time and eligible-alternative lookup time."""
+    rng = random.Random(4)
+    profiles = [
+        ClientProfile(f"client:{i}", diets=rng.sample(RECIPE_DIETS, rng.randint(0, 2)),
+                      allergens=rng.sample(RECIPE_ALLERGENS, rng.randint(0, 3)))
+        for i in range(queries)
+    ]
+    print(f"{'recipes':>10} {'build (s)':>10} {'lookup (ms)':>12}")
+
+    for n in sizes:
+        build_time, subs = time_call(SubstitutionIndex.from_ontology, synthetic_recipes(n))
+        recipes = [f"recipe:syn-{rng.randrange(n)}" for _ in profiles]
+
+        start = time.perf_counter()
+        for recipe, profile in zip(recipes, profiles):
+            subs.alternatives(recipe, profile, k=5)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>10,} {build_time:>10.2f} {elapsed / queries * 1e3:>12.3f}", flush=True)
+
+
+def bench_relations(sizes: List[int], queries: int = 10_000) -> None:
+    """Print relation index build time and reverse-lookup time against an edge scan."""
+    rng = random.Random(5)
+    print(f"{'entities':>10} {'index (s)':>10} {'lookup (us)':>12} {'scan (ms)':>10}")
+
+    for n in sizes:
+        G = OntologyGraphBuilder().build_graph(synthetic_ontology(n))
+        build_time, index = time_call(RelationIndex, G)
+        lookups = [(f"relatesTo{rng.randrange(16)}", f"syn:E{rng.randrange(n)}") for _ in range(queries)]
+
+        start = time.perf_counter()
+        for predicate, node in lookups:
+            index.sources(predicate, node)
+        lookup_time = (time.perf_counter() - start) / queries
+
+        predicate, node = lookups[0]
+        scan_time, _ = time_call(lambda: [u for u, v, label in G.edges(data='label') if v == node and label == predicate])
+        print(f"{n:>10,} {build_time:>10.2f} {lookup_time * 1e6:>12.2f} {scan_time * 1e3:>10.1f}", flush=True)
+
+
+def main(argv: List[str] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    build = commands.add_parser('build', help='Graph construction time')
+    build.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    build.add_argument('--compact', action='store_true', help='Use columnar OntologyStore input')
+    build.add_argument('--baseline', action='store_true', help='Also time per-item insertion')
+    build.add_argument('--repeat', type=int, default=1)
+
+    layout = commands.add_parser('layout', help='Large-graph layout time')
+    layout.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    layout.add_argument('--layered', action='store_true', help='Use the layered mode')
+    layout.add_argument('--repeat', type=int, default=1)
+
+    eligibility = commands.add_parser('eligibility', help='Recipe eligibility query throughput')
+    eligibility.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    eligibility.add_argument('--queries', type=int, default=10_000)
+
+    nutrition = commands.add_parser('nutrition', help='Macro target scoring time')
+    nutrition.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    nutrition.add_argument('--queries', type=int, default=100)
+
+    mealplan = commands.add_parser('mealplan', help='Weekly meal plan throughput')
+    mealplan.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    mealplan.add_argument('--clients', type=int, default=50)
+    mealplan.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+
+    substitution = commands.add_parser('substitution', help='Eligible alternative lookup time')
+    substitution.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    substitution.add_argument('--queries', type=int, default=10_000)
+
+    relations = commands.add_parser('relations', help='Relation index lookups vs edge scans')
+    relations.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    relations.add_argument('--queries', type=int, default=10_000)
+
+    args = parser.parse_args(argv)
+    if args.command == 'build':
+        bench_build(args.sizes, compact=args.compact, baseline=args.baseline, repeat=args.repeat)
+    elif args.command == 'layout':
+        bench_layout(args.sizes, layered=args.layered, repeat=args.repeat)
+    elif args.command == 'eligibility':
+        bench_eligibility(args.sizes, queries=args.queries)
+    elif args.command == 'nutrition':
+        bench_nutrition(args.sizes, queries=args.queries)
+    elif args.command == 'mealplan':
+        bench_mealplan(args.sizes, clients=args.clients, workers=args.workers)
+    elif args.command == 'substitution':
+        bench_substitution(args.sizes, queries=args.queries)
+    elif args.command == 'relations':
+        bench_relations(args.sizes, queries=args.queries)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,8 @@ Usage:
     python demo.py                    # Demo with sample data
     python demo.py <ontology.json>    # Visualize specific ontology
     python demo.py --framework        # Show W4M framework only
+
+Parsed ontologies are cached on disk; set VHF_ONTOLOGY_CACHE=off to disable.
 """
 
 import sys
@@ -19,6 +21,7 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 
 from ontology_loader import OntologyLoader, Ontology, Entity, Relationship
+from ontology_cache import default_cache
 from graph_builder import OntologyGraphBuilder, get_graph_stats
 from visualiser import OntologyVisualiser
 from ve_domain_graphs import VEDomainGraphBuilder, W4MFramework
@@ -164,7 +167,7 @@ def run_demo(ontology_path: str = None, framework_only: bool = False):
         html_path = generate_framework_html(output_dir)
     elif ontology_path:
         print(f"\nLoading ontology: {ontology_path}")
-        loader = OntologyLoader()
+        loader = OntologyLoader(cache=default_cache())
         ontology = loader.load_file(ontology_path)
         print(f"  Name: {ontology.name}")
         print(f"  Entities: {len(ontology.entities)}")
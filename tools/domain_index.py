@@ -0,0 +1,199 @@
+"""
+VHF Domain Index (CC-117)
+Domain classification of graph nodes, indexed once per graph.
+
+Features:
+- Ordered classification rules (VE, CE, Agent, Framework, Core by default)
+- User-registered rules that take precedence over the defaults
+- Domain -> node set index stored on the graph (G.graph['domain_index'])
+- Incremental maintenance for added, removed and updated nodes
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+DomainRule = Callable[[Any, Dict], bool]
+
+DEFAULT_DOMAIN = 'Core'
+INDEX_KEY = 'domain_index'
+
+
+def _is_agent(node: Any, data: Dict) -> bool:
+    """Agent ids and agent nodes."""
+    return 'agent' in str(node).lower() or data.get('node_type') == 'agent'
+
+
+def _is_ve(node: Any, data: Dict) -> bool:
+    """VSOM / VESM / value ids."""
+    node_lower = str(node).lower()
+    return any(x in node_lower for x in ('vsom', 'vesm', 'value'))
+
+
+def _is_ce(node: Any, data: Dict) -> bool:
+    """Context / organisation ids."""
+    node_lower = str(node).lower()
+    return any(x in node_lower for x in ('context', 'org'))
+
+
+def _is_framework(node: Any, data: Dict) -> bool:
+    """Framework entities."""
+    return data.get('entity_type') == 'Framework'
+
+
+DEFAULT_RULES: List[Tuple[str, DomainRule]] = [
+    ('Agent', _is_agent),
+    ('VE', _is_ve),
+    ('CE', _is_ce),
+    ('Framework', _is_framework),
+]
+
+
+class DomainClassifier:
+    """Assign each node the domain of the first matching rule."""
+
+    def __init__(self, rules: Optional[List[Tuple[str, DomainRule]]] = None, default: str = DEFAULT_DOMAIN):
+        """
+        Initialize the classifier.
+
+        Args:
+            rules: (domain, predicate(node, data)) pairs in priority order
+                (default: DEFAULT_RULES)
+            default: Domain of nodes no rule matches
+        """
+        self.rules = list(DEFAULT_RULES if rules is None else rules)
+        self.default = default
+
+    def register(self, domain: str, rule: DomainRule, first: bool = True) -> None:
+        """
+        Add a classification rule.
+
+        Args:
+            domain: Domain assigned when the rule matches
+            rule: predicate(node, data) -> bool
+            first: Check before existing rules (False: after them)
+        """
+        if first:
+            self.rules.insert(0, (domain, rule))
+        else:
+            self.rules.append((domain, rule))
+
+    def classify(self, node: Any, data: Dict) -> str:
+        """Domain of one node."""
+        for domain, rule in self.rules:
+            if rule(node, data):
+                return domain
+        return self.default
+
+    @property
+    def version(self) -> Tuple:
+        """Identity of the rule set; indexes built with other rules are rebuilt."""
+        return (self.default,) + tuple((domain, id(rule)) for domain, rule in self.rules)
+
+
+class DomainIndex:
+    """Domain -> node set mapping for one graph."""
+
+    def __init__(self, classifier: DomainClassifier):
+        """Create an empty index for a classifier (see domain_index to build one)."""
+        self.classifier = classifier
+        self.version = classifier.version
+        self.owner: Optional[nx.DiGraph] = None
+        self.node_domain: Dict[Any, str] = {}
+        self.members: Dict[str, Set] = {}
+
+    def nodes(self, domain: str) -> Set:
+        """Nodes in a domain (the index's own set; do not modify)."""
+        return self.members.get(domain, set())
+
+    def domains(self) -> List[str]:
+        """Domains with at least one node."""
+        return [domain for domain, nodes in self.members.items() if nodes]
+
+    def update(self, G: nx.DiGraph, nodes: Iterable = (), removed: Iterable = ()) -> None:
+        """
+        Reclassify added or changed nodes and drop removed ones.
+
+        Args:
+            G: Indexed graph
+            nodes: Nodes whose id or attributes are new or changed
+            removed: Nodes no longer in the graph
+        """
+        for node in removed:
+            domain = self.node_domain.pop(node, None)
+            if domain is not None:
+                self.members[domain].discard(node)
+
+        classify = self.classifier.classify
+        for node in nodes:
+            domain = classify(node, G.nodes[node])
+            previous = self.node_domain.get(node)
+            if previous == domain:
+                continue
+            if previous is not None:
+                self.members[previous].discard(node)
+            self.node_domain[node] = domain
+            self.members.setdefault(domain, set()).add(node)
+
+    def sync(self, G: nx.DiGraph) -> None:
+        """Index nodes added and drop nodes removed since the last update."""
+        if G.nodes.keys() == self.node_domain.keys():
+            return
+        added = [node for node in G if node not in self.node_domain]
+        removed = [node for node in self.node_domain if node not in G]
+        self.update(G, added, removed)
+
+    def __getstate__(self) -> Dict:
+        """Pickle the index data only; the classifier and owner are re-attached on use."""
+        state = self.__dict__.copy()
+        state['classifier'] = None
+        state['owner'] = None
+        return state
+
+
+def domain_index(G: nx.DiGraph, classifier: Optional[DomainClassifier] = None) -> DomainIndex:
+    """
+    Domain index of a graph, built on first use and kept in G.graph.
+
+    The stored index is reused while the classifier's rules are unchanged.
+    Nodes added or removed since the last call are indexed incrementally;
+    GraphDelta.apply keeps it up to date for attribute changes too.
+    Subgraph views share G.graph with their graph, so they get a
+    temporary index instead of replacing the stored one.
+
+    Args:
+        G: Graph to index
+        classifier: Classification rules (default: DomainClassifier())
+
+    Returns:
+        DomainIndex for G
+    """
+    classifier = classifier or DomainClassifier()
+    index = G.graph.get(INDEX_KEY)
+    if isinstance(index, DomainIndex) and index.version == classifier.version:
+        if index.owner is None and index.node_domain.keys() == G.nodes.keys():
+            index.owner = G  # unpickled with its graph
+        if index.owner is G:
+            index.classifier = classifier
+            index.sync(G)
+            return index
+
+    index = DomainIndex(classifier)
+    index.update(G, G)
+    if not _is_view(G):
+        index.owner = G
+        G.graph[INDEX_KEY] = index
+    return index
+
+
+def update_domain_index(G: nx.DiGraph, nodes: Iterable = (), removed: Iterable = ()) -> None:
+    """Apply node changes to G's stored domain index, if it has one."""
+    index = G.graph.get(INDEX_KEY)
+    if isinstance(index, DomainIndex) and index.owner is G and index.classifier is not None:
+        index.update(G, nodes, removed)
+        index.sync(G)  # nodes created implicitly by new edges
+
+
+def _is_view(G: nx.DiGraph) -> bool:
+    """True for subgraph/restricted views, which share their graph's G.graph."""
+    return hasattr(G, '_graph')
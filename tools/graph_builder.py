@@ -10,19 +10,134 @@ Features:
 - VE value chain paths
 """
 
+import gc
+import json
+import hashlib
 import networkx as nx
-from typing import Dict, List, Any, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
 from ontology_loader import Ontology, Entity, Relationship, OntologyLoader
+from ontology_cache import OntologyCache
+from ontology_store import entity_rows, relationship_rows
+from domain_index import update_domain_index
+from relation_index import drop_relation_index, relation_index
+from node_id_index import drop_node_id_index
+
+
+@contextmanager
+def _gc_paused():
+    """
+    Suspend cyclic garbage collection during bulk graph construction.
+
+    Building a large graph allocates millions of attribute dicts, and each
+    collection pass rescans all of them without freeing anything.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@dataclass
+class GraphDelta:
+    """
+    Node and edge changes between two versions of an ontology graph.
+
+    Added/updated entries hold the complete new attribute dicts. Node ids are
+    ontology ids; derived graphs that rename nodes pass a node_map to apply().
+    """
+    nodes_added: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    nodes_updated: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    nodes_removed: List[str] = field(default_factory=list)
+    edges_added: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    edges_updated: Dict[Tuple[str, str], Dict[str, Any]] = field(default_factory=dict)
+    edges_removed: List[Tuple[str, str]] = field(default_factory=list)
+    entity_ids: Set[str] = field(default_factory=set)
+    relationship_ids: Set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        """True when the graph is unaffected."""
+        return not (self.nodes_added or self.nodes_updated or self.nodes_removed or
+                    self.edges_added or self.edges_updated or self.edges_removed)
+
+    def apply(self, G: nx.DiGraph, node_map: Optional[Callable[[str], Any]] = None) -> None:
+        """
+        Patch a graph in place.
+
+        Args:
+            G: Graph containing the old version's nodes and edges
+            node_map: Maps ontology node ids to node ids in G (default: identity)
+        """
+        rename = node_map or (lambda node: node)
+
+        for u, v in self.edges_removed:
+            u, v = rename(u), rename(v)
+            if G.has_edge(u, v):
+                G.remove_edge(u, v)
+        for node in self.nodes_removed:
+            node = rename(node)
+            if node in G:
+                G.remove_node(node)
+
+        for node, attrs in self.nodes_updated.items():
+            data = G.nodes[rename(node)]
+            data.clear()
+            data.update(attrs)
+        G.add_nodes_from((rename(node), attrs) for node, attrs in self.nodes_added.items())
+
+        for (u, v), attrs in self.edges_updated.items():
+            data = G.edges[rename(u), rename(v)]
+            data.clear()
+            data.update(attrs)
+        G.add_edges_from((rename(u), rename(v), attrs) for (u, v), attrs in self.edges_added.items())
+
+        update_domain_index(
+            G,
+            [rename(node) for node in (*self.nodes_updated, *self.nodes_added)],
+            [rename(node) for node in self.nodes_removed]
+        )
+        drop_relation_index(G)
+        drop_node_id_index(G)
 
 
 class OntologyGraphBuilder:
     """Build NetworkX graphs from ontology structures."""
 
-    def __init__(self):
-        """Initialize the graph builder."""
+    ENTITY_COLORS = {
+        'Core': '#4CAF50',      # Green
+        'Framework': '#2196F3',  # Blue
+        'Supporting': '#FF9800', # Orange
+        'External': '#9E9E9E',   # Grey
+        'Class': '#673AB7',      # Purple
+        'Agent': '#E91E63',      # Pink
+    }
+    DEFAULT_ENTITY_COLOR = '#607D8B'  # Blue-grey
+
+    INHERITANCE_ATTRS = {
+        'label': 'subClassOf',
+        'edge_type': 'inheritance',
+        'color': '#999999',
+        'style': 'dashed'
+    }
+
+    def __init__(self, cache: Optional[OntologyCache] = None, index_relations: bool = False):
+        """
+        Initialize the graph builder.
+
+        Args:
+            cache: Graph cache for from_file
+            index_relations: Build the relation index (see relation_index)
+                with each graph and rebuild it after update_graph
+        """
         self.loader = OntologyLoader()
+        self.cache = cache
+        self.index_relations = index_relations
 
     def build_graph(self, ontology: Ontology) -> nx.DiGraph:
         """
@@ -37,92 +152,220 @@ class OntologyGraphBuilder:
         G = nx.DiGraph()
 
         # Add metadata to graph
-        G.graph['name'] = ontology.name
-        G.graph['version'] = ontology.version
-        G.graph['description'] = ontology.description
-        G.graph['ontology_id'] = ontology.id
+        self._set_graph_metadata(G, ontology)
 
-        # Add entity nodes
-        self._add_entity_nodes(G, ontology.entities)
+        with _gc_paused():
+            # Add entity nodes
+            self._add_entity_nodes(G, ontology.entities)
 
-        # Add relationship edges
-        self._add_relationship_edges(G, ontology.relationships)
+            # Add relationship edges
+            self._add_relationship_edges(G, ontology.relationships)
 
-        # Add inheritance edges (parent class relationships)
-        self._add_inheritance_edges(G, ontology.entities)
+            # Add inheritance edges (parent class relationships)
+            self._add_inheritance_edges(G, ontology.entities)
 
-        # Add business rules as graph attributes
-        G.graph['business_rules'] = ontology.business_rules
+            if self.index_relations:
+                relation_index(G)
 
         return G
 
+    def diff(self, old: Ontology, new: Ontology) -> GraphDelta:
+        """
+        Compute the graph changes between two versions of an ontology.
+
+        Entities are compared by id and relationships by id and content;
+        only nodes and edges they touch (including placeholder nodes for
+        unresolved endpoints and parents) are re-derived.
+
+        Args:
+            old: Ontology the existing graph was built from
+            new: Updated ontology
+
+        Returns:
+            GraphDelta to apply to graphs built from old
+        """
+        with _gc_paused():
+            old_entities, old_parents, old_rels = self._index_rows(old)
+            new_entities, new_parents, new_rels = self._index_rows(new)
+
+        entity_ids = old_entities.keys() ^ new_entities.keys()
+        entity_ids.update(
+            entity_id for entity_id, row in new_entities.items()
+            if entity_id in old_entities and old_entities[entity_id] != row
+        )
+        changed_rels = set(old_rels).symmetric_difference(new_rels)
+
+        pairs = old_parents ^ new_parents
+        pairs.update((row[2], row[3]) for row in changed_rels if row[2] and row[3])
+        nodes = set(entity_ids)
+        nodes.update(node for pair in pairs for node in pair)
+
+        old_nodes, old_edges = self._graph_state(old_entities, old_parents, old_rels, nodes, pairs)
+        new_nodes, new_edges = self._graph_state(new_entities, new_parents, new_rels, nodes, pairs)
+
+        return GraphDelta(
+            nodes_added={n: a for n, a in new_nodes.items() if n not in old_nodes},
+            nodes_updated={n: a for n, a in new_nodes.items() if n in old_nodes and old_nodes[n] != a},
+            nodes_removed=[n for n in old_nodes if n not in new_nodes],
+            edges_added={e: a for e, a in new_edges.items() if e not in old_edges},
+            edges_updated={e: a for e, a in new_edges.items() if e in old_edges and old_edges[e] != a},
+            edges_removed=[e for e in old_edges if e not in new_edges],
+            entity_ids=entity_ids,
+            relationship_ids={row[0] for row in changed_rels}
+        )
+
+    def update_graph(self, G: nx.DiGraph, old: Ontology, new: Ontology) -> GraphDelta:
+        """
+        Patch a graph built from old so it matches build_graph(new).
+
+        Args:
+            G: Graph previously built from old
+            old: Ontology G was built from
+            new: Updated ontology
+
+        Returns:
+            The applied GraphDelta, for patching derived graphs
+        """
+        delta = self.diff(old, new)
+        delta.apply(G)
+        self._set_graph_metadata(G, new)
+        if self.index_relations:
+            relation_index(G)
+        return delta
+
+    def _index_rows(self, ontology: Ontology) -> Tuple[Dict[str, Tuple], Set[Tuple[str, str]], List[Tuple]]:
+        """Entity rows by id, (child, parent) pairs and relationship rows in one pass each."""
+        entities = {}
+        parents = set()
+        for row in entity_rows(ontology.entities):
+            entities[row[0]] = row
+            if row[5]:
+                parents.add((row[0], row[5]))
+        return entities, parents, list(relationship_rows(ontology.relationships))
+
+    def _graph_state(
+        self,
+        entities: Dict[str, Tuple],
+        parents: Set[Tuple[str, str]],
+        relationships: List[Tuple],
+        nodes: Set[str],
+        pairs: Set[Tuple[str, str]]
+    ) -> Tuple[Dict[str, Dict], Dict[Tuple[str, str], Dict]]:
+        """Attributes of the given nodes/edges in the graph of one ontology version."""
+        endpoints = set()
+        edges = {}
+        for row in relationships:
+            source, target = row[2], row[3]
+            if not (source and target):
+                continue
+            if source in nodes:
+                endpoints.add(source)
+            if target in nodes:
+                endpoints.add(target)
+            if (source, target) in pairs:
+                edges.setdefault((source, target), {}).update(self._relationship_attrs(row))
+
+        # Inheritance edges are added last, so they win on shared (child, parent) pairs
+        for pair in parents & pairs:
+            edges.setdefault(pair, {}).update(self.INHERITANCE_ATTRS)
+        external = {parent for _, parent in parents}
+
+        states = {}
+        for node in nodes:
+            if node in entities:
+                states[node] = self._entity_attrs(entities[node])
+            elif node in endpoints:
+                states[node] = {'label': node, 'node_type': 'entity'}
+            elif node in external:
+                states[node] = {'label': node, 'node_type': 'external'}
+        return states, edges
+
+    def _set_graph_metadata(self, G: nx.DiGraph, ontology: Ontology) -> None:
+        """Copy ontology metadata and business rules to graph attributes."""
+        G.graph['name'] = ontology.name
+        G.graph['version'] = ontology.version
+        G.graph['description'] = ontology.description
+        G.graph['ontology_id'] = ontology.id
+        G.graph['business_rules'] = ontology.business_rules
+
+    def _entity_attrs(self, row: Tuple) -> Dict[str, Any]:
+        """Node attributes for an entity row."""
+        entity_id, label, description, entity_type, properties, _ = row
+        return {
+            'label': label,
+            'description': description,
+            'entity_type': entity_type,
+            'properties': properties,
+            'node_type': 'entity',
+            'color': self._get_entity_color(entity_type)
+        }
+
+    def _relationship_attrs(self, row: Tuple) -> Dict[str, Any]:
+        """Edge attributes for a relationship row."""
+        rel_id, label, _, _, cardinality, description = row
+        return {
+            'id': rel_id,
+            'label': label,
+            'cardinality': cardinality,
+            'description': description,
+            'edge_type': 'relationship',
+            'color': '#666666'
+        }
+
     def _add_entity_nodes(self, G: nx.DiGraph, entities: List[Entity]) -> None:
-        """Add entity nodes with attributes."""
-        for entity in entities:
-            G.add_node(
-                entity.id,
-                label=entity.label,
-                description=entity.description,
-                entity_type=entity.entity_type,
-                properties=entity.properties,
-                node_type='entity',
-                color=self._get_entity_color(entity.entity_type)
-            )
+        """Add entity nodes with attributes in a single bulk insert."""
+        entity_attrs = self._entity_attrs
+        G.add_nodes_from((row[0], entity_attrs(row)) for row in entity_rows(entities))
 
     def _add_relationship_edges(self, G: nx.DiGraph, relationships: List[Relationship]) -> None:
-        """Add relationship edges with attributes."""
-        for rel in relationships:
-            if rel.source and rel.target:
-                # Ensure source and target nodes exist
-                if rel.source not in G:
-                    G.add_node(rel.source, label=rel.source, node_type='entity')
-                if rel.target not in G:
-                    G.add_node(rel.target, label=rel.target, node_type='entity')
+        """Add relationship edges with attributes in a single bulk insert."""
+        rows = [row for row in relationship_rows(relationships) if row[2] and row[3]]
+
+        # Placeholder nodes for endpoints that are not entities, in first-seen order
+        endpoints = dict.fromkeys(node for row in rows for node in (row[2], row[3]))
+        G.add_nodes_from(
+            (node, {'label': node, 'node_type': 'entity'})
+            for node in endpoints if node not in G
+        )
 
-                G.add_edge(
-                    rel.source,
-                    rel.target,
-                    id=rel.id,
-                    label=rel.label,
-                    cardinality=rel.cardinality,
-                    description=rel.description,
-                    edge_type='relationship',
-                    color='#666666'
-                )
+        relationship_attrs = self._relationship_attrs
+        G.add_edges_from((row[2], row[3], relationship_attrs(row)) for row in rows)
 
     def _add_inheritance_edges(self, G: nx.DiGraph, entities: List[Entity]) -> None:
-        """Add inheritance edges for class hierarchy."""
-        for entity in entities:
-            if entity.parent_class:
-                parent_id = entity.parent_class
-                if parent_id not in G:
-                    G.add_node(parent_id, label=parent_id, node_type='external')
+        """Add inheritance edges for class hierarchy in a single bulk insert."""
+        pairs = [(row[0], row[5]) for row in entity_rows(entities) if row[5]]
 
-                G.add_edge(
-                    entity.id,
-                    parent_id,
-                    label='subClassOf',
-                    edge_type='inheritance',
-                    color='#999999',
-                    style='dashed'
-                )
+        parents = dict.fromkeys(parent_id for _, parent_id in pairs)
+        G.add_nodes_from(
+            (parent_id, {'label': parent_id, 'node_type': 'external'})
+            for parent_id in parents if parent_id not in G
+        )
+
+        G.add_edges_from(pairs, **self.INHERITANCE_ATTRS)
 
     def _get_entity_color(self, entity_type: str) -> str:
         """Get color based on entity type."""
-        colors = {
-            'Core': '#4CAF50',      # Green
-            'Framework': '#2196F3',  # Blue
-            'Supporting': '#FF9800', # Orange
-            'External': '#9E9E9E',   # Grey
-            'Class': '#673AB7',      # Purple
-            'Agent': '#E91E63',      # Pink
-        }
-        return colors.get(entity_type, '#607D8B')  # Default blue-grey
+        return self.ENTITY_COLORS.get(entity_type, self.DEFAULT_ENTITY_COLOR)
 
     def from_file(self, file_path: str | Path) -> nx.DiGraph:
-        """Load ontology from file and build graph."""
-        ontology = self.loader.load_file(file_path)
-        return self.build_graph(ontology)
+        """Load ontology from file and build graph (cached when configured)."""
+        if self.cache is None:
+            return self.build_graph(self.loader.load_file(file_path))
+
+        path = self.loader._resolve(file_path)
+        namespace = self._cache_namespace()
+        G = self.cache.get(namespace, path)
+        if G is None:
+            G = self.build_graph(self.loader.load_file(path))
+            self.cache.put(namespace, path, G)
+        return G
+
+    def _cache_namespace(self) -> str:
+        """Cache namespace; covers builder and loader options that change the graph."""
+        parts = ["graph"]
+        if self.index_relations:
+            parts.append("relations")
+        return ":".join(parts + [self.loader._cache_namespace()])
 
     def from_json(self, data: Dict[str, Any]) -> nx.DiGraph:
         """Build graph from JSON dict."""
@@ -133,6 +376,8 @@ class OntologyGraphBuilder:
 class AgentContextGraphBuilder:
     """Build graphs showing agent-ontology relationships."""
 
+    BINDING_TYPES = ['CONSUMES', 'PRODUCES', 'REQUIRES']
+
     def __init__(self):
         """Initialize the agent context builder."""
         self.base_builder = OntologyGraphBuilder()
@@ -153,26 +398,64 @@ class AgentContextGraphBuilder:
             Combined graph with agent context
         """
         G = nx.DiGraph()
+        self._add_agents(G, [agent_bindings], ontology_graphs)
+        return G
 
-        # Add agent node
-        agent_id = agent_bindings.get('agentId', 'agent')
-        agent_name = agent_bindings.get('agentName', agent_id)
+    def build_fleet_context_graph(
+        self,
+        agent_specs: Iterable[Dict[str, Any]],
+        ontology_graphs: Dict[str, nx.DiGraph]
+    ) -> nx.DiGraph:
+        """
+        Build one context graph for many agents over shared ontology graphs.
 
-        G.add_node(
-            agent_id,
-            label=agent_name,
-            node_type='agent',
-            color='#E91E63'
-        )
+        Each bound ontology graph is merged once, however many agents and
+        binding types refer to it.
 
-        # Process ontology bindings
-        bindings = agent_bindings.get('ontologyBindings', {})
+        Args:
+            agent_specs: Agent specifications (see load_agent_specs)
+            ontology_graphs: Dict mapping ontology IDs to their graphs
+
+        Returns:
+            Graph with every agent, its binding edges and the bound ontologies
+        """
+        G = nx.DiGraph()
+        with _gc_paused():
+            self._add_agents(G, agent_specs, ontology_graphs)
+        return G
+
+    def _add_agents(
+        self,
+        G: nx.DiGraph,
+        agent_specs: Iterable[Dict[str, Any]],
+        ontology_graphs: Dict[str, nx.DiGraph]
+    ) -> None:
+        """Add agents, their binding edges and each bound ontology graph (once) to G."""
+        agents = [
+            (spec.get('agentId', 'agent'), spec.get('agentName'), self._binding_refs(spec))
+            for spec in agent_specs
+        ]
 
-        for binding_type in ['CONSUMES', 'PRODUCES', 'REQUIRES']:
-            ontologies = bindings.get(binding_type, [])
-            for ont_ref in ontologies:
-                ont_id = ont_ref if isinstance(ont_ref, str) else ont_ref.get('ontologyId', '')
+        # Merge each graph at its last binding: node/edge attributes then resolve
+        # as if the graph were composed in after every binding
+        last_binding = {}
+        position = 0
+        for _, _, refs in agents:
+            for _, ont_id in refs:
+                last_binding[ont_id] = position
+                position += 1
+
+        position = 0
+        for agent_id, agent_name, refs in agents:
+            # Add agent node
+            G.add_node(
+                agent_id,
+                label=agent_name or agent_id,
+                node_type='agent',
+                color='#E91E63'
+            )
 
+            for binding_type, ont_id in refs:
                 # Add ontology node
                 if ont_id not in G:
                     G.add_node(
@@ -189,11 +472,28 @@ class AgentContextGraphBuilder:
                     G.add_edge(ont_id, agent_id, label=binding_type, edge_type='binding')
 
                 # Merge ontology graph if available
-                if ont_id in ontology_graphs:
-                    ont_graph = ontology_graphs[ont_id]
-                    G = nx.compose(G, ont_graph)
+                if ont_id in ontology_graphs and last_binding[ont_id] == position:
+                    merge_graph_into(G, ontology_graphs[ont_id])
+                position += 1
 
-        return G
+    def _binding_refs(self, agent_bindings: Dict[str, Any]) -> List[Tuple[str, str]]:
+        """(binding type, ontology id) pairs in processing order."""
+        bindings = agent_bindings.get('ontologyBindings', {})
+        return [
+            (binding_type, ont_ref if isinstance(ont_ref, str) else ont_ref.get('ontologyId', ''))
+            for binding_type in self.BINDING_TYPES
+            for ont_ref in bindings.get(binding_type, [])
+        ]
+
+    def update_agent_context_graph(self, G: nx.DiGraph, delta: GraphDelta) -> None:
+        """
+        Patch an agent context graph after one of its ontologies changed.
+
+        Args:
+            G: Graph from build_agent_context_graph
+            delta: Changes from OntologyGraphBuilder.diff/update_graph
+        """
+        delta.apply(G)
 
 
 class VEValueChainBuilder:
@@ -288,9 +588,52 @@ class VEValueChainBuilder:
         return colors[index % len(colors)]
 
 
-def build_ontology_graph(file_path: str | Path) -> nx.DiGraph:
+def merge_graph_into(G: nx.DiGraph, H: nx.DiGraph) -> None:
+    """
+    Union H into G in place, with H's attributes taking precedence.
+
+    Equivalent to G = nx.compose(G, H) without copying G, so merging many
+    graphs costs time proportional to their total size.
+    """
+    G.graph.update(H.graph)
+    G.add_nodes_from(H.nodes(data=True))
+    G.add_edges_from(H.edges(data=True))
+    drop_node_id_index(G)
+    drop_relation_index(G)
+
+
+def load_agent_specs(directory: str | Path) -> List[Dict[str, Any]]:
+    """
+    Load agent specifications from JSON/JSON-LD files in a directory.
+
+    A file may hold one spec (a dict with agentId) or a list of specs;
+    other files are ignored.
+
+    Args:
+        directory: Directory to scan (e.g. PBS/AGENTS)
+
+    Returns:
+        Agent specs in file name order
+    """
+    specs = []
+    for path in sorted(Path(directory).glob('*.json*')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        candidates = data if isinstance(data, list) else [data]
+        specs.extend(spec for spec in candidates if isinstance(spec, dict) and 'agentId' in spec)
+    return specs
+
+
+def build_ontology_graph(
+    file_path: str | Path,
+    cache: Optional[OntologyCache] = None
+) -> nx.DiGraph:
     """Convenience function to build graph from file."""
-    builder = OntologyGraphBuilder()
+    builder = OntologyGraphBuilder(cache=cache)
     return builder.from_file(file_path)
 
 
@@ -307,6 +650,21 @@ def get_graph_stats(G: nx.DiGraph) -> Dict[str, Any]:
     }
 
 
+def graph_structure_hash(G: nx.DiGraph, weight: Optional[str] = None) -> str:
+    """
+    Stable digest of a graph's nodes and edges.
+
+    Attributes are ignored except the edge weight attribute, if given, so
+    the hash identifies a graph version for structure-derived caches.
+    """
+    if weight is None:
+        adjacency = [(u, list(nbrs)) for u, nbrs in G.adj.items()]
+    else:
+        adjacency = [(u, [(v, d.get(weight)) for v, d in nbrs.items()]) for u, nbrs in G.adj.items()]
+    digest = hashlib.blake2b(repr((G.is_directed(), adjacency)).encode('utf-8'), digest_size=16)
+    return digest.hexdigest()
+
+
 def _count_node_types(G: nx.DiGraph) -> Dict[str, int]:
     """Count nodes by type."""
     types = {}
@@ -332,7 +690,9 @@ if __name__ == "__main__":
         print("Usage: python graph_builder.py <ontology_file.json>")
         sys.exit(1)
 
-    G = build_ontology_graph(sys.argv[1])
+    from ontology_cache import default_cache
+
+    G = build_ontology_graph(sys.argv[1], cache=default_cache())
     stats = get_graph_stats(G)
 
     print(f"Graph: {G.graph.get('name', 'Unknown')}")
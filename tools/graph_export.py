@@ -0,0 +1,275 @@
+"""
+VHF Graph Export (CC-115)
+Streaming vis-network JSON/HTML export.
+
+Features:
+- Nodes and edges streamed from the graph to disk in chunks (constant memory)
+- vis-network compatible JSON ({"nodes": [...], "edges": [...]})
+- Small static HTML shell around the data; tooltips built in the browser
+- Optional precomputed positions (physics off)
+- Optional StyleOverlay (highlighted paths) merged while streaming
+"""
+
+import html
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO
+
+import networkx as nx
+
+from style_overlay import StyleOverlay, iter_styled_edges, iter_styled_nodes
+
+# Styling shared with OntologyVisualiser
+NODE_SIZES = {
+    'agent': 40,
+    'ontology': 35,
+    've_layer': 45,
+    'entity': 25,
+    'external': 20
+}
+NODE_SHAPES = {
+    'agent': 'star',
+    'ontology': 'database',
+    've_layer': 'box',
+    'entity': 'dot',
+    'external': 'triangle'
+}
+EDGE_WIDTHS = {
+    'relationship': 2,
+    'inheritance': 1,
+    'binding': 3,
+    'value_chain': 4
+}
+DEFAULT_NODE_SIZE = 25
+DEFAULT_EDGE_WIDTH = 2
+DEFAULT_NODE_COLOR = '#607D8B'
+DEFAULT_EDGE_COLOR = '#666666'
+
+# Characters buffered before each write
+CHUNK_CHARS = 1 << 20
+
+DESCRIPTION_CHARS = 200
+
+VIS_NETWORK_JS = "https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js"
+VIS_NETWORK_CSS = "https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/dist/vis-network.min.css"
+
+_encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=str)
+
+HTML_HEAD = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{css}">
+<script src="{js}"></script>
+<style>#graph {{ width: {width}; height: {height}; border: 1px solid lightgray; }}</style>
+</head>
+<body>
+<div id="graph"></div>
+<script type="text/javascript">
+var data = """
+
+HTML_TAIL = """;
+function vhfTooltip(n) {
+  var lines = [n.label];
+  if (n.description) { lines.push(n.description + "..."); }
+  if (n.nodeType) { lines.push("Type: " + n.nodeType); }
+  if (n.propertyCount) { lines.push("Properties: " + n.propertyCount); }
+  return lines.join("\\n");
+}
+function vhfEdgeTooltip(e) {
+  var lines = [e.label || "relationship"];
+  if (e.cardinality) { lines.push("Cardinality: " + e.cardinality); }
+  if (e.description) { lines.push(e.description); }
+  return lines.join("\\n");
+}
+data.nodes.forEach(function (n) { n.title = vhfTooltip(n); });
+data.edges.forEach(function (e) { e.title = vhfEdgeTooltip(e); });
+var nodes = new vis.DataSet(data.nodes);
+var edges = new vis.DataSet(data.edges);
+data = null;
+var network = new vis.Network(document.getElementById("graph"), {nodes: nodes, edges: edges}, __OPTIONS__);
+</script>
+</body>
+</html>
+"""
+
+
+def edge_width(data: Dict) -> float:
+    """Edge width: explicit width attribute, else by edge_type."""
+    return data.get('width') or EDGE_WIDTHS.get(data.get('edge_type', 'relationship'), DEFAULT_EDGE_WIDTH)
+
+
+def iter_vis_nodes(
+    G: nx.DiGraph,
+    positions: Optional[Dict[Any, tuple]] = None,
+    scale: float = 1000.0,
+    overlay: Optional[StyleOverlay] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    vis-network node records, one per graph node.
+
+    Args:
+        G: Graph to export
+        positions: Optional (x, y) per node, embedded with physics off
+        scale: Pixel extent of positions
+        overlay: Optional styles merged over node attributes
+
+    Yields:
+        Node dicts (id, label, color, size, shape and tooltip fields)
+    """
+    for node, data in iter_styled_nodes(G, overlay):
+        node_type = data.get('node_type', 'entity')
+        record = {
+            'id': str(node),
+            'label': data.get('label', str(node)),
+            'color': data.get('color', DEFAULT_NODE_COLOR),
+            'size': NODE_SIZES.get(node_type, DEFAULT_NODE_SIZE),
+            'shape': NODE_SHAPES.get(node_type, 'dot'),
+        }
+        if description := data.get('description'):
+            record['description'] = description[:DESCRIPTION_CHARS]
+        if data.get('node_type'):
+            record['nodeType'] = node_type
+        if properties := data.get('properties'):
+            record['propertyCount'] = len(properties)
+        if positions is not None and node in positions:
+            x, y = positions[node]
+            record.update(x=x * scale, y=-y * scale, physics=False)
+        yield record
+
+
+def iter_vis_edges(G: nx.DiGraph, overlay: Optional[StyleOverlay] = None) -> Iterator[Dict[str, Any]]:
+    """
+    vis-network edge records, one per graph edge.
+
+    Args:
+        G: Graph to export
+        overlay: Optional styles merged over edge attributes
+
+    Yields:
+        Edge dicts (from, to, label, color, width and tooltip fields)
+    """
+    for u, v, data in iter_styled_edges(G, overlay):
+        record = {
+            'from': str(u),
+            'to': str(v),
+            'label': data.get('label', ''),
+            'color': data.get('color', DEFAULT_EDGE_COLOR),
+            'width': edge_width(data),
+        }
+        if cardinality := data.get('cardinality'):
+            record['cardinality'] = cardinality
+        if description := data.get('description'):
+            record['description'] = description
+        yield record
+
+
+def write_vis_json(
+    G: nx.DiGraph,
+    output_path: str | Path,
+    positions: Optional[Dict[Any, tuple]] = None,
+    overlay: Optional[StyleOverlay] = None
+) -> str:
+    """
+    Stream the graph to a vis-network JSON file ({"nodes": [...], "edges": [...]}).
+
+    Args:
+        G: Graph to export
+        output_path: JSON file to write
+        positions: Optional (x, y) per node (see iter_vis_nodes)
+        overlay: Optional styles merged over node/edge attributes
+
+    Returns:
+        Path to the written file
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        _write_graph_data(f, G, positions, overlay=overlay)
+    return str(output_path)
+
+
+def write_vis_html(
+    G: nx.DiGraph,
+    output_path: str | Path,
+    positions: Optional[Dict[Any, tuple]] = None,
+    height: str = "800px",
+    width: str = "100%",
+    title: Optional[str] = None,
+    overlay: Optional[StyleOverlay] = None
+) -> str:
+    """
+    Stream the graph into a static HTML page that draws it with vis-network.
+
+    Unlike render_pyvis, no Network object or template render is built:
+    node and edge records go straight from the graph to the file in chunks.
+
+    Args:
+        G: Graph to export
+        output_path: HTML file to write
+        positions: Optional (x, y) per node; with positions the page does
+            not run the physics simulation
+        height: Canvas height (CSS)
+        width: Canvas width (CSS)
+        title: Page title (default: graph name)
+        overlay: Optional styles merged over node/edge attributes
+
+    Returns:
+        Path to the written file
+    """
+    if positions is not None:
+        options = {'physics': {'enabled': False}, 'edges': {'arrows': 'to'}}
+    else:
+        options = {
+            'physics': {'barnesHut': {'gravitationalConstant': -3000, 'springLength': 200}},
+            'edges': {'arrows': 'to'}
+        }
+    scale = 1000.0 * max(1.0, (G.number_of_nodes() / 100) ** 0.5)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(HTML_HEAD.format(
+            title=html.escape(str(title or G.graph.get('name', 'Graph'))),
+            css=VIS_NETWORK_CSS, js=VIS_NETWORK_JS, width=width, height=height
+        ))
+        _write_graph_data(f, G, positions, scale, script_safe=True, overlay=overlay)
+        f.write(HTML_TAIL.replace('__OPTIONS__', json.dumps(options)))
+    return str(output_path)
+
+
+def _write_graph_data(
+    f: TextIO,
+    G: nx.DiGraph,
+    positions: Optional[Dict[Any, tuple]],
+    scale: float = 1000.0,
+    script_safe: bool = False,
+    overlay: Optional[StyleOverlay] = None
+) -> None:
+    """Write {"nodes": [...], "edges": [...]} to an open file."""
+    f.write('{"nodes":[\n')
+    _write_records(f, iter_vis_nodes(G, positions, scale, overlay), script_safe)
+    f.write('],\n"edges":[\n')
+    _write_records(f, iter_vis_edges(G, overlay), script_safe)
+    f.write(']}')
+
+
+def _write_records(f: TextIO, records: Iterable[Dict], script_safe: bool) -> None:
+    """Encode records as comma-separated JSON lines, written in CHUNK_CHARS chunks."""
+    chunk = []
+    size = 0
+    separator = ''
+    for record in records:
+        text = separator + _encoder.encode(record)
+        separator = ',\n'
+        chunk.append(text)
+        size += len(text)
+        if size >= CHUNK_CHARS:
+            _flush(f, chunk, script_safe)
+            chunk = []
+            size = 0
+    _flush(f, chunk, script_safe)
+
+
+def _flush(f: TextIO, chunk: list, script_safe: bool) -> None:
+    """Write buffered records; inside <script>, '</' is escaped so data cannot close the tag."""
+    text = ''.join(chunk)
+    f.write(text.replace('</', '<\\/') if script_safe else text)
+
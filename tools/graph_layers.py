@@ -0,0 +1,96 @@
+"""
+VHF Graph Layers (CC-120)
+Read-only views of a shared base graph with a small delta graph on top.
+
+Features:
+- Union view of base + delta nodes, edges and attributes without copying
+- Delta attributes take precedence over the base's
+- Many views can share one base (e.g. one VE graph, one delta per agent)
+- Views nest: a layered view can be the base of another
+"""
+
+from collections import ChainMap
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator
+
+import networkx as nx
+
+
+class _UnionAtlas(Mapping):
+    """Keys of base then delta; attribute dicts of keys in both are merged."""
+
+    __slots__ = ('_base', '_delta')
+
+    def __init__(self, base: Mapping, delta: Mapping):
+        self._base = base
+        self._delta = delta
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for key in self._delta if key not in self._base)
+
+    def __iter__(self) -> Iterator:
+        yield from self._base
+        for key in self._delta:
+            if key not in self._base:
+                yield key
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._base or key in self._delta
+
+    def __getitem__(self, key: Any) -> Any:
+        if key in self._delta:
+            if key in self._base:
+                return self._combine(self._base[key], self._delta[key])
+            return self._delta[key]
+        return self._base[key]
+
+    def _combine(self, base: Dict, delta: Dict) -> Dict:
+        """Merged attributes (the base's own dict when the delta adds none)."""
+        return {**base, **delta} if delta else base
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self._base!r}, {self._delta!r})"
+
+
+class _UnionAdjacency(_UnionAtlas):
+    """Adjacency whose neighbour maps are unions of base and delta neighbours."""
+
+    __slots__ = ()
+
+    def _combine(self, base: Mapping, delta: Mapping) -> Mapping:
+        return _UnionAtlas(base, delta) if delta else base
+
+
+def layered_view(base: nx.DiGraph, delta: nx.DiGraph) -> nx.DiGraph:
+    """
+    Read-only graph of base with delta's nodes and edges added.
+
+    Equivalent to nx.compose(base, delta) for reading (delta attributes win),
+    but nothing is copied: memory is that of delta alone, and later changes
+    to either graph show through. Modify the delta, not the view.
+
+    Args:
+        base: Shared graph, typically large
+        delta: Graph of added nodes/edges; nodes of base it touches may
+            appear with no attributes
+
+    Returns:
+        Frozen graph view (nx.is_frozen is True)
+    """
+    if base.is_multigraph() or delta.is_multigraph():
+        raise ValueError("layered_view does not support multigraphs")
+    if base.is_directed() != delta.is_directed():
+        raise ValueError("base and delta must both be directed or both undirected")
+
+    view = nx.freeze(base.__class__())
+    view._graph = base
+    view._delta = delta
+    view.graph = ChainMap(delta.graph, base.graph)
+
+    view._node = _UnionAtlas(base._node, delta._node)
+    if base.is_directed():
+        view._succ = _UnionAdjacency(base._succ, delta._succ)
+        view._pred = _UnionAdjacency(base._pred, delta._pred)
+    else:
+        view._adj = _UnionAdjacency(base._adj, delta._adj)
+    return view
@@ -0,0 +1,200 @@
+"""
+VHF Graph Level of Detail (CC-114)
+Super-node summaries of large graphs for clustered rendering.
+
+Features:
+- Group nodes by W4M layer / VSOM level, ontology namespace or community
+- Bounded number and size of groups (small groups merged, large ones split)
+- Summary graph of super-nodes with member counts and edge weights
+"""
+
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import networkx as nx
+
+GROUPINGS = ('auto', 'layer', 'namespace', 'community')
+
+# render_pyvis clusters graphs above this size by default
+LOD_NODE_THRESHOLD = 5000
+MAX_CLUSTERS = 200
+
+LAYER_ATTRIBUTES = ('layer_index', 'level')
+OTHER_GROUP = 'Other'
+
+
+def node_layers(G: nx.DiGraph) -> Dict[Any, int]:
+    """
+    Layer of each node from layer_index/level attributes.
+
+    Nodes without the attribute take the layer of the nearest node that has
+    one (breadth-first, ignoring edge direction). Nodes not connected to
+    any layered node are left out.
+
+    Args:
+        G: Graph with W4M layer or VSOM level nodes
+
+    Returns:
+        Dict mapping nodes to layer numbers
+    """
+    layer = {}
+    for node, data in G.nodes(data=True):
+        for attr in LAYER_ATTRIBUTES:
+            if isinstance(data.get(attr), (int, float)):
+                layer[node] = int(data[attr])
+                break
+
+    frontier = list(layer)
+    while frontier:
+        next_frontier = []
+        for node in frontier:
+            for neighbour in nx.all_neighbors(G, node):
+                if neighbour not in layer:
+                    layer[neighbour] = layer[node]
+                    next_frontier.append(neighbour)
+        frontier = next_frontier
+    return layer
+
+
+def node_namespace(node: Any, data: Dict) -> str:
+    """Namespace of a node id: CURIE prefix, IRI base, or its source ontology."""
+    node_id = str(node)
+    if '#' in node_id:
+        return node_id.rsplit('#', 1)[0]
+    if '://' in node_id:
+        return node_id.rsplit('/', 1)[0]
+    if ':' in node_id:
+        return node_id.split(':', 1)[0]
+    return data.get('source_ontology') or data.get('node_type') or '(none)'
+
+
+def group_nodes(G: nx.DiGraph, by: str = 'auto', max_groups: int = MAX_CLUSTERS) -> Dict[Any, str]:
+    """
+    Assign every node to a group.
+
+    Args:
+        G: Graph to group
+        by: layer, namespace, community, or auto (layers when the graph
+            has layer_index/level nodes, else namespaces when there are
+            several, else communities)
+        max_groups: Upper bound on groups. The smallest groups are merged
+            into 'Other' until at most half remain, then groups larger than
+            2 * nodes / max_groups are split into connected chunks
+
+    Returns:
+        Dict mapping nodes to group names
+    """
+    if by not in GROUPINGS:
+        raise ValueError(f"Unknown grouping: {by} (expected one of {GROUPINGS})")
+
+    if by == 'auto':
+        if any(attr in data for _, data in G.nodes(data=True) for attr in LAYER_ATTRIBUTES):
+            by = 'layer'
+        elif len({node_namespace(n, d) for n, d in G.nodes(data=True)}) > 1:
+            by = 'namespace'
+        else:
+            by = 'community'
+
+    if by == 'layer':
+        layers = node_layers(G)
+        groups = {node: f"Layer {layers[node]}" if node in layers else 'Unlayered' for node in G}
+    elif by == 'namespace':
+        groups = {node: node_namespace(node, data) for node, data in G.nodes(data=True)}
+    else:
+        groups = _communities(G, max_groups)
+
+    half = max(max_groups // 2, 1)
+    sizes = Counter(groups.values())
+    if len(sizes) > half:
+        kept = {group for group, _ in sizes.most_common(max(half - 1, 1))}
+        groups = {node: group if group in kept else OTHER_GROUP for node, group in groups.items()}
+
+    return _split_large_groups(G, groups, max(-(-len(G) // half), 1))
+
+
+def _split_large_groups(G: nx.DiGraph, groups: Dict[Any, str], max_size: int) -> Dict[Any, str]:
+    """Cut groups above max_size into chunks of breadth-first order within the group."""
+    sizes = Counter(groups.values())
+    large = {group for group, size in sizes.items() if size > max_size}
+    if not large:
+        return groups
+
+    order: Dict[str, list] = {group: [] for group in large}
+    seen = set()
+    for start in G:
+        group = groups[start]
+        if group not in large or start in seen:
+            continue
+        seen.add(start)
+        queue = [start]
+        for node in queue:
+            for neighbour in nx.all_neighbors(G, node):
+                if neighbour not in seen and groups[neighbour] == group:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        order[group].extend(queue)
+
+    groups = dict(groups)
+    for group, members in order.items():
+        for i in range(0, len(members), max_size):
+            name = f"{group} {i // max_size + 1}"
+            for node in members[i:i + max_size]:
+                groups[node] = name
+    return groups
+
+
+def _communities(G: nx.DiGraph, max_groups: int) -> Dict[Any, str]:
+    """
+    Label propagation communities, merged by repeating label propagation
+    on the community graph until at most max_groups remain (or it stalls).
+    """
+    label = {node: i for i, members in enumerate(
+        nx.community.label_propagation_communities(G.to_undirected(as_view=True))
+    ) for node in members}
+    count = len(set(label.values()))
+
+    while count > max_groups:
+        Q = nx.Graph()
+        Q.add_nodes_from(set(label.values()))
+        Q.add_edges_from((label[u], label[v]) for u, v in G.edges() if label[u] != label[v])
+        merged = {c: i for i, members in enumerate(nx.community.label_propagation_communities(Q)) for c in members}
+        if len(set(merged.values())) >= count:
+            break
+        label = {node: merged[c] for node, c in label.items()}
+        count = len(set(label.values()))
+
+    sizes = Counter(label.values())
+    rank = {c: i for i, (c, _) in enumerate(sizes.most_common())}
+    return {node: f"Community {rank[c]}" for node, c in label.items()}
+
+
+def summarize_groups(G: nx.DiGraph, groups: Dict[Any, str]) -> nx.DiGraph:
+    """
+    Graph with one node per group and one edge per connected group pair.
+
+    Group nodes carry label, members (count) and the most common member
+    color; edges carry weight (number of member edges).
+
+    Args:
+        G: Full graph
+        groups: Node to group mapping (see group_nodes)
+
+    Returns:
+        Summary DiGraph
+    """
+    S = nx.DiGraph()
+    S.graph.update(G.graph)
+    S.graph['name'] = f"{G.graph.get('name', 'Graph')} (clustered)"
+
+    colors: Dict[str, Counter] = {}
+    for node, data in G.nodes(data=True):
+        colors.setdefault(groups[node], Counter())[data.get('color')] += 1
+    for group, counts in colors.items():
+        color: Optional[str] = counts.most_common(1)[0][0]
+        S.add_node(group, label=group, members=sum(counts.values()), color=color or '#607D8B')
+
+    weights = Counter(
+        (groups[u], groups[v]) for u, v in G.edges() if groups[u] != groups[v]
+    )
+    S.add_edges_from((u, v, {'weight': w}) for (u, v), w in weights.items())
+    return S
@@ -0,0 +1,238 @@
+"""
+VHF Graph Metrics (CC-112)
+Bottleneck detection with approximate and cached betweenness centrality.
+
+Features:
+- Exact or sampled (k pivots, seeded) betweenness
+- NumPy/SciPy sparse-matrix backend (batched Brandes over BFS levels)
+- Results cached per graph version (structure hash)
+"""
+
+import random
+import heapq
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+
+from graph_builder import graph_structure_hash
+
+try:
+    import numpy as np
+    import scipy.sparse as sp
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+BACKENDS = ('networkx', 'sparse')
+
+# Dense (nodes x batch) work arrays are capped at this many elements
+SPARSE_BATCH_ELEMENTS = 1 << 22
+
+
+class BottleneckAnalyzer:
+    """Betweenness-based bottleneck detection with per-graph-version caching."""
+
+    def __init__(
+        self,
+        k: Optional[int] = None,
+        seed: Optional[int] = None,
+        backend: str = 'networkx',
+        normalized: bool = True,
+        weight: Optional[str] = None,
+        cache_size: int = 32
+    ):
+        """
+        Initialize the analyzer.
+
+        Args:
+            k: Number of sampled source nodes (None for exact betweenness)
+            seed: Random seed for sampling
+            backend: 'networkx' or 'sparse' (NumPy/SciPy, unweighted only)
+            normalized: Normalize scores as nx.betweenness_centrality does
+            weight: Edge attribute for weighted shortest paths
+            cache_size: Number of graph versions to keep results for
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend} (expected one of {BACKENDS})")
+        if backend == 'sparse':
+            if not SCIPY_AVAILABLE:
+                raise ImportError("scipy not installed. Run: pip install numpy scipy")
+            if weight is not None:
+                raise ValueError("The sparse backend supports unweighted betweenness only")
+
+        self.k = k
+        self.seed = seed
+        self.backend = backend
+        self.normalized = normalized
+        self.weight = weight
+        self.cache_size = cache_size
+        self._cache: OrderedDict = OrderedDict()
+
+    def betweenness(self, G: nx.DiGraph) -> Dict[Any, float]:
+        """
+        Betweenness centrality of every node, cached per graph version.
+
+        Args:
+            G: Graph to analyse
+
+        Returns:
+            Dict mapping nodes to scores
+        """
+        key = graph_structure_hash(G, self.weight)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        k = self.k if self.k is not None and self.k < len(G) else None
+        if self.backend == 'sparse':
+            scores = sparse_betweenness(G, k=k, seed=self.seed, normalized=self.normalized)
+        else:
+            scores = nx.betweenness_centrality(
+                G, k=k, seed=self.seed, normalized=self.normalized, weight=self.weight
+            )
+
+        self._cache[key] = scores
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return scores
+
+    def top_nodes(self, G: nx.DiGraph, n: int = 5) -> List[Tuple[Any, float]]:
+        """Highest-scoring (node, score) pairs, ties in graph order."""
+        return heapq.nlargest(n, self.betweenness(G).items(), key=lambda item: item[1])
+
+    def clear_cache(self) -> None:
+        """Forget all cached results."""
+        self._cache.clear()
+
+
+def sparse_betweenness(
+    G: nx.DiGraph,
+    k: Optional[int] = None,
+    seed: Optional[int] = None,
+    normalized: bool = True,
+    batch_size: Optional[int] = None
+) -> Dict[Any, float]:
+    """
+    Unweighted betweenness centrality using sparse matrix products.
+
+    Runs Brandes' algorithm for a batch of sources at once: the forward
+    BFS counts shortest paths level by level with A^T @ frontier, and the
+    dependency accumulation walks the levels back with A @ W. Sampling
+    (k, seed) picks the same sources as nx.betweenness_centrality.
+
+    Args:
+        G: Graph to analyse
+        k: Number of sampled source nodes (None for all)
+        seed: Random seed for sampling
+        normalized: Normalize as nx.betweenness_centrality does
+        batch_size: Sources per batch (default sized to bound memory)
+
+    Returns:
+        Dict mapping nodes to scores
+    """
+    if not SCIPY_AVAILABLE:
+        raise ImportError("scipy not installed. Run: pip install numpy scipy")
+
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+
+    if k is None or k >= n:
+        sources = nodes
+        sampled = None
+    else:
+        sources = random.Random(seed).sample(nodes, k)
+        sampled = sources
+
+    index = {node: i for i, node in enumerate(nodes)}
+    A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=None, format='csr')
+    A.data[:] = 1.0
+    A_T = A.T.tocsr()
+
+    if batch_size is None:
+        batch_size = max(1, min(256, SPARSE_BATCH_ELEMENTS // n))
+
+    scores = np.zeros(n)
+    source_idx = np.fromiter((index[s] for s in sources), dtype=np.int64, count=len(sources))
+    for start in range(0, len(source_idx), batch_size):
+        scores += _batch_dependencies(A, A_T, source_idx[start:start + batch_size])
+
+    scores = _rescale(scores, n, normalized, G.is_directed(), sampled_count=None if sampled is None else k,
+                      sampled_idx=None if sampled is None else source_idx)
+    return dict(zip(nodes, scores.tolist()))
+
+
+def _batch_dependencies(A, A_T, sources) -> 'np.ndarray':
+    """Summed Brandes dependencies of all nodes for a batch of sources."""
+    n = A.shape[0]
+    b = len(sources)
+    columns = np.arange(b)
+
+    sigma = np.zeros((n, b))
+    sigma[sources, columns] = 1.0
+    depth = np.full((n, b), -1, dtype=np.int32)
+    depth[sources, columns] = 0
+
+    # Forward: shortest path counts, one BFS level at a time
+    frontier = sigma.copy()
+    level = 0
+    while True:
+        reached = A_T @ frontier
+        reached[depth >= 0] = 0.0
+        new = reached > 0
+        if not new.any():
+            break
+        level += 1
+        depth[new] = level
+        sigma += reached
+        frontier = reached
+
+    # Backward: accumulate dependencies from the deepest level up
+    delta = np.zeros((n, b))
+    for d in range(level, 0, -1):
+        at_level = depth == d
+        W = np.divide(1.0 + delta, sigma, out=np.zeros((n, b)), where=at_level)
+        contribution = A @ W
+        parents = depth == d - 1
+        delta[parents] += sigma[parents] * contribution[parents]
+
+    delta[sources, columns] = 0.0
+    return delta.sum(axis=1)
+
+
+def _rescale(scores, n: int, normalized: bool, directed: bool, sampled_count: Optional[int], sampled_idx) -> 'np.ndarray':
+    """Scale raw dependency sums like nx.betweenness_centrality (endpoints excluded)."""
+    N = n - 1
+    if N < 2:
+        return scores
+
+    correction = 1 if directed else 2
+    if sampled_count is None:
+        scale = 1 / (N * (N - 1)) if normalized else 1 / correction
+        return scores * scale
+
+    # Sampled sources cannot lie on paths from themselves
+    K = sampled_count
+    if normalized:
+        scale_source = 1 / ((K - 1) * (N - 1)) if K > 1 else float('nan')
+        scale_other = 1 / (K * (N - 1))
+    else:
+        scale_source = N / ((K - 1) * correction) if K > 1 else float('nan')
+        scale_other = N / (K * correction)
+
+    scale = np.full(n, scale_other)
+    scale[sampled_idx] = scale_source
+    return scores * scale
+
+
+_default_analyzer: Optional[BottleneckAnalyzer] = None
+
+
+def default_bottleneck_analyzer() -> BottleneckAnalyzer:
+    """Shared exact analyzer, so repeated analyses of a graph hit one cache."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = BottleneckAnalyzer()
+    return _default_analyzer
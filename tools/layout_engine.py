@@ -0,0 +1,505 @@
+"""
+VHF Layout Engine (CC-113)
+Cached node layouts for the visualiser.
+
+Features:
+- Positions cached in memory and on disk, keyed by graph structure hash,
+  with least recently used disk entries evicted beyond a size limit
+- Spring layout warm-started from the previous version of a graph
+- Plain (x, y) coordinates for embedding in PyVis output
+- Large-graph layout: multilevel coarsening with vectorised NumPy
+  force steps and Barnes-Hut repulsion
+- Layered layout respecting W4M layer_index / VSOM level attributes
+"""
+
+import os
+import pickle
+import random
+import hashlib
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import networkx as nx
+
+from graph_builder import graph_structure_hash
+from graph_lod import node_layers
+from ontology_cache import default_cache_dir, evict_lru
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+Positions = Dict[Any, Tuple[float, float]]
+
+LAYOUTS = ('spring', 'circular', 'kamada_kawai', 'shell', 'spectral', 'large', 'layered')
+
+# spring/kamada_kawai switch to the large-graph layout above this size
+LARGE_GRAPH_NODES = 2000
+
+# Multilevel layout tuning
+COARSEST_NODES = 64
+COARSEST_ITERATIONS = 300
+REFINE_ITERATIONS = 30
+FINEST_ITERATIONS = 12
+# Pull toward the centroid, keeping disconnected components and isolates close
+GRAVITY = 0.5
+
+# Warm-start spring layout when at most this share of nodes is new
+WARM_START_MAX_CHANGE = 0.2
+WARM_START_ITERATIONS = 15
+
+ENTRY_SUFFIX = '.layout'
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class LayoutCache:
+    """Node positions keyed by layout and graph structure, in memory and optionally on disk."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | Path] = None,
+        max_entries: int = 64,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory for persistent entries (None for memory only)
+            max_entries: Entries kept in memory
+            max_bytes: Size limit for persistent entries; least recently
+                used ones are evicted beyond it
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._memory: OrderedDict = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a cached value, or None on a miss."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return self._memory[key]
+
+        if self.cache_dir is None:
+            return None
+        try:
+            with open(self._entry_path(key), 'rb') as f:
+                stored_key, value = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if stored_key != key:
+            return None
+
+        # Mark as recently used for eviction ordering
+        try:
+            os.utime(self._entry_path(key))
+        except OSError:
+            pass
+        self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value in memory and, if configured, on disk."""
+        self._remember(key, value)
+        if self.cache_dir is None:
+            return
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_path = self._entry_path(key)
+        tmp_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(zlib.compress(pickle.dumps((key, value), protocol=pickle.HIGHEST_PROTOCOL), 1))
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used disk entries until under max_bytes."""
+        if self.cache_dir is None:
+            return 0
+        return evict_lru(self.cache_dir, ENTRY_SUFFIX, self.max_bytes)
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Add to the in-memory LRU."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _entry_path(self, key: str) -> Path:
+        """Entry file for a key."""
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+        return self.cache_dir / f'{digest}{ENTRY_SUFFIX}'
+
+
+class LayoutEngine:
+    """Compute node positions, reusing cached layouts of identical or similar graphs."""
+
+    def __init__(self, cache: Optional[LayoutCache] = None, seed: Optional[int] = None):
+        """
+        Initialize the engine.
+
+        Args:
+            cache: Layout cache (default: in-memory only)
+            seed: Random seed for reproducible layouts
+        """
+        self.cache = cache if cache is not None else LayoutCache()
+        self.seed = seed
+
+    def compute(self, G: nx.DiGraph, layout: str = 'spring') -> Positions:
+        """
+        Node positions for a graph.
+
+        Identical graph structures are served from the cache. A spring
+        layout of a graph whose previous version was laid out (same graph
+        name/ontology id) starts from the previous positions and runs
+        fewer iterations when only a few nodes changed.
+
+        Args:
+            G: Graph to lay out
+            layout: spring, circular, kamada_kawai, shell, spectral, large
+                (multilevel, for big graphs; used automatically for spring
+                and kamada_kawai above LARGE_GRAPH_NODES) or layered
+
+        Returns:
+            Dict mapping nodes to (x, y)
+        """
+        if layout not in LAYOUTS:
+            layout = 'spring'
+        if layout in ('spring', 'kamada_kawai') and len(G) > LARGE_GRAPH_NODES and NUMPY_AVAILABLE:
+            layout = 'large'
+
+        key = f"{layout}|{graph_structure_hash(G)}"
+        positions = self.cache.get(key)
+        if positions is not None:
+            return positions
+
+        lineage = f"{layout}|latest|{G.graph.get('ontology_id') or G.graph.get('name', '')}"
+        previous_key = self.cache.get(lineage)
+        previous = self.cache.get(previous_key) if previous_key else None
+
+        positions = _as_tuples(self._run(G, layout, previous))
+        self.cache.put(key, positions)
+        self.cache.put(lineage, key)
+        return positions
+
+    def _run(self, G: nx.DiGraph, layout: str, previous: Optional[Positions]) -> Dict:
+        """Run a layout algorithm."""
+        if layout == 'spring':
+            return self._spring(G, previous)
+
+        layouts = {
+            'large': lambda: multilevel_layout(G, seed=self.seed),
+            'layered': lambda: multilevel_layout(G, seed=self.seed, layered=True),
+            'circular': lambda: nx.circular_layout(G),
+            'kamada_kawai': lambda: nx.kamada_kawai_layout(G),
+            'shell': lambda: nx.shell_layout(G),
+            'spectral': lambda: nx.spectral_layout(G)
+        }
+        return layouts[layout]()
+
+    def _spring(self, G: nx.DiGraph, previous: Optional[Positions]) -> Dict:
+        """Spring layout, warm-started from previous positions when few nodes changed."""
+        if previous and len(G):
+            new_nodes = [n for n in G if n not in previous]
+            if new_nodes != list(G) and len(new_nodes) <= WARM_START_MAX_CHANGE * len(G):
+                initial = {n: previous[n] for n in G if n in previous}
+                self._place_new_nodes(G, initial, new_nodes)
+                return nx.spring_layout(
+                    G, k=2, pos=initial, iterations=WARM_START_ITERATIONS, seed=self.seed
+                )
+
+        return nx.spring_layout(G, k=2, iterations=50, seed=self.seed)
+
+    def _place_new_nodes(self, G: nx.DiGraph, positions: Positions, new_nodes: list) -> None:
+        """Start new nodes next to their already placed neighbours."""
+        rng = random.Random(self.seed)
+        for node in new_nodes:
+            placed = [positions[n] for n in nx.all_neighbors(G, node) if n in positions]
+            if placed:
+                x = sum(p[0] for p in placed) / len(placed)
+                y = sum(p[1] for p in placed) / len(placed)
+            else:
+                x, y = 0.0, 0.0
+            positions[node] = (x + rng.uniform(-0.05, 0.05), y + rng.uniform(-0.05, 0.05))
+
+
+def multilevel_layout(
+    G: nx.DiGraph,
+    seed: Optional[int] = None,
+    layered: bool = False,
+    refine_iterations: int = REFINE_ITERATIONS,
+    finest_iterations: int = FINEST_ITERATIONS
+) -> Positions:
+    """
+    Force-directed layout for large graphs.
+
+    The graph is coarsened by collapsing each node into its highest-degree
+    neighbour until it is small, the coarsest graph is laid out, and each
+    finer level starts from its parent cluster's position and is refined
+    with a few vectorised force steps. Repulsion uses a Barnes-Hut
+    quadtree, so a step costs O(N log N).
+
+    Args:
+        G: Graph to lay out (edge direction is ignored)
+        seed: Random seed
+        layered: Keep nodes in horizontal bands by layer_index/level;
+            other nodes join the band of the nearest layered node
+        refine_iterations: Force steps per intermediate level
+        finest_iterations: Force steps on the full graph
+
+    Returns:
+        Dict mapping nodes to (x, y), scaled to [-1, 1]
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy not installed. Run: pip install numpy")
+
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: (0.0, 0.0)}
+
+    rng = np.random.default_rng(seed)
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = _unique_edges(np.array(
+        [(index[u], index[v]) for u, v in G.edges() if u != v], dtype=np.int64
+    ).reshape(-1, 2), n)
+
+    layers = _layer_assignment(G, nodes) if layered else None
+    bands = _band_targets(layers, n) if layered else None
+
+    # Coarsen until small or no longer shrinking
+    hierarchy = []
+    level_n, level_edges, level_layers = n, edges, layers
+    while level_n > COARSEST_NODES:
+        parent = _coarsen(level_n, level_edges, level_layers, rng)
+        coarse_n = int(parent.max()) + 1
+        if coarse_n > 0.9 * level_n:
+            break
+        hierarchy.append((level_n, level_edges, level_layers, parent))
+        level_edges = _unique_edges(parent[level_edges], coarse_n)
+        if level_layers is not None:
+            level_layers = np.zeros(coarse_n, dtype=np.int64)
+            level_layers[parent] = hierarchy[-1][2]
+        level_n = coarse_n
+
+    # Lay out the coarsest graph, then refine level by level
+    pos = rng.uniform(-1.0, 1.0, (level_n, 2)) * np.sqrt(level_n)
+    coarsest_bands = _bands_for(bands, level_layers, layers)
+    if coarsest_bands is not None:
+        pos[:, 1] = coarsest_bands[0] + rng.uniform(-coarsest_bands[1], coarsest_bands[1], level_n)
+    pos = _force_steps(pos, level_edges, coarsest_bands, COARSEST_ITERATIONS)
+
+    for depth, (fine_n, fine_edges, fine_layers, parent) in enumerate(reversed(hierarchy)):
+        scale = np.sqrt(fine_n / len(pos))
+        pos = pos[parent] * scale + rng.normal(scale=0.5, size=(fine_n, 2))
+        iterations = finest_iterations if depth == len(hierarchy) - 1 else refine_iterations
+        pos = _force_steps(pos, fine_edges, _bands_for(bands, fine_layers, layers), iterations, cool_from=0.3)
+
+    pos -= pos.mean(axis=0)
+    extent = np.abs(pos).max()
+    if extent > 0:
+        pos /= extent
+    return dict(zip(nodes, map(tuple, pos.tolist())))
+
+
+def _unique_edges(edges: 'np.ndarray', n: int) -> 'np.ndarray':
+    """Undirected edge list without self loops or duplicates."""
+    if not len(edges):
+        return edges.reshape(0, 2)
+    lo = np.minimum(edges[:, 0], edges[:, 1])
+    hi = np.maximum(edges[:, 0], edges[:, 1])
+    keys = np.unique(lo[lo != hi] * n + hi[lo != hi])
+    return np.stack([keys // n, keys % n], axis=1)
+
+
+def _coarsen(n: int, edges: 'np.ndarray', layers: Optional['np.ndarray'], rng) -> 'np.ndarray':
+    """Cluster id per node: each node joins its highest-degree neighbour's cluster."""
+    src = np.concatenate([edges[:, 0], edges[:, 1]])
+    dst = np.concatenate([edges[:, 1], edges[:, 0]])
+    if layers is not None:
+        same = layers[src] == layers[dst]
+        src, dst = src[same], dst[same]
+
+    # Degree plus a random tie-breaker gives a strict order, so proposals form a forest
+    key = np.bincount(src, minlength=n) + rng.random(n)
+    proposal = np.arange(n)
+    if len(src):
+        order = np.lexsort((key[dst], src))
+        last = np.r_[src[order][1:] != src[order][:-1], True]
+        best_src, best_dst = src[order][last], dst[order][last]
+        up = key[best_dst] > key[best_src]
+        proposal[best_src[up]] = best_dst[up]
+
+    # Pointer jumping to each tree's root
+    root = proposal
+    while True:
+        next_root = root[root]
+        if np.array_equal(next_root, root):
+            break
+        root = next_root
+    return np.unique(root, return_inverse=True)[1]
+
+
+def _layer_assignment(G: nx.DiGraph, nodes: list) -> 'np.ndarray':
+    """Layer per node (see node_layers); unconnected nodes get a band below the rest."""
+    layer = node_layers(G)
+    bottom = max(layer.values(), default=-1) + 1
+    return np.array([layer.get(node, bottom) for node in nodes], dtype=np.int64)
+
+
+def _band_targets(layers: 'np.ndarray', n: int) -> Tuple[float, float]:
+    """Vertical spacing and half-height of layer bands."""
+    count = int(layers.max() - layers.min()) + 1
+    gap = max(3.0, 2.0 * np.sqrt(n) / count)
+    return gap, 0.3 * gap
+
+
+def _bands_for(bands, level_layers, layers) -> Optional[Tuple['np.ndarray', float]]:
+    """Band centre per node at one level of the hierarchy."""
+    if bands is None:
+        return None
+    gap, half = bands
+    return -(level_layers - layers.min()) * gap, half
+
+
+def _force_steps(
+    pos: 'np.ndarray',
+    edges: 'np.ndarray',
+    bands: Optional[Tuple['np.ndarray', float]],
+    iterations: int,
+    cool_from: float = 1.0
+) -> 'np.ndarray':
+    """Fruchterman-Reingold steps with unit edge length, weak gravity and a cooling step cap."""
+    n = len(pos)
+    if bands is not None:
+        centre, half = bands
+        pos[:, 1] = np.clip(pos[:, 1], centre - half, centre + half)
+
+    step = cool_from * max(1.0, 0.1 * np.ptp(pos, axis=0).max())
+    cooling = 0.05 ** (1.0 / max(iterations, 1))
+    for _ in range(iterations):
+        force = _barnes_hut_repulsion(pos)
+        force -= GRAVITY * (pos - pos.mean(axis=0))
+
+        if len(edges):
+            delta = pos[edges[:, 1]] - pos[edges[:, 0]]
+            pull = delta * np.hypot(delta[:, 0], delta[:, 1])[:, None]
+            for axis in (0, 1):
+                force[:, axis] += np.bincount(edges[:, 0], pull[:, axis], minlength=n)
+                force[:, axis] -= np.bincount(edges[:, 1], pull[:, axis], minlength=n)
+
+        length = np.maximum(np.hypot(force[:, 0], force[:, 1]), 1e-9)
+        pos += force * (np.minimum(length, step) / length)[:, None]
+        if bands is not None:
+            pos[:, 1] = np.clip(pos[:, 1], centre - half, centre + half)
+        step *= cooling
+    return pos
+
+
+def _barnes_hut_repulsion(pos: 'np.ndarray') -> 'np.ndarray':
+    """
+    Repulsive forces (1/distance) with a level-by-level Barnes-Hut quadtree.
+
+    At each depth, a node interacts with the centres of mass of the cells
+    that are children of its parent cell's neighbours but not its own
+    neighbours (27 cells); the finest level adds its own 3x3 neighbourhood.
+    Cell grids are padded so neighbour lookups need no bounds checks.
+    """
+    n = len(pos)
+    force = np.zeros_like(pos)
+    depth = max(2, min(10, int(np.ceil(np.log(n) / np.log(4)))))
+
+    low = pos.min(axis=0)
+    side = max(np.ptp(pos, axis=0).max(), 1e-9) * (1 + 1e-9)
+    unit = (pos - low) / side
+
+    for level in range(2, depth + 1):
+        size = 1 << level
+        width = size + 6
+        cell = np.minimum((unit * size).astype(np.int64), size - 1)
+        flat = (cell[:, 0] + 3) * width + (cell[:, 1] + 3)
+
+        mass = np.bincount(flat, minlength=width * width).astype(float)
+        occupied = mass > 0
+        com = np.zeros((width * width, 2))
+        for axis in (0, 1):
+            com[occupied, axis] = np.bincount(flat, pos[:, axis], minlength=width * width)[occupied] / mass[occupied]
+
+        parity = (cell[:, 0] & 1) * 2 + (cell[:, 1] & 1)
+        for p in range(4):
+            members = np.flatnonzero(parity == p)
+            if not len(members):
+                continue
+            px, py = p >> 1, p & 1
+            base = flat[members]
+            at = pos[members]
+            acc = np.zeros((len(members), 2))
+
+            for dx in range(-2 - px, 4 - px):
+                for dy in range(-2 - py, 4 - py):
+                    if abs(dx) <= 1 and abs(dy) <= 1:
+                        continue
+                    _accumulate(acc, at, mass, com, base + dx * width + dy)
+
+            if level == depth:
+                # Near field: own neighbourhood, excluding each node itself
+                for dx in (-1, 0, 1):
+                    for dy in (-1, 0, 1):
+                        if dx or dy:
+                            _accumulate(acc, at, mass, com, base + dx * width + dy)
+                own_mass = mass[base] - 1
+                has_others = own_mass > 0
+                own_com = (com[base] * mass[base][:, None] - at)[has_others] / own_mass[has_others][:, None]
+                _accumulate_points(acc, at, has_others, own_mass, own_com)
+
+            force[members] += acc
+
+    return force
+
+
+def _accumulate(acc, at, mass, com, cells) -> None:
+    """Add repulsion from the cells at the given flat indices."""
+    m = mass[cells]
+    diff = at - com[cells]
+    dist2 = np.maximum(diff[:, 0] ** 2 + diff[:, 1] ** 2, 1e-4)
+    acc += diff * (m / dist2)[:, None]
+
+
+def _accumulate_points(acc, at, mask, mass, com) -> None:
+    """Add repulsion from per-node points (own cell without the node)."""
+    diff = at[mask] - com
+    dist2 = np.maximum(diff[:, 0] ** 2 + diff[:, 1] ** 2, 1e-4)
+    acc[mask] += diff * (mass[mask] / dist2)[:, None]
+
+
+def _as_tuples(positions: Dict) -> Positions:
+    """Convert layout output (NumPy arrays) to plain float tuples."""
+    return {node: (float(xy[0]), float(xy[1])) for node, xy in positions.items()}
+
+
+def default_layout_cache() -> LayoutCache:
+    """
+    Layout cache used by the command-line entry points.
+
+    Persists under the ontology cache directory unless
+    VHF_ONTOLOGY_CACHE=off.
+    """
+    setting = os.environ.get('VHF_ONTOLOGY_CACHE', '').strip()
+    if setting.lower() in ('0', 'off', 'false', 'no'):
+        return LayoutCache()
+    return LayoutCache((Path(setting) if setting else default_cache_dir()) / 'layouts')
@@ -0,0 +1,421 @@
+"""
+VHF Meal Planner (CC-123)
+Weekly meal plans for clients from recipe eligibility and nutrition.
+
+Features:
+- One recipe per meal slot per day, drawn only from recipes the client is
+  eligible for (diets, allergen exclusions, conditions)
+- Daily calorie/macro totals as close as possible to the client MacroTarget,
+  found per day by branch-and-bound with interval lower bounds
+- Per-slot candidate pools (best per-meal matches) and a weekly repeat limit
+- Time budget per plan: the best plan found so far is kept when it runs out
+- Plans for a coach's whole client list across a process pool
+- Plans as meal:MealPlan instance data (JSON-LD)
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ontology_loader import Ontology
+from recipe_eligibility import RECIPE_TYPE, ClientProfile, RecipeEligibilityIndex, client_profiles, has_type
+from nutrition import DEFAULT_WEIGHTS, MacroTarget, NutritionTable, bitset_mask, macro_targets
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MEAL_SLOTS = ('Breakfast', 'Lunch', 'Dinner')
+
+# Meal slot -> recipeCategory values allowed in it (uncategorised recipes fit any slot)
+SLOT_CATEGORIES = {
+    'Breakfast': ('Breakfast',),
+    'Lunch': ('Lunch', 'Dinner'),
+    'Dinner': ('Dinner', 'Lunch'),
+    'Snack': ('Snack',),
+}
+
+DAYS = 7
+MAX_REPEATS = 2
+CANDIDATES = 40
+TIME_BUDGET = 2.0
+
+Totals = Tuple[float, float, float, float]
+
+
+@dataclass
+class MealPlan:
+    """A client's plan: one recipe id (or None if unfilled) per slot per day."""
+    client: str
+    slots: Tuple[str, ...]
+    days: List[List[Optional[str]]] = field(default_factory=list)
+    totals: List[Totals] = field(default_factory=list)
+    distance: float = 0.0
+    timed_out: bool = False
+
+    @property
+    def complete(self) -> bool:
+        """True if every slot of every day has a recipe."""
+        return all(recipe is not None for day in self.days for recipe in day)
+
+    def recipe_counts(self) -> Dict[str, int]:
+        """How often each recipe appears in the plan."""
+        counts: Dict[str, int] = {}
+        for day in self.days:
+            for recipe in day:
+                if recipe is not None:
+                    counts[recipe] = counts.get(recipe, 0) + 1
+        return counts
+
+    def to_jsonld(self, profile: Optional[ClientProfile] = None) -> Dict:
+        """
+        The plan as a meal:MealPlan individual.
+
+        Args:
+            profile: Client profile; its goals become meal:targetsGoal and
+                its diets and allergens meal:meetsRequirement
+
+        Returns:
+            JSON-LD node (compact ids, Recipe & Meal Plan ontology context)
+        """
+        plan_id = f"meal:plan-{self.client.rsplit(':', 1)[-1]}"
+        days = []
+        for d, (recipes, totals) in enumerate(zip(self.days, self.totals), start=1):
+            days.append({
+                "@id": f"{plan_id}/day-{d}",
+                "@type": "meal:MealPlanDay",
+                "position": d,
+                "hasPart": [
+                    {"@type": "meal:Meal", "name": slot, "meal:containsRecipe": recipe}
+                    for slot, recipe in zip(self.slots, recipes) if recipe is not None
+                ],
+                "nutrition": {
+                    "@type": "meal:DailyTotals",
+                    "calories": f"{totals[0]:.0f} kcal",
+                    "proteinContent": f"{totals[1]:.0f}g",
+                    "carbohydrateContent": f"{totals[2]:.0f}g",
+                    "fatContent": f"{totals[3]:.0f}g",
+                },
+            })
+
+        node = {"@id": plan_id, "@type": "meal:MealPlan", "meal:assignedToClient": self.client}
+        if profile is not None:
+            node["meal:targetsGoal"] = list(profile.goals)
+            node["meal:meetsRequirement"] = list(profile.diets) + list(profile.allergens)
+        node["hasPart"] = days
+        return node
+
+
+class MealPlanner:
+    """Builds weekly meal plans over a fixed recipe catalogue."""
+
+    def __init__(
+        self,
+        index: RecipeEligibilityIndex,
+        table: NutritionTable,
+        categories: Optional[Dict[str, str]] = None,
+        slots: Sequence[str] = MEAL_SLOTS,
+        days: int = DAYS,
+        max_repeats: int = MAX_REPEATS,
+        candidates: int = CANDIDATES,
+        time_budget: float = TIME_BUDGET,
+        strict: bool = False,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Args:
+            index: Recipe eligibility index
+            table: Recipe nutrition, in the same recipe order as index
+            categories: recipeCategory per recipe id (see SLOT_CATEGORIES)
+            slots: Meal slots per day
+            days: Days per plan
+            max_repeats: Times a recipe may appear in one plan
+            candidates: Recipes considered per slot (best per-meal matches)
+            time_budget: Seconds per plan before search stops at the best
+                plan found so far
+            strict: Leave out conditional diet matches
+            weights: Weight per macro (default: nutrition.DEFAULT_WEIGHTS)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not installed. Run: pip install numpy")
+        if index.recipes != table.recipes:
+            raise ValueError("index and table must list the same recipes in the same order")
+
+        self.index = index
+        self.table = table
+        self.slots = tuple(slots)
+        self.days = days
+        self.max_repeats = max_repeats
+        self.candidates = candidates
+        self.time_budget = time_budget
+        self.strict = strict
+        self.weights = weights or DEFAULT_WEIGHTS
+
+        categories = categories or {}
+        recipe_categories = np.array([categories.get(recipe, '') for recipe in table.recipes], dtype=object)
+        self._slot_masks = [
+            (recipe_categories == '') | np.isin(recipe_categories, SLOT_CATEGORIES.get(slot, (slot,)))
+            for slot in self.slots
+        ]
+        self._macros = table.macros.astype(float).tolist()
+
+    @classmethod
+    def from_ontology(cls, recipes: Ontology, **options) -> 'MealPlanner':
+        """
+        Planner over a recipe catalogue loaded with include_instances=True.
+
+        Args:
+            recipes: Ontology containing recipe:Recipe individuals
+            **options: MealPlanner options (slots, days, max_repeats, ...)
+
+        Returns:
+            MealPlanner
+        """
+        categories = {
+            entity.id: entity.properties['recipeCategory']
+            for entity in recipes.entities
+            if has_type(entity, RECIPE_TYPE) and isinstance(entity.properties.get('recipeCategory'), str)
+        }
+        return cls(RecipeEligibilityIndex.from_ontology(recipes), NutritionTable.from_ontology(recipes),
+                   categories, **options)
+
+    def plan(self, profile: ClientProfile, target: MacroTarget) -> MealPlan:
+        """
+        Weekly plan for one client.
+
+        Days are planned in turn, each the best day (closest daily totals)
+        given the recipes still under the repeat limit. A recipe appears at
+        most once per day. Slots with no eligible recipe left stay None.
+
+        Args:
+            profile: Client diets, allergens and conditions
+            target: Client daily macro target
+
+        Returns:
+            MealPlan
+        """
+        deadline = time.perf_counter() + self.time_budget
+        goal = target.as_tuple()
+        weight = tuple(self.weights.get(name, 0.0) for name in MacroTarget.__annotations__)
+        pools = self._candidate_pools(profile, target)
+
+        plan = MealPlan(profile.id, self.slots)
+        usage: Dict[int, int] = {}
+        for _ in range(self.days):
+            available = [[i for i in pool if usage.get(i, 0) < self.max_repeats] for pool in pools]
+            chosen, timed_out = self._plan_day(available, goal, weight, deadline)
+            plan.timed_out |= timed_out
+
+            totals = [0.0, 0.0, 0.0, 0.0]
+            for i in chosen:
+                if i is not None:
+                    usage[i] = usage.get(i, 0) + 1
+                    totals = [t + m for t, m in zip(totals, self._macros[i])]
+            plan.days.append([None if i is None else self.table.recipes[i] for i in chosen])
+            plan.totals.append(tuple(totals))
+            plan.distance += _distance(totals, goal, weight)
+        return plan
+
+    def plan_many(
+        self,
+        clients: Sequence[Tuple[ClientProfile, MacroTarget]],
+        workers: Optional[int] = None
+    ) -> List[MealPlan]:
+        """
+        Plans for several clients across a process pool.
+
+        Args:
+            clients: (profile, target) pairs
+            workers: Worker processes (default: CPU count; 1 plans in-process)
+
+        Returns:
+            One MealPlan per client, in input order
+        """
+        workers = min(workers or os.cpu_count() or 1, len(clients))
+        if workers <= 1:
+            return [self.plan(profile, target) for profile, target in clients]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self,)) as pool:
+            return list(pool.map(_plan_worker, clients))
+
+    def _candidate_pools(self, profile: ClientProfile, target: MacroTarget) -> List[List[int]]:
+        """Per slot, eligible recipe positions closest to a per-meal share of the target, best first."""
+        eligible = bitset_mask(self.index.eligible_for(profile, strict=self.strict), len(self.table))
+        distance = self.table.score(target, len(self.slots), self.weights)
+        pools = []
+        for mask in self._slot_masks:
+            candidates = np.flatnonzero(eligible & mask & np.isfinite(distance))
+            if len(candidates) > self.candidates:
+                candidates = candidates[np.argpartition(distance[candidates], self.candidates)[:self.candidates]]
+            pools.append(candidates[np.argsort(distance[candidates], kind='stable')].tolist())
+        return pools
+
+    def _plan_day(
+        self,
+        pools: List[List[int]],
+        goal: Totals,
+        weight: Totals,
+        deadline: float
+    ) -> Tuple[List[Optional[int]], bool]:
+        """
+        Best recipe per slot for one day by depth-first branch-and-bound.
+
+        Days with fewer unfilled slots win, then closer totals. A slot is
+        left unfilled only if all its candidates are already used that day.
+        Once a full day is found, a branch is cut when the closest totals
+        its remaining slots could reach (each slot adds between its pool's
+        minimum and maximum per macro) are no better. Past the deadline the
+        search stops at the best day found so far.
+
+        Returns:
+            (recipe position or None per slot, True if the deadline cut the search)
+        """
+        macros = self._macros
+        order = [s for s, pool in enumerate(pools) if pool]
+        chosen: List[Optional[int]] = [None] * len(pools)
+        if not order:
+            return chosen, False
+        # Per-macro range the slots from order[k:] can still add
+        low = [[0.0] * 4 for _ in range(len(order) + 1)]
+        high = [[0.0] * 4 for _ in range(len(order) + 1)]
+        for k in range(len(order) - 1, -1, -1):
+            rows = [macros[i] for i in pools[order[k]]]
+            low[k] = [a + min(column) for a, column in zip(low[k + 1], zip(*rows))]
+            high[k] = [a + max(column) for a, column in zip(high[k + 1], zip(*rows))]
+
+        # The last slot is chosen in one vectorised pass over its pool
+        used = [g > 0 and w > 0 for g, w in zip(goal, weight)]
+        last = len(order) - 1
+        final_pool = np.asarray(pools[order[last]])
+        final_rows = np.asarray([macros[i] for i in final_pool])[:, used]
+        final_goal = np.asarray(goal)[used]
+        final_weight = np.asarray(weight)[used] / final_goal
+
+        best: List = [(len(order) + 1, float('inf')), None]  # ((unfilled slots, distance), path)
+        timed_out = False
+        path: List[Optional[int]] = []
+
+        def finish(choice: Optional[int], distance: float) -> None:
+            """Record path + choice as a complete day if it beats the best."""
+            score = (path.count(None) + (choice is None), distance)
+            if score < best[0]:
+                best[0], best[1] = score, path + [choice]
+
+        def search(k: int, totals: List[float]) -> bool:
+            """Extend the partial day; returns False once the deadline has passed."""
+            nonlocal timed_out
+            if k == last:
+                distance = np.abs(final_rows + np.asarray(totals)[used] - final_goal) @ final_weight
+                for i in path:
+                    distance[final_pool == i] = np.inf
+                j = int(np.argmin(distance))
+                if np.isinf(distance[j]):  # every candidate is already used today
+                    finish(None, _distance(totals, goal, weight))
+                else:
+                    finish(int(final_pool[j]), float(distance[j]))
+                return True
+            placed = False
+            for i in pools[order[k]]:
+                if i in path:
+                    continue
+                placed = True
+                row = macros[i]
+                partial = [t + m for t, m in zip(totals, row)]
+                if best[0][0] == 0 and _bound(partial, low[k + 1], high[k + 1], goal, weight) >= best[0][1]:
+                    continue
+                path.append(i)
+                going = search(k + 1, partial)
+                path.pop()
+                if not going:
+                    return False
+                if best[1] is not None and time.perf_counter() > deadline:
+                    timed_out = True
+                    return False
+            if not placed:  # every candidate is already used today
+                path.append(None)
+                going = search(k + 1, totals)
+                path.pop()
+                return going
+            return True
+
+        search(0, [0.0, 0.0, 0.0, 0.0])
+        for s, i in zip(order, best[1] or ()):
+            chosen[s] = i
+        return chosen, timed_out
+
+
+def coach_clients(personas: Ontology, coach: str) -> List[str]:
+    """
+    Clients a coach manages (coach:manages or client:coachedBy), in persona order.
+
+    Args:
+        personas: Ontology containing coach and client individuals
+        coach: Coach id (e.g. 'coach:james-kerby')
+
+    Returns:
+        Client ids
+    """
+    managed = set()
+    for rel in personas.relationships:
+        if rel.label == 'coach:manages' and rel.source == coach:
+            managed.add(rel.target)
+        elif rel.label == 'client:coachedBy' and rel.target == coach:
+            managed.add(rel.source)
+    return [entity.id for entity in personas.entities if entity.id in managed]
+
+
+def plan_for_coach(
+    planner: MealPlanner,
+    personas: Ontology,
+    coach: str,
+    workers: Optional[int] = None
+) -> Dict[str, MealPlan]:
+    """
+    Plans for every client a coach manages that has a macro target.
+
+    Args:
+        planner: Planner over the recipe catalogue
+        personas: Ontology containing coach and client individuals
+        coach: Coach id
+        workers: Worker processes (see MealPlanner.plan_many)
+
+    Returns:
+        Dict mapping client ids to plans, in persona order
+    """
+    profiles = client_profiles(personas)
+    targets = macro_targets(personas)
+    clients = [client for client in coach_clients(personas, coach) if client in profiles and client in targets]
+    plans = planner.plan_many([(profiles[client], targets[client]) for client in clients], workers=workers)
+    return dict(zip(clients, plans))
+
+
+def _distance(totals: Sequence[float], goal: Totals, weight: Totals) -> float:
+    """Weighted relative error of daily totals against the daily target."""
+    return sum(w * abs(t - g) / g for t, g, w in zip(totals, goal, weight) if g > 0 and w > 0)
+
+
+def _bound(totals: Sequence[float], low: Sequence[float], high: Sequence[float], goal: Totals, weight: Totals) -> float:
+    """Lower bound of _distance over every completion adding between low and high."""
+    bound = 0.0
+    for t, lo, hi, g, w in zip(totals, low, high, goal, weight):
+        if g > 0 and w > 0:
+            gap = t + lo - g if t + lo > g else g - t - hi if t + hi < g else 0.0
+            bound += w * gap / g
+    return bound
+
+
+_WORKER_PLANNER: Optional[MealPlanner] = None
+
+
+def _init_worker(planner: MealPlanner) -> None:
+    """Keep the planner in the worker so it is sent once per process."""
+    global _WORKER_PLANNER
+    _WORKER_PLANNER = planner
+
+
+def _plan_worker(client: Tuple[ClientProfile, MacroTarget]) -> MealPlan:
+    """Process pool entry point: plan one client."""
+    return _WORKER_PLANNER.plan(*client)
@@ -0,0 +1,129 @@
+"""
+VHF Node Id Index (CC-119)
+Substring lookup of graph nodes by id, indexed once per graph.
+
+Features:
+- Trigram index over str(node) with exact substring verification
+- Results in graph node order, memoised per query
+- Stored on the graph (G.graph['node_id_index']), extended as nodes are added,
+  rebuilt when the node set no longer matches and dropped by GraphDelta.apply
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+import networkx as nx
+
+INDEX_KEY = 'node_id_index'
+NGRAM = 3
+
+
+class NodeIdIndex:
+    """Trigram index answering 'which node ids contain this text'."""
+
+    def __init__(self, nodes: Iterable = ()):
+        """Index nodes (in the given order)."""
+        self.owner: Optional[nx.DiGraph] = None
+        self.nodes: List[Any] = []
+        self.keys: List[str] = []
+        self.position: Dict[Any, int] = {}
+        self.grams: Dict[str, List[int]] = {}
+        self._results: Dict[str, List[Any]] = {}
+        self.add(nodes)
+
+    def add(self, nodes: Iterable) -> None:
+        """Index further nodes; they sort after those already indexed."""
+        grams = self.grams
+        for node in nodes:
+            if node in self.position:
+                continue
+            i = len(self.nodes)
+            key = str(node)
+            self.nodes.append(node)
+            self.keys.append(key)
+            self.position[node] = i
+            for gram in {key[j:j + NGRAM] for j in range(len(key) - NGRAM + 1)}:
+                postings = grams.get(gram)
+                if postings is None:
+                    grams[gram] = [i]
+                else:
+                    postings.append(i)
+        self._results.clear()
+
+    def find(self, text: str) -> List[Any]:
+        """
+        Nodes whose id contains text, in index order.
+
+        Candidates come from the rarest trigram of text (every node for
+        queries shorter than a trigram) and are checked with a substring
+        test, so results equal [n for n in nodes if text in str(n)].
+        """
+        found = self._results.get(text)
+        if found is not None:
+            return found
+
+        if len(text) < NGRAM:
+            candidates: Iterable[int] = range(len(self.nodes))
+        else:
+            candidates = min(
+                (self.grams.get(text[j:j + NGRAM], ()) for j in range(len(text) - NGRAM + 1)),
+                key=len
+            )
+        keys = self.keys
+        found = [self.nodes[i] for i in candidates if text in keys[i]]
+        self._results[text] = found
+        return found
+
+    def __contains__(self, node: Any) -> bool:
+        """True if node is indexed."""
+        return node in self.position
+
+    def __len__(self) -> int:
+        """Number of indexed nodes."""
+        return len(self.nodes)
+
+    def __getstate__(self) -> Dict:
+        """Pickle the index data only; the owner is re-attached on use."""
+        state = self.__dict__.copy()
+        state['owner'] = None
+        return state
+
+
+def node_id_index(G: nx.DiGraph) -> NodeIdIndex:
+    """
+    Node id index of a graph, built on first use and kept in G.graph.
+
+    The stored index is reused while its nodes are exactly G's nodes
+    (compared as sets, so a removal followed by an addition is caught).
+    Nodes added since the last call are indexed incrementally; if nodes
+    were removed the index is rebuilt. Subgraph views get a temporary
+    index (they share G.graph with their graph).
+
+    Args:
+        G: Graph to index
+
+    Returns:
+        NodeIdIndex over G's nodes
+    """
+    index = G.graph.get(INDEX_KEY)
+    if isinstance(index, NodeIdIndex):
+        nodes = G.nodes.keys()
+        if index.owner is None and not hasattr(G, '_graph') and index.position.keys() == nodes:
+            index.owner = G  # unpickled with its graph
+        if index.owner is G:
+            if index.position.keys() == nodes:
+                return index
+            if len(index) < len(G) and all(node in G for node in index.nodes):
+                index.add(node for node in G if node not in index.position)
+                return index
+
+    index = NodeIdIndex(G)
+    if not hasattr(G, '_graph'):  # views share their graph's G.graph
+        index.owner = G
+        G.graph[INDEX_KEY] = index
+    return index
+
+
+def drop_node_id_index(G: nx.DiGraph) -> None:
+    """Forget G's stored node id index (after changing nodes in place)."""
+    if isinstance(G.graph.get(INDEX_KEY), NodeIdIndex):
+        del G.graph[INDEX_KEY]
@@ -0,0 +1,276 @@
+"""
+VHF Nutrition (CC-122)
+Numeric recipe nutrition and vectorised scoring against client macro targets.
+
+Features:
+- Parse schema.org NutritionInformation strings ("380 kcal", "42g", "180mg")
+  into a NumPy structured array, one row per recipe
+- Client MacroTargets (plain numbers, unit strings or QuantitativeValues)
+- Score and rank the whole catalogue against a target in one vectorised pass
+- Restrict ranking to an eligibility bitset (see recipe_eligibility)
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ontology_loader import Ontology
+from recipe_eligibility import RECIPE_TYPE, CLIENT_TYPE, has_type
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+NUTRITION_PREDICATE = 'nutrition'
+MACRO_TARGET_PREDICATE = 'client:hasMacroTarget'
+
+# Nutrient -> (schema.org NutritionInformation property, unit stored)
+NUTRIENTS = {
+    'calories': ('calories', 'kcal'),
+    'protein': ('proteinContent', 'g'),
+    'carbs': ('carbohydrateContent', 'g'),
+    'fat': ('fatContent', 'g'),
+    'fiber': ('fiberContent', 'g'),
+    'sugar': ('sugarContent', 'g'),
+    'saturated_fat': ('saturatedFatContent', 'g'),
+    'sodium': ('sodiumContent', 'mg'),
+}
+
+# MacroTarget property -> nutrient
+TARGET_PROPERTIES = {
+    'dailyCalories': 'calories',
+    'proteinGrams': 'protein',
+    'carbsGrams': 'carbs',
+    'fatsGrams': 'fat',
+}
+
+# Unit -> (dimension, factor to the dimension's base unit: kcal / g)
+UNITS = {
+    'kcal': ('energy', 1.0), 'cal': ('energy', 1.0), 'calories': ('energy', 1.0),
+    'kj': ('energy', 1 / 4.184),
+    'g': ('mass', 1.0), 'grams': ('mass', 1.0), 'gram': ('mass', 1.0),
+    'mg': ('mass', 1e-3), 'ug': ('mass', 1e-6), 'µg': ('mass', 1e-6), 'mcg': ('mass', 1e-6),
+    'kg': ('mass', 1e3),
+}
+
+DEFAULT_MEALS_PER_DAY = 3
+DEFAULT_WEIGHTS = {'calories': 1.0, 'protein': 1.0, 'carbs': 0.5, 'fat': 0.5}
+
+_QUANTITY = re.compile(r'\s*([-+]?\d+(?:\.\d*)?|\.\d+)\s*([^\d\s]*)')
+
+
+def parse_quantity(value: Any, unit: str) -> float:
+    """
+    Numeric value of a quantity in the given unit.
+
+    Numbers are taken as already in unit; strings like "380 kcal", "42g" or
+    "0.5 g" are converted ("180mg" -> 0.18 for unit 'g'). Unparseable
+    values and unit mismatches (e.g. grams for kcal) give NaN.
+    """
+    if isinstance(value, bool):
+        return float('nan')
+    if isinstance(value, (int, float)):
+        return float(value)
+    if not isinstance(value, str):
+        return float('nan')
+
+    match = _QUANTITY.match(value)
+    if not match:
+        return float('nan')
+    number = float(match.group(1))
+    given = match.group(2).lower().rstrip('.')
+    if not given:
+        return number
+    source, target = UNITS.get(given), UNITS.get(unit)
+    if source is None or target is None or source[0] != target[0]:
+        return float('nan')
+    return number * source[1] / target[1]
+
+
+@dataclass
+class MacroTarget:
+    """Daily calorie and macronutrient targets of one client."""
+    calories: float
+    protein: float
+    carbs: float
+    fat: float
+
+    def per_meal(self, meals_per_day: int = DEFAULT_MEALS_PER_DAY) -> 'MacroTarget':
+        """Target for one of meals_per_day equal meals."""
+        return MacroTarget(*(value / meals_per_day for value in self.as_tuple()))
+
+    def as_tuple(self) -> Tuple[float, float, float, float]:
+        """(calories, protein, carbs, fat)."""
+        return (self.calories, self.protein, self.carbs, self.fat)
+
+
+class NutritionTable:
+    """Per-serving nutrition of a recipe catalogue as a structured array."""
+
+    def __init__(self, recipes: Sequence[str], values: 'np.ndarray'):
+        """
+        Args:
+            recipes: Recipe ids, one per row
+            values: Structured array with one float32 field per NUTRIENTS
+                key (NaN where unknown)
+        """
+        self.recipes = list(recipes)
+        self.position = {recipe: i for i, recipe in enumerate(self.recipes)}
+        self.values = values
+        # (n, 4) float32 columns in MacroTarget order, for scoring
+        self.macros = np.stack([values[name] for name in MacroTarget.__annotations__], axis=1)
+
+    @classmethod
+    def from_ontology(cls, ontology: Ontology) -> 'NutritionTable':
+        """
+        Parse recipe nutrition from instance data.
+
+        Recipes are recipe:Recipe individuals (loaded with
+        include_instances=True); their nested nutrition blocks are the
+        entities their 'nutrition' relationships point to. Rows follow
+        recipe order in the ontology, like RecipeEligibilityIndex.
+
+        Args:
+            ontology: Ontology containing recipes and nutrition blocks
+
+        Returns:
+            NutritionTable with one row per recipe
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not installed. Run: pip install numpy")
+
+        recipes = [entity.id for entity in ontology.entities if has_type(entity, RECIPE_TYPE)]
+        properties, children = _instance_maps(ontology)
+        blocks = [children.get((recipe, NUTRITION_PREDICATE)) for recipe in recipes]
+
+        values = np.full(len(recipes), np.nan, dtype=nutrition_dtype())
+        for name, (prop, unit) in NUTRIENTS.items():
+            values[name] = [
+                parse_quantity(_block_value(block, prop, properties, children), unit) if block else np.nan
+                for block in blocks
+            ]
+        return cls(recipes, values)
+
+    def __len__(self) -> int:
+        """Number of recipes."""
+        return len(self.recipes)
+
+    def score(
+        self,
+        target: MacroTarget,
+        meals_per_day: int = DEFAULT_MEALS_PER_DAY,
+        weights: Optional[Dict[str, float]] = None
+    ) -> 'np.ndarray':
+        """
+        Distance of every recipe from a per-meal share of a daily target.
+
+        The distance is the weighted sum over calories, protein, carbs and
+        fat of |recipe - target| / target, so 0 is a perfect match.
+        Recipes with missing values score inf.
+
+        Args:
+            target: Client daily macro target
+            meals_per_day: Meals the daily target is split across
+            weights: Weight per macro (default: DEFAULT_WEIGHTS)
+
+        Returns:
+            float32 array of distances, one per recipe
+        """
+        weights = weights or DEFAULT_WEIGHTS
+        goal = np.asarray(target.per_meal(meals_per_day).as_tuple(), dtype=np.float32)
+        weight = np.asarray([weights.get(name, 0.0) for name in MacroTarget.__annotations__], dtype=np.float32)
+        used = (goal > 0) & (weight > 0)
+
+        relative = np.abs(self.macros[:, used] - goal[used]) / goal[used]
+        distance = relative @ weight[used]
+        distance[np.isnan(distance)] = np.inf
+        return distance
+
+    def rank(
+        self,
+        target: MacroTarget,
+        k: Optional[int] = None,
+        eligible: Optional['np.ndarray'] = None,
+        meals_per_day: int = DEFAULT_MEALS_PER_DAY,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Recipes closest to a target, best first.
+
+        Args:
+            target: Client daily macro target
+            k: Number of recipes (default: all scored)
+            eligible: Boolean mask of allowed recipes (see bitset_mask)
+            meals_per_day: Meals the daily target is split across
+            weights: Weight per macro (default: DEFAULT_WEIGHTS)
+
+        Returns:
+            (recipe id, distance) pairs; recipes with missing values are left out
+        """
+        distance = self.score(target, meals_per_day, weights)
+        candidates = np.flatnonzero(np.isfinite(distance) if eligible is None
+                                    else np.isfinite(distance) & eligible)
+        if k is not None and k < len(candidates):
+            candidates = candidates[np.argpartition(distance[candidates], k)[:k]]
+        order = candidates[np.argsort(distance[candidates], kind='stable')]
+        return [(self.recipes[i], float(distance[i])) for i in order]
+
+
+def nutrition_dtype() -> 'np.dtype':
+    """Structured dtype with one float32 field per nutrient."""
+    return np.dtype([(name, np.float32) for name in NUTRIENTS])
+
+
+def bitset_mask(bits: int, n: int) -> 'np.ndarray':
+    """Boolean array of length n from an eligibility bitset (bit i = row i)."""
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(raw, count=n, bitorder='little').astype(bool)
+
+
+def macro_targets(ontology: Ontology) -> Dict[str, MacroTarget]:
+    """
+    Daily macro targets of clients from persona instance data.
+
+    Values may be numbers, strings with units ("112 g") or nested
+    QuantitativeValues ({"value": 112, "unitCode": "GRM"}). Clients with
+    no or incomplete targets are left out.
+
+    Args:
+        ontology: Ontology containing client:Client individuals
+
+    Returns:
+        Dict mapping client ids to MacroTargets
+    """
+    if not NUMPY_AVAILABLE:
+        raise ImportError("NumPy not installed. Run: pip install numpy")
+
+    properties, children = _instance_maps(ontology)
+    targets = {}
+    for entity in ontology.entities:
+        block = children.get((entity.id, MACRO_TARGET_PREDICATE))
+        if block is None or not has_type(entity, CLIENT_TYPE):
+            continue
+        amounts = {
+            nutrient: parse_quantity(_block_value(block, prop, properties, children), NUTRIENTS[nutrient][1])
+            for prop, nutrient in TARGET_PROPERTIES.items()
+        }
+        if not any(np.isnan(amount) for amount in amounts.values()):
+            targets[entity.id] = MacroTarget(**amounts)
+    return targets
+
+
+def _instance_maps(ontology: Ontology) -> Tuple[Dict[str, Dict], Dict[Tuple[str, str], str]]:
+    """Entity properties by id, and (source, label) -> target of relationships."""
+    properties = {entity.id: entity.properties for entity in ontology.entities}
+    children = {(rel.source, rel.label): rel.target for rel in ontology.relationships}
+    return properties, children
+
+
+def _block_value(block: str, prop: str, properties: Dict, children: Dict) -> Any:
+    """Property of a nested block; nested QuantitativeValues give their 'value'."""
+    value = properties.get(block, {}).get(prop)
+    if value is None and (block, prop) in children:
+        value = properties.get(children[block, prop], {}).get('value')
+    return value
@@ -0,0 +1,202 @@
+"""
+VHF Ontology Cache (CC-109)
+Persistent on-disk cache for parsed ontologies and built graphs.
+
+Features:
+- Entries keyed by resolved file path plus a caller-supplied namespace
+- Validation by size/mtime, falling back to a content hash
+- Compact binary storage (zlib-compressed pickle)
+- Size-based eviction of least recently used entries
+"""
+
+import os
+import pickle
+import hashlib
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# Bump when the entry layout or cached object shapes change
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+ENTRY_SUFFIX = '.bin'
+
+
+def default_cache_dir() -> Path:
+    """Default cache location (~/.cache/vhf-ontology-tools)."""
+    base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+    return Path(base) / 'vhf-ontology-tools'
+
+
+def file_digest(path: str | Path) -> str:
+    """Hash file contents without decoding them."""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def evict_lru(cache_dir: Path, suffix: str, max_bytes: int) -> int:
+    """
+    Remove least recently used entry files until their total size is within max_bytes.
+
+    Recency is the file mtime, which readers refresh with os.utime on a hit.
+
+    Args:
+        cache_dir: Directory holding the entries
+        suffix: Entry file suffix (other files are left alone)
+        max_bytes: Size limit for all entries together
+
+    Returns:
+        Number of entries removed
+    """
+    entries = []
+    total = 0
+    for path in cache_dir.glob(f'*{suffix}'):
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, path))
+        total += stat.st_size
+
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+class OntologyCache:
+    """Cache parsed objects on disk, keyed by source file and namespace."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | Path] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES
+    ):
+        """Initialize cache in cache_dir, evicting entries beyond max_bytes."""
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir()
+        self.max_bytes = max_bytes
+
+    def get(self, namespace: str, source: str | Path) -> Optional[Any]:
+        """
+        Return the cached object for a source file, or None on a miss.
+
+        Args:
+            namespace: Kind of object cached (e.g. 'ontology', 'graph')
+            source: File the object was derived from
+
+        Returns:
+            Cached object if the file is unchanged, otherwise None
+        """
+        source = Path(source).resolve()
+        entry_path = self._entry_path(namespace, source)
+
+        try:
+            stat = source.stat()
+            with open(entry_path, 'rb') as f:
+                header = pickle.load(f)
+                payload = f.read()
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+
+        if header.get('format') != CACHE_FORMAT_VERSION or header.get('source') != str(source):
+            return None
+
+        if (header['size'], header['mtime_ns']) != (stat.st_size, stat.st_mtime_ns):
+            # Touched but possibly unchanged (checkout, copy): compare contents
+            if header['size'] != stat.st_size or header['digest'] != file_digest(source):
+                return None
+            header.update(mtime_ns=stat.st_mtime_ns)
+            self._write_entry(entry_path, header, payload)
+
+        try:
+            value = pickle.loads(zlib.decompress(payload))
+        except (zlib.error, pickle.UnpicklingError, AttributeError, ImportError):
+            self._remove(entry_path)
+            return None
+
+        # Mark as recently used for eviction ordering
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, namespace: str, source: str | Path, value: Any) -> None:
+        """Store an object derived from a source file."""
+        source = Path(source).resolve()
+        stat = source.stat()
+
+        header = {
+            'format': CACHE_FORMAT_VERSION,
+            'source': str(source),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'digest': file_digest(source),
+        }
+        payload = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._write_entry(self._entry_path(namespace, source), header, payload)
+        self.evict()
+
+    def evict(self) -> int:
+        """Remove least recently used entries until under max_bytes."""
+        return evict_lru(self.cache_dir, ENTRY_SUFFIX, self.max_bytes)
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for path in self.cache_dir.glob(f'*{ENTRY_SUFFIX}'):
+            self._remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """Get entry count and total size in bytes."""
+        sizes = [p.stat().st_size for p in self.cache_dir.glob(f'*{ENTRY_SUFFIX}')]
+        return {'entries': len(sizes), 'bytes': sum(sizes)}
+
+    def _entry_path(self, namespace: str, source: Path) -> Path:
+        """Entry file for a namespace/source pair."""
+        key = hashlib.blake2b(f'{namespace}\0{source}'.encode('utf-8'), digest_size=16)
+        return self.cache_dir / f'{key.hexdigest()}{ENTRY_SUFFIX}'
+
+    def _write_entry(self, entry_path: Path, header: Dict, payload: bytes) -> None:
+        """Write an entry atomically so concurrent readers never see partial files."""
+        tmp_path = entry_path.with_name(f'{entry_path.name}.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(payload)
+            os.replace(tmp_path, entry_path)
+        except OSError:
+            self._remove(tmp_path)
+
+    def _remove(self, path: Path) -> None:
+        """Delete a file, ignoring races with other processes."""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def default_cache() -> Optional[OntologyCache]:
+    """
+    Cache used by the command-line entry points.
+
+    Set VHF_ONTOLOGY_CACHE=off to disable caching, or to a directory path
+    to relocate it.
+    """
+    setting = os.environ.get('VHF_ONTOLOGY_CACHE', '').strip()
+    if setting.lower() in ('0', 'off', 'false', 'no'):
+        return None
+    return OntologyCache(setting or None)
@@ -8,11 +8,18 @@ Supports:
 - OAA-generated ontologies
 """
 
+import hashlib
 import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
+from ontology_cache import OntologyCache
+from ontology_store import OntologyStore
+
 
 @dataclass
 class Entity:
@@ -38,7 +45,12 @@ class Relationship:
 
 @dataclass
 class Ontology:
-    """Complete ontology structure."""
+    """
+    Complete ontology structure.
+
+    entities and relationships are plain lists, or sequence views over an
+    OntologyStore when loaded with OntologyLoader(compact=True).
+    """
     id: str
     name: str
     version: str
@@ -49,39 +61,484 @@ class Ontology:
     business_rules: List[Dict[str, str]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def store(self) -> Optional[OntologyStore]:
+        """Columnar store backing entities, if compact."""
+        return getattr(self.entities, 'store', None)
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading one file in a batch."""
+    path: str
+    ontology: Optional[Ontology] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the file loaded successfully."""
+        return self.error is None
+
+
+# Top-level keys that take precedence over @graph in parse_ontology dispatch
+_FORMAT_KEYS = ("registryEntry", "ontologyDefinition", "classes")
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+class _StreamFallback(Exception):
+    """Raised when a document cannot be streamed and needs a full parse."""
+
+
+class _JSONStream:
+    """Incremental tokenizer over a JSON text file read in fixed-size chunks."""
+
+    def __init__(self, fh, chunk_size: int):
+        self._fh = fh
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, grow: bool = False) -> bool:
+        """Append the next chunk to the unread part of the buffer."""
+        if self._eof:
+            return False
+        size = self._chunk_size
+        if grow:
+            # Values larger than a chunk: read geometrically to stay linear
+            size = max(size, len(self._buf) - self._pos)
+        data = self._fh.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + data
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars."""
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Malformed JSON: expected one of {chars!r}, got {char!r}")
+        self._pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode and consume one complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(grow=True):
+                    continue
+                raise
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self._buf) and self._fill(grow=True):
+                continue
+            self._pos = end
+            return obj
+
+
+def _iter_json_document(fh, chunk_size: int) -> Iterator[Tuple[str, Any]]:
+    """
+    Walk a top-level JSON object incrementally.
+
+    Yields (key, value) for every top-level member, except that the members
+    of a top-level "@graph" array are yielded one at a time as ("@graph", node),
+    so the array is never held in memory as a whole.
+    """
+    stream = _JSONStream(fh, chunk_size)
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+
+    while True:
+        key = stream.value()
+        stream.expect(":")
+
+        if key == "@graph" and stream.peek() == "[":
+            stream.expect("[")
+            if stream.peek() == "]":
+                stream.expect("]")
+            else:
+                while True:
+                    yield key, stream.value()
+                    if stream.expect(",]") == "]":
+                        break
+        else:
+            yield key, stream.value()
+
+        if stream.expect(",}") == "}":
+            return
+
+
+def _id_coerced_properties(*contexts: Any) -> Set[str]:
+    """Properties declared {"@type": "@id"} in any of the given @context objects."""
+    properties = set()
+    for context in contexts:
+        if isinstance(context, dict):
+            for key, value in context.items():
+                if isinstance(value, dict) and value.get("@type") == "@id":
+                    properties.add(key)
+    return properties
+
+
+class _InstanceParser:
+    """
+    Convert JSON-LD individuals (ABox node objects) into entities and edges.
+
+    Every typed node becomes an Entity whose entity_type is its first @type
+    (all types are kept in properties["@type"] when there are several).
+    Literal values stay in properties; @id references, strings of
+    @id-coerced properties and nested node objects become Relationships
+    labelled with the property name. Nested blank nodes get deterministic
+    ids derived from their parent, e.g. "recipe:r-001/nutrition".
+    """
+
+    def __init__(self, id_properties: Set[str]):
+        self.id_properties = id_properties
+        self._blank_count = 0
+
+    def parse(self, node: Dict[str, Any]) -> List[Entity | Relationship]:
+        """Parse one top-level @graph node and everything nested in it."""
+        items: List[Entity | Relationship] = []
+        self._parse_node(node, node.get("@id"), items)
+        return items
+
+    def _parse_node(self, node: Dict[str, Any], node_id: Optional[str], items: List) -> None:
+        if not node_id:
+            self._blank_count += 1
+            node_id = f"_:b{self._blank_count}"
+
+        types = node.get("@type") or []
+        if isinstance(types, str):
+            types = [types]
+
+        description = node.get("description", node.get("rdfs:comment", ""))
+        entity = Entity(
+            id=node_id,
+            label=_instance_label(node, node_id),
+            description=description if isinstance(description, str) else "",
+            entity_type=types[0] if types else "Individual"
+        )
+        items.append(entity)
+
+        properties = entity.properties
+        if len(types) > 1:
+            properties["@type"] = list(types)
+
+        id_properties = self.id_properties
+        for key, value in node.items():
+            if key[0] == "@":
+                continue
+
+            value_type = type(value)
+            if value_type is not list and value_type is not dict:
+                # Plain scalar: by far the most common case
+                if key in id_properties and value_type is str:
+                    items.append(_instance_edge(node_id, key, value))
+                else:
+                    properties[key] = value
+                continue
+
+            is_list = value_type is list
+            values = value if is_list else (value,)
+            literals = []
+
+            for i, item in enumerate(values):
+                if type(item) is dict:
+                    if "@value" in item:
+                        literals.append(item["@value"])
+                        continue
+
+                    ref = item.get("@id")
+                    if ref is not None and "@type" not in item:
+                        # Reference, possibly annotated (e.g. {"@id": ..., "note": ...})
+                        notes = ""
+                        if len(item) > 1:
+                            notes = "; ".join(f"{k}: {v}" for k, v in item.items() if k != "@id")
+                        items.append(_instance_edge(node_id, key, ref, notes))
+                        continue
+
+                    child_id = ref or (f"{node_id}/{key}/{i}" if is_list else f"{node_id}/{key}")
+                    items.append(_instance_edge(node_id, key, child_id))
+                    self._parse_node(item, child_id, items)
+                elif key in id_properties and type(item) is str:
+                    items.append(_instance_edge(node_id, key, item))
+                else:
+                    literals.append(item)
+
+            if literals:
+                properties[key] = literals if is_list else literals[0]
+
+
+def _instance_label(node: Dict[str, Any], node_id: str) -> str:
+    """Display label for an individual."""
+    label = node.get("name") or node.get("rdfs:label")
+    if label is None and ("givenName" in node or "familyName" in node):
+        label = f"{node.get('givenName', '')} {node.get('familyName', '')}".strip()
+    return str(label) if label else node_id
+
+
+def _instance_edge(source: str, predicate: str, target: str, description: str = "") -> Relationship:
+    """Relationship for one (subject, predicate, object) reference."""
+    return Relationship(f"{source}|{predicate}|{target}", predicate, source, target, "", description)
+
 
 class OntologyLoader:
     """Load and parse JSON-LD ontology files."""
 
-    def __init__(self, base_path: Optional[Path] = None):
-        """Initialize loader with optional base path for ontology files."""
+    # Bytes read per chunk when streaming @graph documents
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        cache: Optional[OntologyCache] = None,
+        compact: bool = False,
+        include_instances: bool = False,
+        context: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize loader.
+
+        Args:
+            base_path: Base directory for relative ontology paths
+            cache: Optional on-disk cache of parsed ontologies
+            compact: Store entities/relationships in a columnar OntologyStore
+                instead of per-item dataclasses
+            include_instances: Also ingest typed individuals from @graph
+                (recipes, clients, ...) instead of only classes/properties
+            context: Extra JSON-LD @context merged with each document's own,
+                e.g. the vocabulary ontology's context declaring which
+                properties hold @id references
+        """
         self.base_path = base_path or Path.cwd()
+        self.cache = cache
+        self.compact = compact
+        self.include_instances = include_instances
+        self.context = context
 
-    def load_file(self, file_path: str | Path) -> Ontology:
-        """Load ontology from JSON file."""
+    def _resolve(self, file_path: str | Path) -> Path:
+        """Resolve a file path against the loader base path."""
         path = Path(file_path)
         if not path.is_absolute():
             path = self.base_path / path
+        return path
+
+    def load_file(self, file_path: str | Path, stream: bool = False) -> Ontology:
+        """
+        Load ontology from JSON file.
+
+        Args:
+            file_path: Ontology file, absolute or relative to base_path
+            stream: Walk @graph node by node instead of decoding the whole
+                document up front (see iter_file)
+
+        Returns:
+            Parsed Ontology
+        """
+        path = self._resolve(file_path)
+
+        if self.cache is None:
+            return self._load_path(path, stream)
+
+        # Warm start: unchanged files skip JSON decoding entirely
+        ontology = self.cache.get(self._cache_namespace(), path)
+        if ontology is None:
+            ontology = self._load_path(path, stream)
+            self.cache.put(self._cache_namespace(), path, ontology)
+        return ontology
+
+    def load_many(
+        self,
+        paths: Iterable[str | Path],
+        workers: Optional[int] = None,
+        stream: bool = False
+    ) -> List[LoadResult]:
+        """
+        Load several ontology files across a process pool.
+
+        Args:
+            paths: Ontology files, absolute or relative to base_path
+            workers: Worker processes (default: CPU count; 1 loads in-process)
+            stream: Use the streaming @graph parser in each worker
+
+        Returns:
+            One LoadResult per path, in input order. Files that fail to load
+            carry the error message instead of raising.
+        """
+        resolved = [self._resolve(p) for p in paths]
+        results: List[Optional[LoadResult]] = [None] * len(resolved)
+
+        # Cache hits never leave the parent process
+        pending = []
+        for i, path in enumerate(resolved):
+            if self.cache is not None:
+                cached = self.cache.get(self._cache_namespace(), path)
+                if cached is not None:
+                    results[i] = LoadResult(str(path), cached)
+                    continue
+            pending.append(i)
+
+        jobs = [(str(resolved[i]), stream, self._worker_options()) for i in pending]
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+
+        if workers <= 1:
+            outcomes = [_load_worker(job) for job in jobs]
+        else:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_load_worker, jobs, chunksize=chunksize))
+
+        for i, (ontology, error) in zip(pending, outcomes):
+            if ontology is not None and self.cache is not None:
+                self.cache.put(self._cache_namespace(), resolved[i], ontology)
+            results[i] = LoadResult(str(resolved[i]), ontology, error)
+
+        return results
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """Constructor options that worker processes need to parse identically."""
+        return {
+            "compact": self.compact,
+            "include_instances": self.include_instances,
+            "context": self.context,
+        }
+
+    def _load_path(self, path: Path, stream: bool) -> Ontology:
+        """Parse an ontology file, bypassing the cache."""
+        if stream:
+            header: Dict[str, Any] = {}
+            if self.compact:
+                store = OntologyStore()
+                entities, relationships = store.entities, store.relationships
+            else:
+                entities, relationships = [], []
+            try:
+                for item in self._iter_streamed(path, header):
+                    if isinstance(item, Entity):
+                        entities.append(item)
+                    else:
+                        relationships.append(item)
+            except _StreamFallback:
+                pass
+            else:
+                return self._build_graph_ontology(header, entities, relationships, str(path))
 
         with open(path, 'r', encoding='utf-8') as f:
             data = json.load(f)
 
         return self.parse_ontology(data, str(path))
 
+    def iter_file(self, file_path: str | Path) -> Iterator[Entity | Relationship]:
+        """
+        Yield entities and relationships from an ontology file as they are parsed.
+
+        JSON-LD @graph documents are read in chunks and converted one node at
+        a time, so memory stays bounded by the largest single node rather than
+        the file size. Other formats (registry, UniRegistry, classes-based, or
+        documents that declare one of those keys before @graph) still need the
+        whole document and fall back to a regular parse.
+
+        Raises:
+            ValueError: If one of those keys only follows @graph, after its
+                nodes have already been yielded
+        """
+        path = self._resolve(file_path)
+        streamed = False
+        try:
+            for item in self._iter_streamed(path, {}):
+                streamed = True
+                yield item
+        except _StreamFallback:
+            if streamed:
+                raise ValueError(
+                    f"{path}: format key follows @graph; use load_file() instead"
+                ) from None
+            ontology = self._load_path(path, stream=False)
+            yield from ontology.entities
+            yield from ontology.relationships
+
+    def _cache_namespace(self) -> str:
+        """Cache namespace; covers every option that changes parse output."""
+        parts = ["ontology"]
+        if self.compact:
+            parts.append("compact")
+        if self.include_instances:
+            parts.append("instances")
+        if self.context:
+            encoded = json.dumps(self.context, sort_keys=True).encode("utf-8")
+            parts.append(hashlib.blake2b(encoded, digest_size=8).hexdigest())
+        return ":".join(parts)
+
+    def _instance_parser(self, document_context: Any) -> Optional[_InstanceParser]:
+        """Individual parser for a document, or None when instances are skipped."""
+        if not self.include_instances:
+            return None
+        return _InstanceParser(_id_coerced_properties(self.context, document_context))
+
+    def _iter_streamed(
+        self,
+        path: Path,
+        header: Dict[str, Any]
+    ) -> Iterator[Entity | Relationship]:
+        """Stream @graph nodes, collecting other top-level members into header."""
+        seen_graph = False
+        instances = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for key, value in _iter_json_document(f, self.STREAM_CHUNK_SIZE):
+                if key != "@graph":
+                    # A format key after @graph still wins in parse_ontology
+                    if seen_graph and key in _FORMAT_KEYS:
+                        raise _StreamFallback()
+                    header[key] = value
+                    continue
+                if not seen_graph:
+                    # Same precedence as parse_ontology dispatch
+                    if any(k in header for k in _FORMAT_KEYS):
+                        raise _StreamFallback()
+                    seen_graph = True
+                    # @context conventionally precedes @graph
+                    instances = self._instance_parser(header.get("@context"))
+                if isinstance(value, dict):
+                    yield from self._parse_graph_node(value, instances)
+
+        if not seen_graph:
+            raise _StreamFallback()
+
     def parse_ontology(self, data: Dict[str, Any], source: str = "") -> Ontology:
         """Parse ontology from JSON dict."""
         # Detect format and delegate to appropriate parser
         if "registryEntry" in data:
-            return self._parse_registry_format(data, source)
+            ontology = self._parse_registry_format(data, source)
         elif "ontologyDefinition" in data:
-            return self._parse_uniregistry_format(data, source)
+            ontology = self._parse_uniregistry_format(data, source)
         elif "classes" in data:
-            return self._parse_standard_format(data, source)
+            ontology = self._parse_standard_format(data, source)
         elif "@graph" in data:
-            return self._parse_graph_format(data, source)
+            ontology = self._parse_graph_format(data, source)
         else:
             # Try to infer structure
-            return self._parse_inferred_format(data, source)
+            ontology = self._parse_inferred_format(data, source)
+
+        if self.compact and ontology.store is None:
+            store = OntologyStore.from_items(ontology.entities, ontology.relationships)
+            ontology.entities = store.entities
+            ontology.relationships = store.relationships
+        return ontology
 
     def _parse_standard_format(self, data: Dict, source: str) -> Ontology:
         """Parse standard JSON-LD ontology with classes key."""
@@ -193,28 +650,53 @@ class OntologyLoader:
 
     def _parse_graph_format(self, data: Dict, source: str) -> Ontology:
         """Parse JSON-LD with @graph array."""
-        context = data.get("@context", {})
-        graph = data.get("@graph", [])
-
         entities = []
         relationships = []
-
-        for node in graph:
-            node_type = node.get("@type", "")
-            if "Class" in str(node_type) or node_type in ["owl:Class", "rdfs:Class"]:
-                entities.append(Entity(
-                    id=node.get("@id", ""),
-                    label=node.get("rdfs:label", node.get("name", "")),
-                    description=node.get("rdfs:comment", node.get("description", "")),
-                    entity_type="Class"
-                ))
-            elif "Property" in str(node_type) or "ObjectProperty" in str(node_type):
-                relationships.append(Relationship(
-                    id=node.get("@id", ""),
-                    label=node.get("rdfs:label", ""),
-                    source=node.get("rdfs:domain", ""),
-                    target=node.get("rdfs:range", "")
-                ))
+        instances = self._instance_parser(data.get("@context"))
+
+        for node in data.get("@graph", []):
+            for item in self._parse_graph_node(node, instances):
+                if isinstance(item, Entity):
+                    entities.append(item)
+                else:
+                    relationships.append(item)
+
+        return self._build_graph_ontology(data, entities, relationships, source)
+
+    def _parse_graph_node(
+        self,
+        node: Dict,
+        instances: Optional[_InstanceParser] = None
+    ) -> List[Entity | Relationship]:
+        """Convert a single @graph node into entities and relationships."""
+        node_type = node.get("@type", "")
+        if "Class" in str(node_type) or node_type in ["owl:Class", "rdfs:Class"]:
+            return [Entity(
+                id=node.get("@id", ""),
+                label=node.get("rdfs:label", node.get("name", "")),
+                description=node.get("rdfs:comment", node.get("description", "")),
+                entity_type="Class"
+            )]
+        elif "Property" in str(node_type) or "ObjectProperty" in str(node_type):
+            return [Relationship(
+                id=node.get("@id", ""),
+                label=node.get("rdfs:label", ""),
+                source=node.get("rdfs:domain", ""),
+                target=node.get("rdfs:range", "")
+            )]
+        elif instances is not None:
+            return instances.parse(node)
+        return []
+
+    def _build_graph_ontology(
+        self,
+        data: Dict,
+        entities: List[Entity],
+        relationships: List[Relationship],
+        source: str
+    ) -> Ontology:
+        """Assemble an Ontology from @graph items and top-level document keys."""
+        context = data.get("@context", {})
 
         return Ontology(
             id=data.get("@id", source),
@@ -300,9 +782,18 @@ class OntologyLoader:
         }
 
 
-def load_ontology(file_path: str | Path) -> Ontology:
+def _load_worker(job: Tuple[str, bool, Dict[str, Any]]) -> Tuple[Optional[Ontology], Optional[str]]:
+    """Process pool entry point: parse one file, returning (ontology, error)."""
+    path, stream, options = job
+    try:
+        return OntologyLoader(**options)._load_path(Path(path), stream), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
+
+def load_ontology(file_path: str | Path, cache: Optional[OntologyCache] = None) -> Ontology:
     """Convenience function to load an ontology file."""
-    loader = OntologyLoader()
+    loader = OntologyLoader(cache=cache)
     return loader.load_file(file_path)
 
 
@@ -313,7 +804,9 @@ if __name__ == "__main__":
         print("Usage: python ontology_loader.py <ontology_file.json>")
         sys.exit(1)
 
-    ontology = load_ontology(sys.argv[1])
+    from ontology_cache import default_cache
+
+    ontology = load_ontology(sys.argv[1], cache=default_cache())
     print(f"Loaded: {ontology.name} v{ontology.version}")
     print(f"Entities: {len(ontology.entities)}")
     print(f"Relationships: {len(ontology.relationships)}")
@@ -0,0 +1,411 @@
+"""
+VHF Ontology Store (CC-110)
+Columnar, memory-compact storage for ontology entities and relationships.
+
+Features:
+- Interned string table for ids and other repeated values
+- Plain string columns for mostly-unique labels and descriptions
+- Integer-indexed entity and relationship tables (array-backed)
+- Slotted record views with the same attributes as Entity/Relationship
+- Sequence views usable wherever Ontology.entities/relationships are read
+- Row iterators for consumers that never need per-item objects
+"""
+
+from array import array
+from collections.abc import Sequence
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Column value for a missing optional string (e.g. no parent class)
+NO_VALUE = -1
+
+EntityRow = Tuple[str, str, str, str, Dict[str, Any], Optional[str]]
+RelationshipRow = Tuple[str, str, str, str, str, str]
+
+
+class StringTable:
+    """Interned strings addressed by integer index."""
+
+    __slots__ = ('_index', '_strings')
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self._index: Dict[str, int] = {}
+        self._strings: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """Return the index of value, adding it on first use."""
+        if value is None:
+            return NO_VALUE
+        index = self._index.get(value)
+        if index is None:
+            index = len(self._strings)
+            self._index[value] = index
+            self._strings.append(value)
+        return index
+
+    def lookup(self, index: int) -> Optional[str]:
+        """Return the string at index (None for NO_VALUE)."""
+        return None if index == NO_VALUE else self._strings[index]
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __getstate__(self):
+        return self._strings
+
+    def __setstate__(self, strings):
+        self._strings = strings
+        self._index = {s: i for i, s in enumerate(strings)}
+
+
+class OntologyStore:
+    """Entity and relationship tables with interned string columns."""
+
+    __slots__ = (
+        'strings',
+        '_ent_id', '_ent_label', '_ent_description', '_ent_type', '_ent_parent',
+        '_ent_properties',
+        '_rel_id', '_rel_label', '_rel_source', '_rel_target', '_rel_cardinality',
+        '_rel_description',
+    )
+
+    def __init__(self):
+        """Initialize empty tables."""
+        self.strings = StringTable()
+
+        self._ent_id = array('i')
+        # Labels/descriptions are mostly unique: interning would only add index entries
+        self._ent_label: List[str] = []
+        self._ent_description: List[str] = []
+        self._ent_type = array('i')
+        self._ent_parent = array('i')
+        # Sparse: most entities carry no properties
+        self._ent_properties: Dict[int, Dict[str, Any]] = {}
+
+        self._rel_id: List[str] = []
+        self._rel_label = array('i')
+        self._rel_source = array('i')
+        self._rel_target = array('i')
+        self._rel_cardinality = array('i')
+        self._rel_description = array('i')
+
+    @classmethod
+    def from_items(cls, entities: Iterable, relationships: Iterable) -> 'OntologyStore':
+        """Build a store from Entity/Relationship objects (or record views)."""
+        store = cls()
+        store.entities.extend(entities)
+        store.relationships.extend(relationships)
+        return store
+
+    @property
+    def entities(self) -> 'EntitySequence':
+        """Sequence view over the entity table."""
+        return EntitySequence(self)
+
+    @property
+    def relationships(self) -> 'RelationshipSequence':
+        """Sequence view over the relationship table."""
+        return RelationshipSequence(self)
+
+    def add_entity(
+        self,
+        id: str,
+        label: str,
+        description: str = "",
+        entity_type: str = "Class",
+        properties: Optional[Dict[str, Any]] = None,
+        parent_class: Optional[str] = None
+    ) -> int:
+        """Append an entity row and return its index."""
+        intern = self.strings.intern
+        row = len(self._ent_id)
+        self._ent_id.append(intern(id))
+        self._ent_label.append(label)
+        self._ent_description.append(description)
+        self._ent_type.append(intern(entity_type))
+        self._ent_parent.append(intern(parent_class))
+        if properties:
+            self._ent_properties[row] = properties
+        return row
+
+    def add_relationship(
+        self,
+        id: str,
+        label: str,
+        source: str,
+        target: str,
+        cardinality: str = "1:*",
+        description: str = ""
+    ) -> int:
+        """Append a relationship row and return its index."""
+        intern = self.strings.intern
+        row = len(self._rel_id)
+        self._rel_id.append(id)
+        self._rel_label.append(intern(label))
+        self._rel_source.append(intern(source))
+        self._rel_target.append(intern(target))
+        self._rel_cardinality.append(intern(cardinality))
+        self._rel_description.append(intern(description))
+        return row
+
+    def entity_count(self) -> int:
+        """Number of entity rows."""
+        return len(self._ent_id)
+
+    def relationship_count(self) -> int:
+        """Number of relationship rows."""
+        return len(self._rel_id)
+
+    def entity_row(self, row: int) -> EntityRow:
+        """Entity fields at row, in Entity field order."""
+        lookup = self.strings.lookup
+        return (
+            lookup(self._ent_id[row]),
+            self._ent_label[row],
+            self._ent_description[row],
+            lookup(self._ent_type[row]),
+            self._ent_properties.get(row, {}),
+            lookup(self._ent_parent[row]),
+        )
+
+    def relationship_row(self, row: int) -> RelationshipRow:
+        """Relationship fields at row, in Relationship field order."""
+        lookup = self.strings.lookup
+        return (
+            self._rel_id[row],
+            lookup(self._rel_label[row]),
+            lookup(self._rel_source[row]),
+            lookup(self._rel_target[row]),
+            lookup(self._rel_cardinality[row]),
+            lookup(self._rel_description[row]),
+        )
+
+    def iter_entity_rows(self) -> Iterator[EntityRow]:
+        """Iterate entity rows as plain tuples."""
+        lookup = self.strings.lookup
+        properties = self._ent_properties
+        columns = zip(
+            self._ent_id, self._ent_label, self._ent_description,
+            self._ent_type, self._ent_parent
+        )
+        for row, (id_, label, desc, etype, parent) in enumerate(columns):
+            yield (
+                lookup(id_),
+                label,
+                desc,
+                lookup(etype),
+                properties.get(row, {}),
+                lookup(parent),
+            )
+
+    def iter_relationship_rows(self) -> Iterator[RelationshipRow]:
+        """Iterate relationship rows as plain tuples."""
+        lookup = self.strings.lookup
+        columns = zip(
+            self._rel_id, self._rel_label, self._rel_source,
+            self._rel_target, self._rel_cardinality, self._rel_description
+        )
+        for rel_id, label, source, target, cardinality, desc in columns:
+            yield (
+                rel_id,
+                lookup(label),
+                lookup(source),
+                lookup(target),
+                lookup(cardinality),
+                lookup(desc),
+            )
+
+    def nbytes(self) -> int:
+        """Approximate memory held by the integer column arrays."""
+        columns = (
+            self._ent_id, self._ent_type, self._ent_parent,
+            self._rel_label, self._rel_source, self._rel_target,
+            self._rel_cardinality, self._rel_description
+        )
+        return sum(col.itemsize * len(col) for col in columns)
+
+    def __getstate__(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+
+class EntityRecord:
+    """Read-only view of one entity row, attribute-compatible with Entity."""
+
+    __slots__ = ('_store', '_row')
+
+    FIELDS = ('id', 'label', 'description', 'entity_type', 'properties', 'parent_class')
+
+    def __init__(self, store: OntologyStore, row: int):
+        self._store = store
+        self._row = row
+
+    id = property(lambda self: self._store.strings.lookup(self._store._ent_id[self._row]))
+    label = property(lambda self: self._store._ent_label[self._row])
+    description = property(lambda self: self._store._ent_description[self._row])
+    entity_type = property(lambda self: self._store.strings.lookup(self._store._ent_type[self._row]))
+    parent_class = property(
+        lambda self: self._store.strings.lookup(self._store._ent_parent[self._row])
+    )
+
+    @property
+    def properties(self) -> Dict[str, Any]:
+        """Entity properties (a fresh empty dict when none are stored)."""
+        return self._store._ent_properties.get(self._row, {})
+
+    def astuple(self) -> EntityRow:
+        """Field values in Entity order."""
+        return self._store.entity_row(self._row)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self.astuple() == tuple(getattr(other, f) for f in self.FIELDS)
+        except AttributeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{f}={v!r}" for f, v in zip(self.FIELDS, self.astuple()))
+        return f"EntityRecord({fields})"
+
+
+class RelationshipRecord:
+    """Read-only view of one relationship row, attribute-compatible with Relationship."""
+
+    __slots__ = ('_store', '_row')
+
+    FIELDS = ('id', 'label', 'source', 'target', 'cardinality', 'description')
+
+    def __init__(self, store: OntologyStore, row: int):
+        self._store = store
+        self._row = row
+
+    id = property(lambda self: self._store._rel_id[self._row])
+    label = property(lambda self: self._store.strings.lookup(self._store._rel_label[self._row]))
+    source = property(lambda self: self._store.strings.lookup(self._store._rel_source[self._row]))
+    target = property(lambda self: self._store.strings.lookup(self._store._rel_target[self._row]))
+    cardinality = property(
+        lambda self: self._store.strings.lookup(self._store._rel_cardinality[self._row])
+    )
+    description = property(
+        lambda self: self._store.strings.lookup(self._store._rel_description[self._row])
+    )
+
+    def astuple(self) -> RelationshipRow:
+        """Field values in Relationship order."""
+        return self._store.relationship_row(self._row)
+
+    def __eq__(self, other) -> bool:
+        try:
+            return self.astuple() == tuple(getattr(other, f) for f in self.FIELDS)
+        except AttributeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f"{f}={v!r}" for f, v in zip(self.FIELDS, self.astuple()))
+        return f"RelationshipRecord({fields})"
+
+
+class _RecordSequence(Sequence):
+    """Lightweight list-like view over one table of an OntologyStore."""
+
+    __slots__ = ('store',)
+
+    _record = None
+
+    def __init__(self, store: OntologyStore):
+        self.store = store
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._record(self.store, i) for i in range(*index.indices(len(self)))]
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return self._record(self.store, index)
+
+    def __iter__(self):
+        record = self._record
+        store = self.store
+        for i in range(len(self)):
+            yield record(store, i)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Sequence, list)) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {len(self)} rows>"
+
+    def extend(self, items: Iterable) -> None:
+        """Append several items."""
+        for item in items:
+            self.append(item)
+
+
+class EntitySequence(_RecordSequence):
+    """Sequence of EntityRecord views; append accepts Entity-like objects."""
+
+    __slots__ = ()
+
+    _record = EntityRecord
+
+    def __len__(self) -> int:
+        return self.store.entity_count()
+
+    def append(self, entity) -> None:
+        """Add an Entity (or any object with Entity attributes)."""
+        self.store.add_entity(
+            entity.id, entity.label, entity.description, entity.entity_type,
+            entity.properties, entity.parent_class
+        )
+
+    def rows(self) -> Iterator[EntityRow]:
+        """Iterate rows without building record objects."""
+        return self.store.iter_entity_rows()
+
+
+class RelationshipSequence(_RecordSequence):
+    """Sequence of RelationshipRecord views; append accepts Relationship-like objects."""
+
+    __slots__ = ()
+
+    _record = RelationshipRecord
+
+    def __len__(self) -> int:
+        return self.store.relationship_count()
+
+    def append(self, rel) -> None:
+        """Add a Relationship (or any object with Relationship attributes)."""
+        self.store.add_relationship(
+            rel.id, rel.label, rel.source, rel.target, rel.cardinality, rel.description
+        )
+
+    def rows(self) -> Iterator[RelationshipRow]:
+        """Iterate rows without building record objects."""
+        return self.store.iter_relationship_rows()
+
+
+def entity_rows(entities: Iterable) -> Iterator[EntityRow]:
+    """Iterate entity fields as tuples from a store view or a list of Entity objects."""
+    if isinstance(entities, EntitySequence):
+        return entities.rows()
+    return (
+        (e.id, e.label, e.description, e.entity_type, e.properties, e.parent_class)
+        for e in entities
+    )
+
+
+def relationship_rows(relationships: Iterable) -> Iterator[RelationshipRow]:
+    """Iterate relationship fields as tuples from a store view or a list of Relationship objects."""
+    if isinstance(relationships, RelationshipSequence):
+        return relationships.rows()
+    return (
+        (r.id, r.label, r.source, r.target, r.cardinality, r.description)
+        for r in relationships
+    )
@@ -0,0 +1,259 @@
+"""
+VHF Recipe Eligibility (CC-121)
+Bitset index answering "which recipes suit this client" over the recipe catalogue.
+
+Features:
+- One bitset (Python int, bit i = recipe i) per diet, allergen exclusion,
+  condition and theme, built from the Recipe & Meal Plan instance data
+- Client eligibility as a few bitwise ANDs (preferred themes OR'ed)
+- Conditional diet suitability (e.g. "if halal chicken used") kept separately,
+  so strict queries can leave those recipes out
+- Client profiles (diets, allergens, conditions, themes, goals) read from persona data
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from ontology_loader import Ontology
+
+RECIPE_TYPE = 'recipe:Recipe'
+CLIENT_TYPE = 'client:Client'
+
+# Bitset families
+DIET = 'diet'
+ALLERGEN_FREE = 'allergen_free'
+CONDITION = 'condition'
+THEME = 'theme'
+FACETS = (DIET, ALLERGEN_FREE, CONDITION, THEME)
+
+# Recipe relationship label -> bitset family
+RECIPE_PREDICATES = {
+    'recipe:suitableForDietType': DIET,
+    'recipe:suitableForDiet': DIET,
+    'recipe:excludesAllergen': ALLERGEN_FREE,
+    'recipe:suitableForCondition': CONDITION,
+    'recipe:belongsToTheme': THEME,
+}
+
+# Client relationship label -> ClientProfile field
+CLIENT_PREDICATES = {
+    'client:followsDiet': 'diets',
+    'client:hasAllergen': 'allergens',
+    'client:hasCondition': 'conditions',
+    'client:prefersTheme': 'themes',
+    'client:hasGoal': 'goals',
+}
+
+# Client -> health profile link, and profile relationship labels naming conditions
+PROFILE_PREDICATE = 'client:hasProfile'
+PROFILE_CONDITION_PREDICATES = ('medicalCondition', 'client:medicalCondition', 'client:hasCondition')
+
+
+@dataclass
+class ClientProfile:
+    """Constraints, preferences and goals of one client."""
+    id: str
+    diets: List[str] = field(default_factory=list)
+    allergens: List[str] = field(default_factory=list)
+    conditions: List[str] = field(default_factory=list)
+    themes: List[str] = field(default_factory=list)
+    goals: List[str] = field(default_factory=list)
+
+
+class RecipeEligibilityIndex:
+    """Recipe bitsets per diet, allergen exclusion, condition and theme."""
+
+    def __init__(self, recipes: Sequence[str]):
+        """
+        Create an empty index over a fixed recipe order.
+
+        Args:
+            recipes: Recipe ids; recipe i is bit i of every bitset
+        """
+        self.recipes = list(recipes)
+        self.position = {recipe: i for i, recipe in enumerate(self.recipes)}
+        self.all = (1 << len(self.recipes)) - 1
+        self.bitsets: Dict[str, Dict[str, int]] = {facet: {} for facet in FACETS}
+        self.conditional: Dict[str, int] = {}
+
+    @classmethod
+    def from_ontology(cls, ontology: Ontology) -> 'RecipeEligibilityIndex':
+        """
+        Build the index from recipe instance data.
+
+        Load recipes with OntologyLoader(include_instances=True,
+        context=<recipe ontology>.context) so diet, allergen, condition and
+        theme references become relationships. Diet references carrying a
+        note (e.g. "if halal chicken used") count as conditional.
+
+        Args:
+            ontology: Ontology containing recipe:Recipe individuals
+
+        Returns:
+            Populated index
+        """
+        index = cls([entity.id for entity in ontology.entities if has_type(entity, RECIPE_TYPE)])
+        members: Dict[tuple, List[int]] = {}
+        conditional: Dict[str, List[int]] = {}
+        position = index.position
+        for rel in ontology.relationships:
+            facet = RECIPE_PREDICATES.get(rel.label)
+            i = position.get(rel.source)
+            if facet is None or i is None:
+                continue
+            members.setdefault((facet, rel.target), []).append(i)
+            if facet == DIET and rel.description:
+                conditional.setdefault(rel.target, []).append(i)
+
+        for (facet, key), positions in members.items():
+            index.bitsets[facet][key] = index._bits(positions)
+        index.conditional = {key: index._bits(positions) for key, positions in conditional.items()}
+        return index
+
+    def add(self, facet: str, key: str, recipes: Iterable[str], conditional: bool = False) -> None:
+        """
+        Mark recipes as members of one bitset (e.g. add(DIET, 'diet:vegan', [...])).
+
+        Args:
+            facet: diet, allergen_free, condition or theme
+            key: Diet / allergen / condition / theme id
+            recipes: Recipe ids in the index
+            conditional: For diets, suitability depends on a substitution
+        """
+        bits = self._bits(self.position[recipe] for recipe in recipes)
+        self.bitsets[facet][key] = self.bitsets[facet].get(key, 0) | bits
+        if conditional:
+            self.conditional[key] = self.conditional.get(key, 0) | bits
+
+    def bitset(self, facet: str, key: str) -> int:
+        """Recipes in one bitset (0 if the key is unknown)."""
+        return self.bitsets[facet].get(key, 0)
+
+    def eligible(
+        self,
+        diets: Iterable[str] = (),
+        allergens: Iterable[str] = (),
+        conditions: Iterable[str] = (),
+        themes: Iterable[str] = (),
+        strict: bool = False
+    ) -> int:
+        """
+        Recipes satisfying every constraint, as a bitset.
+
+        Args:
+            diets: Diets every recipe must suit
+            allergens: Allergens every recipe must exclude
+            conditions: Conditions every recipe must suit
+            themes: If given, recipes must belong to at least one
+            strict: Leave out conditional diet matches
+
+        Returns:
+            Bitset of eligible recipes (see recipe_ids, count)
+        """
+        bits = self.all
+        diet_bits = self.bitsets[DIET]
+        for diet in diets:
+            bits &= diet_bits.get(diet, 0)
+            if strict:
+                bits &= ~self.conditional.get(diet, 0)
+        allergen_bits = self.bitsets[ALLERGEN_FREE]
+        for allergen in allergens:
+            bits &= allergen_bits.get(allergen, 0)
+        condition_bits = self.bitsets[CONDITION]
+        for condition in conditions:
+            bits &= condition_bits.get(condition, 0)
+
+        themes = list(themes)
+        if themes:
+            theme_bits = self.bitsets[THEME]
+            any_theme = 0
+            for theme in themes:
+                any_theme |= theme_bits.get(theme, 0)
+            bits &= any_theme
+        return bits
+
+    def eligible_for(self, profile: ClientProfile, require_theme: bool = False, strict: bool = False) -> int:
+        """
+        Recipes a client can be given, as a bitset.
+
+        Args:
+            profile: Client diets, allergens and conditions (hard constraints)
+            require_theme: Also require one of the client's preferred themes
+                (ignored if the client has none)
+            strict: Leave out conditional diet matches
+
+        Returns:
+            Bitset of eligible recipes
+        """
+        return self.eligible(
+            profile.diets, profile.allergens, profile.conditions,
+            profile.themes if require_theme else (), strict
+        )
+
+    def recipe_ids(self, bits: int, limit: Optional[int] = None) -> List[str]:
+        """Recipe ids of a bitset, in index order (at most limit)."""
+        found = []
+        digits = format(bits & self.all, 'b')[::-1]
+        i = digits.find('1')
+        while i != -1 and (limit is None or len(found) < limit):
+            found.append(self.recipes[i])
+            i = digits.find('1', i + 1)
+        return found
+
+    @staticmethod
+    def count(bits: int) -> int:
+        """Number of recipes in a bitset."""
+        return bits.bit_count()
+
+    def _bits(self, positions: Iterable[int]) -> int:
+        """Bitset with the given bits set, built in one pass."""
+        buffer = bytearray((len(self.recipes) + 7) // 8)
+        for i in positions:
+            buffer[i >> 3] |= 1 << (i & 7)
+        return int.from_bytes(buffer, 'little')
+
+
+def client_profiles(ontology: Ontology) -> Dict[str, ClientProfile]:
+    """
+    Client profiles from persona instance data.
+
+    Conditions are read both from the client (client:hasCondition) and from
+    its health profile (client:hasProfile -> medicalCondition). Only
+    conditions with their own @id are kept: blank condition nodes get ids
+    derived from the client (e.g. "client:tp-001/client:hasProfile/
+    medicalCondition/0") that no recipe can reference, so as hard
+    constraints they would rule out every recipe.
+
+    Args:
+        ontology: Ontology containing client:Client individuals (loaded
+            like recipes, see RecipeEligibilityIndex.from_ontology)
+
+    Returns:
+        Dict mapping client ids to profiles
+    """
+    profiles = {
+        entity.id: ClientProfile(entity.id)
+        for entity in ontology.entities if has_type(entity, CLIENT_TYPE)
+    }
+    health_profiles: Dict[str, ClientProfile] = {}
+    for rel in ontology.relationships:
+        profile = profiles.get(rel.source)
+        if profile is None:
+            continue
+        attr = CLIENT_PREDICATES.get(rel.label)
+        if attr is not None:
+            getattr(profile, attr).append(rel.target)
+        elif rel.label == PROFILE_PREDICATE:
+            health_profiles[rel.target] = profile
+
+    for rel in ontology.relationships:
+        profile = health_profiles.get(rel.source)
+        if profile is not None and rel.label in PROFILE_CONDITION_PREDICATES:
+            if not rel.target.startswith(f'{rel.source}/') and rel.target not in profile.conditions:
+                profile.conditions.append(rel.target)
+    return profiles
+
+
+def has_type(entity, type_id: str) -> bool:
+    """True if type_id is the entity's type or one of its @type values."""
+    return entity.entity_type == type_id or type_id in entity.properties.get('@type', ())
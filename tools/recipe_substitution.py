@@ -0,0 +1,212 @@
+"""
+VHF Recipe Substitution (CC-124)
+Nearest eligible alternatives to a recipe, from declared substitutions and nutrition.
+
+Features:
+- Explicit recipe:substitutableWith links (either direction) ranked first
+- Precomputed k-nearest-neighbour table over standardised calories/macros
+  (SciPy k-d tree when available, blocked NumPy brute force otherwise)
+- Lookups filtered by a client's eligibility bitset, falling back to a
+  vectorised scan when too few precomputed neighbours are eligible
+"""
+
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ontology_loader import Ontology
+from recipe_eligibility import ClientProfile, RecipeEligibilityIndex
+from nutrition import NutritionTable, bitset_mask
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+SUBSTITUTION_PREDICATE = 'recipe:substitutableWith'
+FEATURES = ('calories', 'protein', 'carbs', 'fat')
+NEIGHBOURS = 16
+
+# Brute-force distance blocks are capped at this many elements
+BRUTE_FORCE_BLOCK = 1 << 22
+
+
+class SubstitutionIndex:
+    """Explicit substitutes and nutritional nearest neighbours per recipe."""
+
+    def __init__(
+        self,
+        index: RecipeEligibilityIndex,
+        table: NutritionTable,
+        explicit: Iterable[Tuple[str, str]] = (),
+        k: int = NEIGHBOURS,
+        features: Sequence[str] = FEATURES,
+        backend: Optional[str] = None
+    ):
+        """
+        Args:
+            index: Recipe eligibility index
+            table: Recipe nutrition, in the same recipe order as index
+            explicit: (recipe, substitute) pairs; each works both ways
+            k: Neighbours precomputed per recipe
+            features: Nutrition fields compared (each scaled by its standard
+                deviation over the catalogue)
+            backend: 'kdtree' or 'brute' (default: kdtree if SciPy is installed)
+        """
+        if not NUMPY_AVAILABLE:
+            raise ImportError("NumPy not installed. Run: pip install numpy")
+        if index.recipes != table.recipes:
+            raise ValueError("index and table must list the same recipes in the same order")
+        backend = backend or ('kdtree' if SCIPY_AVAILABLE else 'brute')
+        if backend == 'kdtree' and not SCIPY_AVAILABLE:
+            raise ImportError("scipy not installed. Run: pip install numpy scipy")
+        if backend not in ('kdtree', 'brute'):
+            raise ValueError(f"Unknown backend: {backend} (expected 'kdtree' or 'brute')")
+
+        self.index = index
+        self.table = table
+        self.explicit: Dict[int, List[int]] = {}
+        position = table.position
+        for recipe, substitute in explicit:
+            i, j = position.get(recipe), position.get(substitute)
+            if i is None or j is None or i == j:
+                continue
+            for a, b in ((i, j), (j, i)):
+                substitutes = self.explicit.setdefault(a, [])
+                if b not in substitutes:
+                    substitutes.append(b)
+
+        raw = np.stack([table.values[name] for name in features], axis=1).astype(np.float64)
+        self.known = np.isfinite(raw).all(axis=1)
+        scale = raw[self.known].std(axis=0) if self.known.any() else np.ones(len(features))
+        scale[scale == 0] = 1.0
+        self.vectors = raw / scale
+
+        # Neighbour table over recipes with known nutrition; -1 pads rows without
+        known = np.flatnonzero(self.known)
+        found, distances = _nearest(self.vectors[known], min(k, max(len(known) - 1, 0)), backend)
+        self.neighbours = np.full((len(table), found.shape[1]), -1, dtype=np.int32)
+        self.distances = np.full((len(table), found.shape[1]), np.inf, dtype=np.float32)
+        self.neighbours[known] = known[found]
+        self.distances[known] = distances
+
+    @classmethod
+    def from_ontology(cls, recipes: Ontology, **options) -> 'SubstitutionIndex':
+        """
+        Substitution index over a recipe catalogue loaded with include_instances=True.
+
+        Args:
+            recipes: Ontology containing recipe:Recipe individuals
+            **options: SubstitutionIndex options (k, features, backend)
+
+        Returns:
+            SubstitutionIndex
+        """
+        explicit = [
+            (rel.source, rel.target) for rel in recipes.relationships if rel.label == SUBSTITUTION_PREDICATE
+        ]
+        return cls(RecipeEligibilityIndex.from_ontology(recipes), NutritionTable.from_ontology(recipes),
+                   explicit, **options)
+
+    def alternatives(
+        self,
+        recipe: str,
+        profile: Optional[ClientProfile] = None,
+        k: int = 5,
+        strict: bool = False,
+        eligible: Optional[int] = None
+    ) -> List[Tuple[str, float, bool]]:
+        """
+        Best eligible alternatives to a recipe.
+
+        Explicit substitutes come first (closest first), then the
+        nutritionally nearest recipes.
+
+        Args:
+            recipe: Recipe id
+            profile: Client whose diets, allergens and conditions apply
+            k: Number of alternatives
+            strict: Leave out conditional diet matches
+            eligible: Eligibility bitset to use instead of profile's
+
+        Returns:
+            (recipe id, nutritional distance, explicit) triples; distance is
+            NaN when either recipe lacks nutrition
+        """
+        i = self.table.position[recipe]
+        if eligible is None:
+            eligible = self.index.eligible_for(profile, strict=strict) if profile is not None else self.index.all
+
+        recipes = self.table.recipes
+        seen = {i}
+        found = []
+        explicit = [j for j in self.explicit.get(i, ()) if eligible >> j & 1]
+        for j in sorted(explicit, key=lambda j: self._distance(i, j) if self.known[j] else np.inf):
+            found.append((recipes[j], self._distance(i, j), True))
+            seen.add(j)
+        if len(found) >= k or not self.known[i]:
+            return found[:k]
+
+        for j, distance in zip(self.neighbours[i].tolist(), self.distances[i].tolist()):
+            if j not in seen and eligible >> j & 1:
+                found.append((recipes[j], distance, False))
+                seen.add(j)
+                if len(found) == k:
+                    return found
+
+        # Too few precomputed neighbours eligible: scan the eligible recipes
+        mask = bitset_mask(eligible, len(recipes)) & self.known
+        mask[list(seen)] = False
+        candidates = np.flatnonzero(mask)
+        distances = np.linalg.norm(self.vectors[candidates] - self.vectors[i], axis=1)
+        wanted = k - len(found)
+        if len(candidates) > wanted:
+            nearest = np.argpartition(distances, wanted)[:wanted]
+            candidates, distances = candidates[nearest], distances[nearest]
+        order = np.argsort(distances, kind='stable')
+        found.extend((recipes[j], float(d), False) for j, d in zip(candidates[order].tolist(), distances[order].tolist()))
+        return found
+
+    def _distance(self, i: int, j: int) -> float:
+        """Scaled nutritional distance between two recipe positions."""
+        return float(np.linalg.norm(self.vectors[i] - self.vectors[j]))
+
+
+def _nearest(points: 'np.ndarray', k: int, backend: str) -> Tuple['np.ndarray', 'np.ndarray']:
+    """
+    k nearest other points of every point.
+
+    Returns:
+        (indices, distances), each (len(points), k), nearest first
+    """
+    m = len(points)
+    if k == 0:
+        return np.empty((m, 0), dtype=np.int64), np.empty((m, 0), dtype=np.float32)
+
+    if backend == 'kdtree':
+        distances, indices = cKDTree(points).query(points, k=k + 1)
+    else:
+        block = max(1, BRUTE_FORCE_BLOCK // m)
+        squared = (points ** 2).sum(axis=1)
+        indices = np.empty((m, k + 1), dtype=np.int64)
+        distances = np.empty((m, k + 1))
+        for start in range(0, m, block):
+            rows = slice(start, start + block)
+            d2 = squared[rows, None] + squared[None, :] - 2.0 * points[rows] @ points.T
+            np.maximum(d2, 0.0, out=d2)
+            part = np.argpartition(d2, k, axis=1)[:, :k + 1]
+            part_d2 = np.take_along_axis(d2, part, axis=1)
+            order = np.argsort(part_d2, axis=1, kind='stable')
+            indices[rows] = np.take_along_axis(part, order, axis=1)
+            distances[rows] = np.sqrt(np.take_along_axis(part_d2, order, axis=1))
+
+    # Drop each point itself (or the farthest column when duplicates hid it)
+    own = indices == np.arange(m)[:, None]
+    own[~own.any(axis=1), -1] = True
+    keep = ~own
+    return indices[keep].reshape(m, k), distances[keep].reshape(m, k).astype(np.float32)
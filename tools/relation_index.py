@@ -0,0 +1,169 @@
+"""
+VHF Relation Index (CC-125)
+Per-predicate adjacency arrays for relationship queries without edge scans.
+
+Features:
+- Forward and reverse compressed-sparse-row arrays per edge label
+  (e.g. 'recipe:belongsToTheme', 'client:coachedBy', 'subClassOf')
+- Integer node ids; only nodes with an edge of a predicate get a row, so
+  memory is proportional to edges, not nodes x predicates
+- Queries cost a binary search plus the number of results
+- Stored on the graph (G.graph['relation_index']), rebuilt when the graph
+  changes and dropped by GraphDelta.apply
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+
+INDEX_KEY = 'relation_index'
+
+
+class _Adjacency:
+    """Rows (sorted node ids), row offsets and neighbour ids for one predicate and direction."""
+
+    __slots__ = ('rows', 'indptr', 'indices')
+
+    def __init__(self, pairs: List[Tuple[int, int]]):
+        """Build from (row node id, neighbour node id) pairs."""
+        pairs.sort()
+        self.rows = array('q')
+        self.indptr = array('q')
+        self.indices = array('q', [neighbour for _, neighbour in pairs])
+        previous = None
+        for offset, (row, _) in enumerate(pairs):
+            if row != previous:
+                self.rows.append(row)
+                self.indptr.append(offset)
+                previous = row
+        self.indptr.append(len(pairs))
+
+    def span(self, node_id: int) -> Tuple[int, int]:
+        """Start and end offsets of a node's neighbours ((0, 0) if none)."""
+        rows = self.rows
+        i = bisect_left(rows, node_id)
+        if i == len(rows) or rows[i] != node_id:
+            return 0, 0
+        return self.indptr[i], self.indptr[i + 1]
+
+
+class RelationIndex:
+    """Forward and reverse adjacency per edge predicate over integer node ids."""
+
+    def __init__(self, G: nx.DiGraph, key: str = 'label'):
+        """
+        Index every edge of G under its key attribute (edges without one are skipped).
+
+        Args:
+            G: Graph to index
+            key: Edge attribute naming the predicate
+        """
+        self.key = key
+        self.owner: Optional[nx.DiGraph] = None
+        self.size = (len(G), G.number_of_edges())
+        self.nodes: List[Any] = list(G)
+        self.node_id: Dict[Any, int] = {node: i for i, node in enumerate(self.nodes)}
+
+        pairs: Dict[Hashable, List[Tuple[int, int]]] = {}
+        node_id = self.node_id
+        for u, v, predicate in G.edges(data=key):
+            if predicate is not None:
+                pairs.setdefault(predicate, []).append((node_id[u], node_id[v]))
+
+        self.forward: Dict[Hashable, _Adjacency] = {}
+        self.reverse: Dict[Hashable, _Adjacency] = {}
+        for predicate, edges in pairs.items():
+            self.forward[predicate] = _Adjacency(edges)
+            self.reverse[predicate] = _Adjacency([(v, u) for u, v in edges])
+
+    def targets(self, predicate: Hashable, node: Any) -> List[Any]:
+        """Nodes node links to by predicate (e.g. themes of a recipe), in node order."""
+        return self._neighbours(self.forward, predicate, node)
+
+    def sources(self, predicate: Hashable, node: Any) -> List[Any]:
+        """Nodes linking to node by predicate (e.g. recipes of a theme), in node order."""
+        return self._neighbours(self.reverse, predicate, node)
+
+    def degree(self, predicate: Hashable, node: Any, reverse: bool = False) -> int:
+        """Number of predicate edges leaving node (entering it if reverse)."""
+        adjacency = (self.reverse if reverse else self.forward).get(predicate)
+        node_id = self.node_id.get(node)
+        if adjacency is None or node_id is None:
+            return 0
+        start, end = adjacency.span(node_id)
+        return end - start
+
+    def predicates(self) -> List[Hashable]:
+        """Indexed predicates, in first-seen edge order."""
+        return list(self.forward)
+
+    def count(self, predicate: Hashable) -> int:
+        """Number of edges with a predicate."""
+        adjacency = self.forward.get(predicate)
+        return len(adjacency.indices) if adjacency is not None else 0
+
+    def edges(self, predicate: Hashable) -> Iterator[Tuple[Any, Any]]:
+        """(source, target) pairs with a predicate, grouped by source."""
+        adjacency = self.forward.get(predicate)
+        if adjacency is None:
+            return
+        nodes = self.nodes
+        for i, row in enumerate(adjacency.rows):
+            source = nodes[row]
+            for j in adjacency.indices[adjacency.indptr[i]:adjacency.indptr[i + 1]]:
+                yield source, nodes[j]
+
+    def _neighbours(self, direction: Dict[Hashable, _Adjacency], predicate: Hashable, node: Any) -> List[Any]:
+        """Neighbour nodes of node in one direction's adjacency for predicate."""
+        adjacency = direction.get(predicate)
+        node_id = self.node_id.get(node)
+        if adjacency is None or node_id is None:
+            return []
+        start, end = adjacency.span(node_id)
+        nodes = self.nodes
+        return [nodes[j] for j in adjacency.indices[start:end]]
+
+    def __getstate__(self) -> Dict:
+        """Pickle the index data only; the owner is re-attached on use."""
+        state = self.__dict__.copy()
+        state['owner'] = None
+        return state
+
+
+def relation_index(G: nx.DiGraph, key: str = 'label') -> RelationIndex:
+    """
+    Relation index of a graph, built on first use and kept in G.graph.
+
+    The stored index is reused while G's node and edge counts are
+    unchanged; GraphDelta.apply drops it, so in-place updates with equal
+    counts are not missed. Subgraph views get a temporary index (they
+    share G.graph with their graph).
+
+    Args:
+        G: Graph to index
+        key: Edge attribute naming the predicate
+
+    Returns:
+        RelationIndex over G's edges
+    """
+    index = G.graph.get(INDEX_KEY)
+    size = (len(G), G.number_of_edges())
+    if isinstance(index, RelationIndex) and index.key == key and index.size == size:
+        if index.owner is None and not hasattr(G, '_graph'):
+            index.owner = G  # unpickled with its graph
+        if index.owner is G:
+            return index
+
+    index = RelationIndex(G, key)
+    if not hasattr(G, '_graph'):  # views share their graph's G.graph
+        index.owner = G
+        G.graph[INDEX_KEY] = index
+    return index
+
+
+def drop_relation_index(G: nx.DiGraph) -> None:
+    """Forget G's stored relation index (after changing edges in place)."""
+    if isinstance(G.graph.get(INDEX_KEY), RelationIndex):
+        del G.graph[INDEX_KEY]
@@ -0,0 +1,107 @@
+"""
+VHF Style Overlay (CC-118)
+Per-node and per-edge styling kept beside a graph instead of in it.
+
+Features:
+- Colours, edge widths, labels and flags for a few nodes/edges, keyed by id
+- Path highlighting without copying the graph
+- Merged into node/edge attributes by the renderers at draw time
+- Overlays combine, so many highlight queries share one render
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import networkx as nx
+
+HIGHLIGHT_COLOR = '#FF5722'
+HIGHLIGHT_WIDTH = 4
+
+
+class StyleOverlay:
+    """Attribute overrides for some nodes and edges of a graph."""
+
+    def __init__(self):
+        """Create an empty overlay."""
+        self.nodes: Dict[Any, Dict[str, Any]] = {}
+        self.edges: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+
+    def style_node(self, node: Any, **attrs) -> None:
+        """Override attributes of one node (e.g. color='#FF5722', label='Start')."""
+        self.nodes.setdefault(node, {}).update(attrs)
+
+    def style_edge(self, u: Any, v: Any, **attrs) -> None:
+        """Override attributes of one edge (e.g. color='#FF5722', width=4)."""
+        self.edges.setdefault((u, v), {}).update(attrs)
+
+    def add_path(
+        self,
+        path: Sequence,
+        color: str = HIGHLIGHT_COLOR,
+        width: float = HIGHLIGHT_WIDTH,
+        G: Optional[nx.DiGraph] = None
+    ) -> None:
+        """
+        Highlight a node path.
+
+        Args:
+            path: Nodes in order
+            color: Color of the path's nodes and edges
+            width: Width of the path's edges
+            G: If given, only edges present in G are styled
+        """
+        for node in path:
+            self.style_node(node, color=color, highlighted=True)
+        for u, v in zip(path, path[1:]):
+            if G is None or G.has_edge(u, v):
+                self.style_edge(u, v, color=color, width=width, highlighted=True)
+
+    def update(self, other: 'StyleOverlay') -> None:
+        """Add another overlay's styles; its values win on conflicts."""
+        for node, attrs in other.nodes.items():
+            self.style_node(node, **attrs)
+        for (u, v), attrs in other.edges.items():
+            self.style_edge(u, v, **attrs)
+
+    def clear(self) -> None:
+        """Remove all styles."""
+        self.nodes.clear()
+        self.edges.clear()
+
+    def node_data(self, node: Any, data: Dict) -> Dict:
+        """Node attributes with this overlay applied (data itself when unstyled)."""
+        style = self.nodes.get(node)
+        return {**data, **style} if style else data
+
+    def edge_data(self, u: Any, v: Any, data: Dict) -> Dict:
+        """Edge attributes with this overlay applied (data itself when unstyled)."""
+        style = self.edges.get((u, v))
+        return {**data, **style} if style else data
+
+    def apply(self, G: nx.DiGraph) -> nx.DiGraph:
+        """Copy of G with the styles written into its attributes."""
+        H = G.copy()
+        for node, attrs in self.nodes.items():
+            if node in H:
+                H.nodes[node].update(attrs)
+        for (u, v), attrs in self.edges.items():
+            if H.has_edge(u, v):
+                H.edges[u, v].update(attrs)
+        return H
+
+    def __len__(self) -> int:
+        """Number of styled nodes and edges."""
+        return len(self.nodes) + len(self.edges)
+
+
+def iter_styled_nodes(G: nx.DiGraph, overlay: Optional[StyleOverlay]) -> Iterable[Tuple[Any, Dict]]:
+    """G.nodes(data=True) with overlay styles merged in."""
+    if not overlay:
+        return G.nodes(data=True)
+    return ((node, overlay.node_data(node, data)) for node, data in G.nodes(data=True))
+
+
+def iter_styled_edges(G: nx.DiGraph, overlay: Optional[StyleOverlay]) -> Iterable[Tuple[Any, Any, Dict]]:
+    """G.edges(data=True) with overlay styles merged in."""
+    if not overlay or not overlay.edges:
+        return G.edges(data=True)
+    return ((u, v, overlay.edge_data(u, v, data)) for u, v, data in G.edges(data=True))
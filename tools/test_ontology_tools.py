@@ -8,9 +8,18 @@ Usage:
     python -m pytest test_ontology_tools.py # Run with pytest (verbose)
 """
 
+import os
 import sys
 import json
+import re
+import math
+import itertools
+import pickle
 import unittest
+import tracemalloc
+import networkx as nx
+from dataclasses import replace
+from unittest import mock
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 
@@ -21,10 +30,47 @@ from ontology_loader import (
     OntologyLoader, Ontology, Entity, Relationship, load_ontology
 )
 from graph_builder import (
-    OntologyGraphBuilder, build_ontology_graph, get_graph_stats
+    OntologyGraphBuilder, AgentContextGraphBuilder, build_ontology_graph, get_graph_stats,
+    load_agent_specs
 )
-from visualiser import OntologyVisualiser
-from ve_domain_graphs import VEDomainGraphBuilder, W4MFramework
+from ontology_cache import OntologyCache
+from ontology_store import OntologyStore, EntitySequence
+from benchmark import synthetic_ontology, synthetic_recipes, build_graph_per_item
+from visualiser import OntologyVisualiser, MATPLOTLIB_AVAILABLE
+from layout_engine import LayoutCache, LayoutEngine, NUMPY_AVAILABLE, multilevel_layout
+from ve_domain_graphs import VEDomainGraphBuilder, W4MFramework, AgentVEIntegration, find_value_paths
+from node_id_index import NodeIdIndex, node_id_index
+from batch_render import render_batch
+from graph_export import write_vis_html, write_vis_json
+from graph_lod import group_nodes, summarize_groups
+from graph_metrics import BottleneckAnalyzer, SCIPY_AVAILABLE, sparse_betweenness
+from recipe_eligibility import RecipeEligibilityIndex, ClientProfile, client_profiles
+from nutrition import MacroTarget, NutritionTable, bitset_mask, macro_targets, parse_quantity
+from meal_planner import MealPlanner, plan_for_coach
+from recipe_substitution import SubstitutionIndex
+from relation_index import RelationIndex, relation_index
+
+
+def revise_ontology(ontology: Ontology) -> Ontology:
+    """Copy of an ontology with edits, removals and additions of every kind."""
+    entities = list(ontology.entities)
+    relationships = list(ontology.relationships)
+
+    entities[1] = replace(entities[1], label="Renamed")
+    entities[2] = replace(entities[2], parent_class="ext:NewParent")
+    del entities[3]                       # still referenced: becomes a placeholder
+    entities.append(Entity("syn:New", "New", entity_type="Core", parent_class=entities[0].id))
+
+    relationships[0] = replace(relationships[0], cardinality="1:1")
+    del relationships[1]
+    relationships.append(Relationship("syn:relNew", "relatesTo", "syn:New", "ext:Elsewhere"))
+
+    return replace(ontology, version="1.1.0", entities=entities, relationships=relationships)
+
+
+def graph_contents(G):
+    """Nodes and edges with attributes, ignoring insertion order."""
+    return dict(G.nodes(data=True)), {(u, v): d for u, v, d in G.edges(data=True)}, G.graph
 
 
 class TestOntologyLoader(unittest.TestCase):
@@ -103,6 +149,141 @@ class TestOntologyLoader(unittest.TestCase):
             ontology = load_ontology(f.name)
             self.assertEqual(ontology.name, "File Test")
 
+    def test_stream_graph_matches_full_parse(self):
+        """Test streaming @graph parse yields the same ontology as json.load."""
+        test_data = {
+            "@context": {"rdfs": "http://www.w3.org/2000/01/rdf-schema#"},
+            "@graph": [
+                {"@id": f"ex:C{i}", "@type": "rdfs:Class", "rdfs:label": f"C{i}"}
+                for i in range(50)
+            ] + [
+                {"@id": "ex:links", "@type": "rdf:Property", "rdfs:label": "links",
+                 "rdfs:domain": "ex:C0", "rdfs:range": "ex:C1"}
+            ],
+            "name": "Streamed",
+            "version": "3.1.0"
+        }
+
+        with NamedTemporaryFile(mode='w', suffix='.jsonld', delete=False) as f:
+            json.dump(test_data, f, indent=2)
+            f.flush()
+
+            # Tiny chunks force values to straddle buffer refills
+            self.loader.STREAM_CHUNK_SIZE = 16
+            streamed = self.loader.load_file(f.name, stream=True)
+            full = self.loader.load_file(f.name)
+
+            self.assertEqual(streamed, full)
+            self.assertEqual(streamed.version, "3.1.0")
+            self.assertEqual(len(streamed.entities), 50)
+
+            items = list(self.loader.iter_file(f.name))
+            self.assertEqual(len(items), 51)
+            self.assertIsInstance(items[-1], Relationship)
+
+    def test_stream_falls_back_for_non_graph_formats(self):
+        """Test streaming mode still dispatches on non-@graph formats."""
+        test_data = {
+            "name": "Classes",
+            "classes": {"Test": {"@id": "test:Test", "rdfs:label": "Test"}}
+        }
+
+        with NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump(test_data, f)
+            f.flush()
+
+            ontology = self.loader.load_file(f.name, stream=True)
+            self.assertEqual(ontology.name, "Classes")
+            self.assertEqual([e.id for e in self.loader.iter_file(f.name)], ["test:Test"])
+
+    def test_stream_detects_format_key_after_graph(self):
+        """Test a format key after @graph still takes precedence when streaming."""
+        text = (
+            '{"@graph": [{"@id": "a", "@type": "owl:Class"}], '
+            '"classes": {"X": {"@id": "test:X", "rdfs:label": "X"}}}'
+        )
+
+        with NamedTemporaryFile(mode='w', suffix='.jsonld', delete=False) as f:
+            f.write(text)
+            f.flush()
+
+            full = self.loader.load_file(f.name)
+            streamed = self.loader.load_file(f.name, stream=True)
+            self.assertEqual([e.id for e in full.entities], ["test:X"])
+            self.assertEqual(streamed, full)
+            with self.assertRaises(ValueError):
+                list(self.loader.iter_file(f.name))
+
+    def test_load_many_preserves_order_and_reports_failures(self):
+        """Test parallel batch loading keeps input order and isolates errors."""
+        with TemporaryDirectory() as tmpdir:
+            paths = []
+            for i in range(4):
+                path = Path(tmpdir) / f"ont{i}.json"
+                path.write_text(json.dumps({
+                    "name": f"Ont {i}",
+                    "classes": {"A": {"@id": f"ex:A{i}"}}
+                }))
+                paths.append(path)
+            broken = Path(tmpdir) / "broken.json"
+            broken.write_text("{not json")
+            paths.insert(2, broken)
+
+            results = self.loader.load_many(paths, workers=2)
+
+            self.assertEqual([r.path for r in results], [str(p) for p in paths])
+            self.assertFalse(results[2].ok)
+            self.assertIn("JSONDecodeError", results[2].error)
+            self.assertEqual(
+                [r.ontology.name for r in results if r.ok],
+                ["Ont 0", "Ont 1", "Ont 2", "Ont 3"]
+            )
+
+    def test_instance_ingestion(self):
+        """Test @graph individuals become entities and reference edges."""
+        test_data = {
+            "@context": {"suitableFor": {"@id": "ex:suitableFor", "@type": "@id"}},
+            "@graph": [
+                {
+                    "@id": "recipe:r-001",
+                    "@type": ["recipe:Recipe", "Recipe"],
+                    "name": "Roast Veg",
+                    "recipeYield": "2 servings",
+                    "nutrition": {"@type": "NutritionInformation", "calories": "380 kcal"},
+                    "suitableFor": "diet:vegan",
+                    "belongsToTheme": [{"@id": "theme:Quick", "note": "under 30 min"}]
+                },
+                {"@type": "Person", "givenName": "Ada", "familyName": "Lovelace"}
+            ]
+        }
+
+        with NamedTemporaryFile(mode='w', suffix='.jsonld', delete=False) as f:
+            json.dump(test_data, f)
+            f.flush()
+
+            # Schema-only loading ignores individuals
+            self.assertEqual(len(self.loader.load_file(f.name).entities), 0)
+
+            loader = OntologyLoader(include_instances=True)
+            for stream in (False, True):
+                ontology = loader.load_file(f.name, stream=stream)
+                entities = {e.id: e for e in ontology.entities}
+                edges = {(r.source, r.label, r.target): r for r in ontology.relationships}
+
+                recipe = entities["recipe:r-001"]
+                self.assertEqual(recipe.entity_type, "recipe:Recipe")
+                self.assertEqual(recipe.properties["@type"], ["recipe:Recipe", "Recipe"])
+                self.assertEqual(recipe.properties["recipeYield"], "2 servings")
+                self.assertEqual(entities["recipe:r-001/nutrition"].entity_type, "NutritionInformation")
+                self.assertEqual(entities["_:b1"].label, "Ada Lovelace")
+
+                self.assertIn(("recipe:r-001", "nutrition", "recipe:r-001/nutrition"), edges)
+                self.assertIn(("recipe:r-001", "suitableFor", "diet:vegan"), edges)
+                self.assertEqual(
+                    edges[("recipe:r-001", "belongsToTheme", "theme:Quick")].description,
+                    "note: under 30 min"
+                )
+
     def test_entity_dataclass(self):
         """Test Entity dataclass creation."""
         entity = Entity(
@@ -132,6 +313,132 @@ class TestOntologyLoader(unittest.TestCase):
         self.assertEqual(rel.cardinality, "1:*")
 
 
+class TestOntologyCache(unittest.TestCase):
+    """Tests for ontology_cache.py"""
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.cache = OntologyCache(self.root / "cache")
+        self.source = self.root / "ont.json"
+        self._write("Cached")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name):
+        self.source.write_text(json.dumps({
+            "name": name,
+            "classes": {"A": {"@id": "ex:A", "rdfs:label": "A"}}
+        }))
+
+    def test_warm_load_skips_json_decoding(self):
+        """Test a cache hit returns the ontology without calling json.load."""
+        loader = OntologyLoader(cache=self.cache)
+        cold = loader.load_file(self.source)
+
+        with mock.patch("ontology_loader.json.load", side_effect=AssertionError):
+            warm = loader.load_file(self.source)
+
+        self.assertEqual(warm, cold)
+
+    def test_changed_file_invalidates_entry(self):
+        """Test edited content is re-parsed."""
+        loader = OntologyLoader(cache=self.cache)
+        loader.load_file(self.source)
+
+        self._write("Edited!")
+        self.assertEqual(loader.load_file(self.source).name, "Edited!")
+
+    def test_graph_cache(self):
+        """Test OntologyGraphBuilder.from_file caches built graphs."""
+        builder = OntologyGraphBuilder(cache=self.cache)
+        G = builder.from_file(self.source)
+
+        with mock.patch.object(builder, "build_graph", side_effect=AssertionError):
+            cached = builder.from_file(self.source)
+
+        self.assertEqual(list(cached.nodes(data=True)), list(G.nodes(data=True)))
+
+    def test_graph_cache_keyed_on_builder_options(self):
+        """Test graphs cached by one builder configuration are not served to another."""
+        OntologyGraphBuilder(cache=self.cache).from_file(self.source)
+
+        indexed = OntologyGraphBuilder(cache=self.cache, index_relations=True)
+        G = indexed.from_file(self.source)
+        self.assertIn("relation_index", G.graph)
+
+        with mock.patch.object(indexed, "build_graph", side_effect=AssertionError):
+            self.assertIn("relation_index", indexed.from_file(self.source).graph)
+
+    def test_size_based_eviction(self):
+        """Test least recently used entries are evicted beyond max_bytes."""
+        self.cache.put("blob", self.source, b"x" * 4096)
+        self.cache.put("other", self.source, b"y" * 4096)
+        size = self.cache.stats()["bytes"]
+
+        self.cache.max_bytes = size - 1
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+
+class TestOntologyStore(unittest.TestCase):
+    """Tests for ontology_store.py"""
+
+    def setUp(self):
+        self.entities = [
+            Entity("A", "Node A", "First", "Core", {"p": 1}),
+            Entity("B", "Node B", "Second", "Core", parent_class="A"),
+        ]
+        self.relationships = [Relationship("r1", "links", "A", "B", "1:1")]
+
+    def test_sequence_views_match_dataclasses(self):
+        """Test store-backed sequences read like the dataclass lists."""
+        store = OntologyStore.from_items(self.entities, self.relationships)
+
+        self.assertEqual(len(store.entities), 2)
+        self.assertEqual(store.entities[-1].parent_class, "A")
+        self.assertEqual(store.entities[0].properties, {"p": 1})
+        self.assertEqual(store.entities, self.entities)
+        self.assertEqual(store.relationships, self.relationships)
+        self.assertEqual(store.entities[0:1], self.entities[0:1])
+        # Interned: both entity types share one table slot
+        self.assertEqual(store._ent_type[0], store._ent_type[1])
+
+    def test_rows_keep_none_values(self):
+        """Test row iterators return None for unset interned columns, like the records."""
+        store = OntologyStore.from_items(
+            [Entity("A", "Node A", "", None)],
+            [Relationship("r1", None, "A", "B", None, None)]
+        )
+
+        self.assertEqual(next(store.iter_entity_rows())[3], None)
+        self.assertEqual(store.entities[0].entity_type, None)
+        self.assertEqual(list(store.iter_relationship_rows()), [("r1", None, "A", "B", None, None)])
+
+    def test_compact_loader_builds_same_graph(self):
+        """Test compact loading feeds graph_builder without dataclasses."""
+        data = {
+            "name": "Compact",
+            "classes": {
+                "A": {"@id": "ex:A", "rdfs:label": "A"},
+                "B": {"@id": "ex:B", "rdfs:label": "B", "rdfs:subClassOf": "ex:A"}
+            }
+        }
+        compact = OntologyLoader(compact=True).parse_ontology(data, "c.json")
+        regular = OntologyLoader().parse_ontology(data, "c.json")
+
+        self.assertIsInstance(compact.entities, EntitySequence)
+        self.assertIsNotNone(compact.store)
+        self.assertEqual(compact, regular)
+
+        builder = OntologyGraphBuilder()
+        G1 = builder.build_graph(compact)
+        G2 = builder.build_graph(regular)
+        self.assertEqual(list(G1.nodes(data=True)), list(G2.nodes(data=True)))
+        self.assertEqual(list(G1.edges(data=True)), list(G2.edges(data=True)))
+
+
 class TestGraphBuilder(unittest.TestCase):
     """Tests for graph_builder.py"""
 
@@ -161,6 +468,86 @@ class TestGraphBuilder(unittest.TestCase):
         self.assertEqual(G.number_of_edges(), 1)
         self.assertTrue(G.has_edge("A", "B"))
 
+    def test_batched_build_matches_per_item(self):
+        """Test bulk insertion yields the same nodes, edges and placeholders."""
+        ontology = synthetic_ontology(500, seed=3)
+        G = self.builder.build_graph(ontology)
+        reference = build_graph_per_item(ontology)
+
+        self.assertEqual(list(G.nodes(data=True)), list(reference.nodes(data=True)))
+        self.assertEqual(list(G.edges(data=True)), list(reference.edges(data=True)))
+        self.assertIn('external', {d['node_type'] for _, d in G.nodes(data=True)})
+
+    def test_update_graph_matches_rebuild(self):
+        """Test diff-based update leaves the graph equal to a fresh build."""
+        old = synthetic_ontology(300, seed=5)
+        new = revise_ontology(old)
+
+        G = self.builder.build_graph(old)
+        delta = self.builder.update_graph(G, old, new)
+
+        self.assertEqual(graph_contents(G), graph_contents(self.builder.build_graph(new)))
+        self.assertEqual(G.graph['version'], "1.1.0")
+        self.assertIn(old.entities[3].id, delta.entity_ids)
+        self.assertEqual(len(delta.relationship_ids), 3)
+        self.assertLess(len(delta.nodes_updated) + len(delta.nodes_added), 10)
+
+        # Unchanged ontology yields an empty delta
+        self.assertTrue(self.builder.diff(new, new).is_empty())
+
+    def test_agent_context_merges_each_ontology_once(self):
+        """Test in-place merging matches repeated nx.compose, once per graph."""
+        graphs = {
+            f"ont:{i}": self.builder.build_graph(synthetic_ontology(50, seed=i))
+            for i in range(3)
+        }
+        spec = {
+            "agentId": "agent:a",
+            "ontologyBindings": {
+                "CONSUMES": ["ont:0", {"ontologyId": "ont:1"}],
+                "PRODUCES": ["ont:0"],
+                "REQUIRES": ["ont:2", "ont:missing"]
+            }
+        }
+
+        # Reference: the previous compose-per-binding behaviour
+        expected = nx.DiGraph()
+        expected.add_node("agent:a", label="agent:a", node_type='agent', color='#E91E63')
+        for binding_type in AgentContextGraphBuilder.BINDING_TYPES:
+            for ref in spec["ontologyBindings"].get(binding_type, []):
+                ont_id = ref if isinstance(ref, str) else ref["ontologyId"]
+                if ont_id not in expected:
+                    expected.add_node(ont_id, label=ont_id, node_type='ontology', color='#2196F3')
+                edge = ("agent:a", ont_id) if binding_type == 'PRODUCES' else (ont_id, "agent:a")
+                expected.add_edge(*edge, label=binding_type, edge_type='binding')
+                if ont_id in graphs:
+                    expected = nx.compose(expected, graphs[ont_id])
+
+        agents = AgentContextGraphBuilder()
+        G = agents.build_agent_context_graph(spec, graphs)
+        self.assertEqual(graph_contents(G), graph_contents(expected))
+
+        fleet = agents.build_fleet_context_graph(
+            [spec, {"agentId": "agent:b", "ontologyBindings": {"CONSUMES": ["ont:1", "ont:2"]}}],
+            graphs
+        )
+        self.assertTrue(fleet.has_edge("ont:2", "agent:b"))
+        self.assertEqual(
+            fleet.number_of_nodes(),
+            2 + 4 + len(set().union(*(g.nodes for g in graphs.values())))
+        )
+
+    def test_load_agent_specs(self):
+        """Test agent specs are collected from JSON files in a directory."""
+        with TemporaryDirectory() as tmpdir:
+            Path(tmpdir, "a.json").write_text(json.dumps({"agentId": "agent:a"}))
+            Path(tmpdir, "b.jsonld").write_text(json.dumps([{"agentId": "agent:b"}, {"x": 1}]))
+            Path(tmpdir, "notes.md").write_text("# not a spec")
+            Path(tmpdir, "broken.json").write_text("{")
+
+            specs = load_agent_specs(tmpdir)
+            self.assertEqual([s["agentId"] for s in specs], ["agent:a", "agent:b"])
+
     def test_graph_metadata(self):
         """Test that graph metadata is preserved."""
         ontology = Ontology(
@@ -258,6 +645,51 @@ class TestVisualiser(unittest.TestCase):
         filtered = self.vis.filter_by_domain(G, "Core", include_connected=True)
         self.assertGreaterEqual(filtered.number_of_nodes(), 1)
 
+    def test_filter_by_domain_uses_index(self):
+        """Test domains are classified once, kept up to date, and filtered as views."""
+        old = Ontology(
+            id="test:domains", name="Domains", version="1.0.0", description="", context={},
+            entities=[Entity("A", "Node A", "", "Core"), Entity("org:B", "Org B", "", "Core")],
+            relationships=[Relationship("r1", "links", "A", "org:B")]
+        )
+        G = self.builder.build_graph(old)
+
+        with mock.patch.object(self.vis.domain_classifier, 'classify',
+                               wraps=self.vis.domain_classifier.classify) as classify:
+            ce = self.vis.filter_by_domain(G, "CE", include_connected=False)
+            self.vis.filter_by_domain(G, "Core")
+            self.assertEqual(classify.call_count, G.number_of_nodes())
+
+        self.assertEqual(set(ce), {"org:B"})
+        self.assertTrue(nx.is_frozen(ce))
+        self.assertFalse(nx.is_frozen(self.vis.filter_by_domain(G, "CE", copy=True)))
+
+        # Added nodes are picked up; delta updates reclassify and drop nodes
+        G.add_node("agent:x", node_type="agent")
+        self.assertIn("agent:x", self.vis.filter_by_domain(G, "Agent"))
+        new = replace(old, entities=[Entity("A", "Node A", "", "Core"), Entity("value:C", "C", "", "Core")],
+                      relationships=[])
+        self.builder.update_graph(G, old, new)
+        self.assertEqual(set(self.vis.filter_by_domain(G, "CE")), set())
+        self.assertIn("value:C", self.vis.filter_by_domain(G, "VE"))
+
+        # Registered rules take precedence and rebuild the index
+        self.vis.register_domain_rule("Special", lambda node, data: node == "A")
+        self.assertEqual(set(self.vis.filter_by_domain(G, "Special", include_connected=False)), {"A"})
+
+    def test_filter_by_domain_after_remove_then_add(self):
+        """Test the domain index follows a node removal followed by an addition."""
+        G = nx.DiGraph()
+        G.add_edge("agent:a", "x")
+        G.add_node("agent:b")
+        self.vis.filter_by_domain(G, "Agent")
+
+        G.remove_node("agent:a")
+        G.add_node("agent:c")
+        self.assertEqual(set(self.vis.filter_by_domain(G, "Agent", include_connected=False)),
+                         {"agent:b", "agent:c"})
+        self.assertEqual(set(self.vis.filter_by_domain(G, "Agent")), {"agent:b", "agent:c"})
+
     def test_highlight_path(self):
         """Test path highlighting."""
         G = self._create_test_graph()
@@ -268,6 +700,29 @@ class TestVisualiser(unittest.TestCase):
         self.assertTrue(highlighted.nodes["A"].get("highlighted", False))
         self.assertTrue(highlighted.nodes["B"].get("highlighted", False))
 
+    def test_path_overlay_leaves_graph_unchanged(self):
+        """Test overlays collect several paths and are merged only in the output."""
+        G = self.builder.build_graph(synthetic_ontology(60, seed=8))
+        nodes = list(G)
+        before = graph_contents(G)
+
+        overlay = self.vis.path_overlay(G, *next(iter(nx.edges(G))), highlight_color='#000001')
+        u, v = list(G.edges())[-1]
+        self.vis.path_overlay(G, u, v, highlight_color='#000002', overlay=overlay)
+
+        with mock.patch.object(G, 'copy', side_effect=AssertionError("graph copied")), \
+                TemporaryDirectory() as tmpdir:
+            path = write_vis_json(G, Path(tmpdir) / "g.json", overlay=overlay)
+            data = json.loads(Path(path).read_text())
+
+        colors = {n['id']: n['color'] for n in data['nodes']}
+        self.assertEqual(colors[str(v)], '#000002')
+        self.assertEqual(sum(c in ('#000001', '#000002') for c in colors.values()), len(overlay.nodes))
+        widths = {(e['from'], e['to']): e['width'] for e in data['edges']}
+        self.assertEqual(widths[str(u), str(v)], 4)
+        self.assertEqual(graph_contents(G), before)
+        self.assertEqual(list(G), nodes)
+
     def test_render_pyvis_creates_file(self):
         """Test PyVis rendering creates HTML file."""
         G = self._create_test_graph()
@@ -280,6 +735,283 @@ class TestVisualiser(unittest.TestCase):
             self.assertEqual(result, str(output))
 
 
+    def test_render_pyvis_embeds_layout(self):
+        """Test precomputed positions are embedded with physics off."""
+        G = self._create_test_graph()
+
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "laid_out.html"
+            self.vis.render_pyvis(G, str(output), layout='circular')
+            html = output.read_text()
+
+            self.assertIn('"physics": false', html)
+            self.assertIn('"x": ', html)
+
+    @unittest.skipUnless(MATPLOTLIB_AVAILABLE, "matplotlib not installed")
+    def test_render_matplotlib_collections(self):
+        """Test large graphs are drawn as collections with a bounded number of labels."""
+        import matplotlib.pyplot as plt
+
+        G = self.builder.build_graph(synthetic_ontology(800, seed=6))
+        drawn = {}
+
+        def capture(*args, **kwargs):
+            ax = plt.gcf().axes[0]
+            drawn['collections'] = [type(c).__name__ for c in ax.collections]
+            drawn['texts'] = len(ax.texts)
+            drawn['widths'] = list(ax.collections[1].get_linewidths())
+
+        overlay = self.vis.path_overlay(G, *next(iter(G.edges())))
+        with TemporaryDirectory() as tmpdir, \
+                mock.patch('visualiser.nx.draw_networkx_edge_labels') as edge_labels, \
+                mock.patch('visualiser.plt.savefig', side_effect=capture):
+            self.vis.render_matplotlib(G, str(Path(tmpdir) / "g.png"), figsize=(8, 6), layout='large',
+                                       overlay=overlay)
+
+        edge_labels.assert_not_called()
+        self.assertEqual(drawn['collections'], ['PathCollection', 'LineCollection', 'PolyCollection'])
+        budget = (self.vis.LABELS_PER_SQ_INCH + self.vis.EDGE_LABELS_PER_SQ_INCH) * 8 * 6
+        self.assertTrue(0 < drawn['texts'] <= budget)
+        self.assertEqual(drawn['widths'][-1], 4)  # highlighted edge drawn last
+
+    def test_render_pyvis_clustered(self):
+        """Test level-of-detail output: super-nodes in the page, members in expand files."""
+        G = self.builder.build_graph(synthetic_ontology(300, seed=4))
+        G.add_edges_from([("ns1:A", "ns1:B"), ("ns1:B", "syn:E1"), ("ns2:C", "ns1:A")])
+
+        with TemporaryDirectory() as tmpdir:
+            output = Path(tmpdir) / "clustered.html"
+            self.vis.render_pyvis(G, str(output), cluster_by='namespace', max_clusters=8)
+            html = output.read_text()
+            page_nodes = json.loads(re.search(r"nodes = new vis\.DataSet\((.*?)\);", html).group(1))
+            self.assertLessEqual(len(page_nodes), 8)
+            self.assertIn("ns2 (1)", {node['label'] for node in page_nodes})
+            self.assertIn('vhfLodLoaded', html)
+
+            members, edges = set(), set()
+            for path in sorted((Path(tmpdir) / "clustered_lod").glob("*.js")):
+                payload = json.loads(path.read_text().split(", ", 1)[1].rstrip(");\n"))
+                self.assertLessEqual(len(payload['nodes']), -(-len(G) // 4))
+                members.update(node['id'] for node in payload['nodes'])
+                edges.update((e['from'], e['to']) for e in payload['edges'])
+
+            self.assertEqual(members, set(G))
+            self.assertEqual(edges, set(G.edges()))
+
+    def test_group_nodes_bounded(self):
+        """Test grouping by layer, merging of small groups and splitting of large ones."""
+        w4m = VEDomainGraphBuilder().build_w4m_framework_graph()
+        self.assertEqual(group_nodes(w4m)["layer_3"], "Layer 3")
+
+        G = nx.DiGraph([(f"ns{i}:A", f"ns{i}:B") for i in range(10)] + [("ns0:B", "ns0:C")])
+        groups = group_nodes(G, 'namespace', max_groups=6)
+        summary = summarize_groups(G, groups)
+        self.assertLessEqual(len(summary), 6)
+        self.assertLessEqual(max(members for _, members in summary.nodes(data='members')), 7)
+        self.assertEqual(groups["ns0:C"], "ns0")
+        self.assertEqual(groups["ns2:A"], groups["ns2:B"])
+        self.assertTrue(groups["ns9:B"].startswith("Other "))
+
+
+class TestLayoutEngine(unittest.TestCase):
+    """Tests for layout_engine.py"""
+
+    def test_layout_cached_by_structure(self):
+        """Test identical structures reuse positions, also across engines via disk."""
+        G = OntologyGraphBuilder().build_graph(synthetic_ontology(60, seed=1))
+
+        with TemporaryDirectory() as tmpdir:
+            engine = LayoutEngine(LayoutCache(tmpdir), seed=0)
+            with mock.patch('layout_engine.nx.spring_layout', wraps=nx.spring_layout) as spring:
+                first = engine.compute(G)
+                self.assertEqual(engine.compute(G.copy()), first)
+                self.assertEqual(LayoutEngine(LayoutCache(tmpdir)).compute(G), first)
+                self.assertEqual(spring.call_count, 1)
+
+    def test_disk_cache_evicts_least_recently_used(self):
+        """Test persistent layouts beyond max_bytes are evicted, oldest use first."""
+        with TemporaryDirectory() as tmpdir:
+            cache = LayoutCache(tmpdir)
+            cache.put("a", os.urandom(4096))
+            cache.put("b", os.urandom(4096))
+            a, b = (cache._entry_path(key) for key in "ab")
+            os.utime(b, ns=(1, 1))
+            os.utime(a, ns=(2, 2))
+
+            # A disk hit counts as a use
+            fresh = LayoutCache(tmpdir, max_bytes=a.stat().st_size + b.stat().st_size + 2048)
+            self.assertIsNotNone(fresh.get("b"))
+            fresh.put("c", os.urandom(4096))
+
+            self.assertFalse(a.exists())
+            self.assertTrue(b.exists())
+            self.assertIsNotNone(LayoutCache(tmpdir).get("c"))
+
+    def test_spring_warm_start(self):
+        """Test a slightly changed graph starts from the previous positions."""
+        G = OntologyGraphBuilder().build_graph(synthetic_ontology(60, seed=2))
+        engine = LayoutEngine(seed=0)
+        before = engine.compute(G)
+
+        G.add_edge("syn:E0", "syn:Added")
+        with mock.patch('layout_engine.nx.spring_layout', wraps=nx.spring_layout) as spring:
+            after = engine.compute(G)
+
+        initial = spring.call_args.kwargs['pos']
+        self.assertEqual(initial["syn:E5"], before["syn:E5"])
+        self.assertIn("syn:Added", initial)
+        self.assertEqual(set(after), set(G))
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_multilevel_layout(self):
+        """Test the large-graph layout places connected nodes closer than random pairs."""
+        G = OntologyGraphBuilder().build_graph(synthetic_ontology(3000, seed=3))
+        with mock.patch('layout_engine.nx.spring_layout') as spring:
+            pos = LayoutEngine(seed=0).compute(G)
+        spring.assert_not_called()
+
+        self.assertEqual(set(pos), set(G))
+        self.assertLessEqual(max(abs(c) for p in pos.values() for c in p), 1.0 + 1e-9)
+
+        def dist(u, v):
+            return ((pos[u][0] - pos[v][0]) ** 2 + (pos[u][1] - pos[v][1]) ** 2) ** 0.5
+
+        nodes = list(G)
+        edge_mean = sum(dist(u, v) for u, v in G.edges()) / G.number_of_edges()
+        pair_mean = sum(dist(nodes[i], nodes[-i - 1]) for i in range(500)) / 500
+        self.assertLess(edge_mean, 0.5 * pair_mean)
+        self.assertEqual(multilevel_layout(G, seed=0), multilevel_layout(G, seed=0))
+
+    @unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+    def test_layered_layout(self):
+        """Test layered layout orders W4M layers top to bottom and VSOM levels too."""
+        builder = VEDomainGraphBuilder()
+        w4m = builder.build_w4m_framework_graph()
+        pos = LayoutEngine(seed=0).compute(w4m, 'layered')
+        heights = [pos[f"layer_{i}"][1] for i in range(8)]
+        self.assertEqual(heights, sorted(heights, reverse=True))
+
+        ontology = Ontology(
+            id="vsom", name="VSOM", version="1.0", description="", context={},
+            entities=[Entity(f"vsom:{name}{i}", f"{name} {i}") for name in ("Vision", "Plan", "Goal", "KPI")
+                      for i in range(3)],
+            relationships=[]
+        )
+        vsom = builder.build_vsom_graph(ontology)
+        pos = multilevel_layout(vsom, seed=0, layered=True)
+        band = {}
+        for node, data in vsom.nodes(data=True):
+            if 'level' in data:
+                band[node] = data['level']
+                band.update((child, data['level']) for child in vsom.successors(node)
+                            if 'level' not in vsom.nodes[child])
+        for upper in band:
+            for lower in band:
+                if band[upper] < band[lower]:
+                    self.assertGreater(pos[upper][1], pos[lower][1])
+
+
+class TestGraphExport(unittest.TestCase):
+    """Tests for graph_export.py"""
+
+    def test_vis_json_and_html(self):
+        """Test exported records match the graph and data cannot close the script tag."""
+        G = OntologyGraphBuilder().build_graph(synthetic_ontology(200, seed=5))
+        G.nodes["syn:E0"]['description'] = "</script><b>x</b>"
+
+        with TemporaryDirectory() as tmpdir:
+            data = json.loads(Path(write_vis_json(G, Path(tmpdir) / "g.json")).read_text())
+            self.assertEqual([n['id'] for n in data['nodes']], list(G))
+            self.assertEqual([(e['from'], e['to']) for e in data['edges']], list(G.edges()))
+            self.assertEqual(data['nodes'][0]['description'], "</script><b>x</b>")
+
+            positions = {node: (0.5, -0.5) for node in G}
+            html = Path(write_vis_html(G, Path(tmpdir) / "g.html", positions)).read_text()
+            self.assertEqual(html.count("</script>"), 2)
+            self.assertIn('"physics":false', html)
+            self.assertIn('"y":', html)
+
+    def test_export_memory_does_not_grow_with_graph(self):
+        """Test export memory stays flat when the graph grows tenfold."""
+        peaks = []
+        for n in (1000, 10000):
+            G = OntologyGraphBuilder().build_graph(synthetic_ontology(n))
+            with TemporaryDirectory() as tmpdir, mock.patch('graph_export.CHUNK_CHARS', 1 << 14):
+                tracemalloc.start()
+                write_vis_html(G, Path(tmpdir) / "g.html")
+                peaks.append(tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+        self.assertLess(peaks[1], 2 * peaks[0] + (256 << 10))
+
+
+class TestBatchRender(unittest.TestCase):
+    """Tests for batch_render.py"""
+
+    @staticmethod
+    def _write_ontology(path: Path, n: int) -> None:
+        """Write a small class hierarchy as JSON-LD."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "@context": {"rdfs": "http://www.w3.org/2000/01/rdf-schema#"},
+            "@graph": [{"@id": f"ex:C{i}", "@type": "rdfs:Class", "rdfs:label": f"C{i}",
+                        "rdfs:subClassOf": "ex:C0"} for i in range(n)],
+            "name": path.stem
+        }))
+
+    @mock.patch.dict('os.environ', {'VHF_ONTOLOGY_CACHE': 'off'})
+    def test_renders_and_skips_unchanged(self):
+        """Test outputs mirror the input tree and unchanged inputs are skipped."""
+        with TemporaryDirectory() as tmpdir:
+            src, out = Path(tmpdir) / "src", Path(tmpdir) / "out"
+            self._write_ontology(src / "a.json", 5)
+            self._write_ontology(src / "sub" / "b.jsonld", 8)
+            (src / "broken.json").write_text("{not json")
+
+            results = render_batch(src, out, formats=('html', 'svg'), workers=1)
+            by_name = {Path(r.path).name: r for r in results}
+            self.assertFalse(by_name["broken.json"].ok)
+            self.assertTrue((out / "sub" / "b.svg").exists())
+            self.assertEqual(set(by_name["a.json"].timings), {'load', 'html', 'svg'})
+
+            results = render_batch(src, out, formats=('html', 'svg', 'png'), workers=1)
+            by_name = {Path(r.path).name: r for r in results}
+            self.assertEqual(by_name["a.json"].skipped, ['html', 'svg'])
+            self.assertEqual(set(by_name["a.json"].timings), {'load', 'png'})
+
+            self._write_ontology(src / "a.json", 6)
+            results = render_batch(src, out, formats=('html', 'svg', 'png'), workers=1)
+            by_name = {Path(r.path).name: r for r in results}
+            self.assertEqual(by_name["a.json"].skipped, [])
+            self.assertEqual(by_name["b.jsonld"].timings, {})
+            self.assertEqual(set(by_name["b.jsonld"].outputs), {'html', 'svg', 'png'})
+
+    @mock.patch.dict('os.environ', {'VHF_ONTOLOGY_CACHE': 'off'})
+    def test_output_inside_input_and_shared_stems(self):
+        """Test the output tree is not re-scanned and same-stem inputs keep separate outputs."""
+        with TemporaryDirectory() as tmpdir:
+            src = Path(tmpdir)
+            out = src / "rendered"
+            self._write_ontology(src / "foo.json", 3)
+            self._write_ontology(src / "foo.jsonld", 4)
+            self._write_ontology(out / "stray.json", 2)
+            cwd = os.getcwd()
+
+            results = render_batch(src, out, formats=('html',), workers=1)
+            self.assertEqual(sorted(Path(r.path).name for r in results), ["foo.json", "foo.jsonld"])
+            self.assertTrue(all(r.ok for r in results))
+            self.assertEqual(
+                sorted(Path(r.outputs['html']).name for r in results),
+                ["foo.json.html", "foo.jsonld.html"]
+            )
+            self.assertTrue((out / "lib").is_dir())
+            self.assertEqual(os.getcwd(), cwd)
+
+            results = render_batch(src, out, formats=('html',), workers=1)
+            self.assertEqual(len(results), 2)
+            self.assertTrue(all(r.skipped == ['html'] for r in results))
+
+
 class TestVEDomainGraphs(unittest.TestCase):
     """Tests for ve_domain_graphs.py"""
 
@@ -309,6 +1041,179 @@ class TestVEDomainGraphs(unittest.TestCase):
         # Should have feedback edges from strategy
         self.assertTrue(G.has_edge("layer_7", "layer_0"))
 
+    def test_derived_graphs_patched_in_place(self):
+        """Test value chain and agent context graphs follow an ontology update."""
+        old = synthetic_ontology(200, seed=7)
+        new = revise_ontology(old)
+        delta = self.builder.builder.diff(old, new)
+
+        chain = self.builder.build_ve_value_chain({"ICP": old})
+        self.builder.update_ve_value_chain(chain, "ICP", delta)
+        self.assertEqual(
+            graph_contents(chain),
+            graph_contents(self.builder.build_ve_value_chain({"ICP": new}))
+        )
+
+        agents = AgentContextGraphBuilder()
+        bindings = {"agentId": "agent:1", "ontologyBindings": {"CONSUMES": ["syn:ontology"]}}
+        context = agents.build_agent_context_graph(
+            bindings, {"syn:ontology": self.builder.builder.build_graph(old)}
+        )
+        agents.update_agent_context_graph(context, delta)
+        rebuilt = agents.build_agent_context_graph(
+            bindings, {"syn:ontology": self.builder.builder.build_graph(new)}
+        )
+        self.assertEqual(graph_contents(context)[:2], graph_contents(rebuilt)[:2])
+
+    def test_find_value_paths_top_k(self):
+        """Test top-k path search stops early and reports truncation."""
+        G = nx.gnp_random_graph(40, 0.25, seed=2, directed=True)
+        for u, v in G.edges:
+            G.edges[u, v]['weight'] = (u * v) % 7 + 1
+
+        first = find_value_paths(G, 0, 39, k=5, cutoff=6)
+        reference = nx.all_simple_paths(G, 0, 39, cutoff=6)
+        self.assertEqual(first.paths, [next(reference) for _ in range(5)])
+        self.assertTrue(first.truncated)
+
+        shortest = find_value_paths(G, 0, 39, k=5, order='shortest')
+        weights = [nx.path_weight(G, p, 'weight') for p in shortest.paths]
+        self.assertEqual(weights, sorted(weights))
+        self.assertEqual(weights[0], nx.shortest_path_length(G, 0, 39, weight='weight'))
+
+        # Paths beyond cutoff are never enumerated (K12 has ~10^7 simple 0 -> 11 paths)
+        complete_graph = nx.complete_graph(12, create_using=nx.DiGraph)
+        for weight in ('weight', None):
+            bounded = find_value_paths(complete_graph, 0, 11, k=20, cutoff=2, order='shortest', weight=weight)
+            self.assertEqual(len(bounded.paths), 11)
+            self.assertFalse(bounded.truncated)
+
+        budgeted = find_value_paths(G, 0, 39, k=10 ** 9, cutoff=39, time_budget=0.05)
+        self.assertTrue(budgeted.timed_out and budgeted.truncated)
+
+        # Framework graph has fewer paths than k: complete, not truncated
+        framework = self.builder.build_w4m_framework_graph()
+        complete = find_value_paths(framework, "layer_0", "layer_7", k=50)
+        self.assertEqual(len(complete.paths), 1)
+        self.assertFalse(complete.truncated)
+
+    def test_bottlenecks_cached_per_graph_version(self):
+        """Test betweenness is reused until the graph structure changes."""
+        G = self.builder.build_w4m_framework_graph()
+        analyzer = BottleneckAnalyzer(k=4, seed=1)
+        builder = VEDomainGraphBuilder(bottlenecks=analyzer)
+
+        with mock.patch('graph_metrics.nx.betweenness_centrality',
+                        wraps=nx.betweenness_centrality) as computed:
+            first = builder.analyze_value_flow(G)
+            self.assertEqual(builder.analyze_value_flow(G.copy())['bottlenecks'], first['bottlenecks'])
+            self.assertEqual(computed.call_count, 1)
+
+            G.add_edge("layer_0", "layer_7")
+            builder.analyze_value_flow(G)
+            self.assertEqual(computed.call_count, 2)
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_sparse_betweenness_matches_networkx(self):
+        """Test the sparse-matrix backend agrees with networkx."""
+        G = nx.gnp_random_graph(60, 0.06, seed=4, directed=True)
+        expected = nx.betweenness_centrality(G)
+        actual = sparse_betweenness(G, batch_size=8)
+        for node in G:
+            self.assertAlmostEqual(actual[node], expected[node])
+
+        sampled = BottleneckAnalyzer(k=20, seed=5, backend='sparse').betweenness(G)
+        self.assertEqual(set(sampled), set(G))
+
+    def test_node_id_index_matches_scan(self):
+        """Test indexed substring lookup equals a full scan and follows added nodes."""
+        G = self.builder.builder.build_graph(synthetic_ontology(300, seed=9))
+        index = node_id_index(G)
+        for text in ("syn:E1", "E2", "1", "ontology", "syn:", "missing", "E12"):
+            self.assertEqual(index.find(text), [n for n in G if text in str(n)])
+        self.assertIs(node_id_index(G), index)
+
+        G.add_node("ont:extra:E12")
+        self.assertIs(node_id_index(G), index)
+        self.assertEqual(index.find("E12")[-1], "ont:extra:E12")
+        G.remove_node("ont:extra:E12")
+        self.assertIsNot(node_id_index(G), index)
+
+    def test_node_id_index_after_remove_then_add(self):
+        """Test lookups drop removed nodes even when an addition restores the node count."""
+        G = nx.DiGraph()
+        G.add_nodes_from(["ont:a", "ont:b", "ont:c"])
+        self.assertEqual(node_id_index(G).find("ont"), ["ont:a", "ont:b", "ont:c"])
+
+        G.remove_node("ont:b")
+        G.add_node("zzz")
+        self.assertEqual(node_id_index(G).find("ont"), ["ont:a", "ont:c"])
+        self.assertEqual(node_id_index(G).find("zz"), ["zzz"])
+
+        old = synthetic_ontology(50, seed=2)
+        builder = OntologyGraphBuilder()
+        H = builder.build_graph(old)
+        stale = node_id_index(H)
+        builder.update_graph(H, old, revise_ontology(old))
+        self.assertNotIn('node_id_index', H.graph)
+        self.assertIsNot(node_id_index(H), stale)
+        self.assertEqual(node_id_index(H).find("syn:E3"), [n for n in H if "syn:E3" in str(n)])
+
+    def test_roster_integration_matches_per_agent(self):
+        """Test bulk roster integration equals composing single-agent contexts."""
+        ve_graph = self.builder.build_w4m_framework_graph()
+        ve_graph.add_nodes_from(["ont:icp:Persona", "ont:icp:Segment", "ont:pricing:Plan"])
+        roster = [
+            {"agentId": f"agent:{i}", "w4mAlignment": {"primaryLayers": ["ICP"]},
+             "ontologyBindings": {"CONSUMES": ["ont:icp"], "PRODUCES": [{"ontologyId": "ont:pricing"}],
+                                  "REQUIRES": ["agent:"]}}
+            for i in range(3)
+        ]
+        integration = AgentVEIntegration()
+
+        single = integration.build_agent_ve_context(roster[0], ve_graph)
+        self.assertTrue(single.has_edge("ont:icp:Segment", "agent:0"))
+        self.assertTrue(single.has_edge("agent:0", "ont:pricing:Plan"))
+        self.assertTrue(single.has_edge("agent:0", "agent:0"))  # as the substring scan did
+
+        expected = nx.compose_all([integration.build_agent_ve_context(a, ve_graph) for a in roster])
+        roster_graph = integration.build_roster_ve_context(roster, ve_graph)
+        self.assertEqual(graph_contents(roster_graph)[:2], graph_contents(expected)[:2])
+        self.assertFalse(roster_graph.has_edge("agent:1", "agent:0"))
+
+    def test_layered_contexts_share_ve_graph(self):
+        """Test per-agent layered views equal copied contexts without copying the VE graph."""
+        ve_graph = self.builder.build_w4m_framework_graph()
+        ve_graph.add_edges_from((f"ont:{i % 10}:E{i}", f"ont:{i % 10}:E{i + 1}") for i in range(3000))
+        roster = [
+            {"agentId": f"agent:{i}", "w4mAlignment": {"primaryLayers": ["ICP", "Strategy"]},
+             "ontologyBindings": {"CONSUMES": [f"ont:{i}:E2999"], "PRODUCES": ["layer_1"]}}
+            for i in range(10)
+        ]
+        integration = AgentVEIntegration()
+        node_id_index(ve_graph)
+        before = graph_contents(ve_graph)
+
+        tracemalloc.start()
+        contexts = integration.build_layered_contexts(roster, ve_graph)
+        layered_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        for spec in roster:
+            view = contexts[spec["agentId"]]
+            copied = integration.build_agent_ve_context(spec, ve_graph)
+            self.assertEqual(list(view), list(copied))
+            self.assertEqual(graph_contents(view)[:2], graph_contents(copied)[:2])
+            self.assertTrue(nx.is_frozen(view))
+        self.assertEqual(graph_contents(ve_graph), before)
+
+        tracemalloc.start()
+        full_copy = ve_graph.copy()
+        copy_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        self.assertLess(layered_bytes, copy_bytes / 2)  # ten contexts, well under one copy
+        self.assertEqual(len(full_copy), len(ve_graph))
+
     def test_analyze_value_flow(self):
         """Test value flow analysis."""
         G = self.builder.build_w4m_framework_graph()
@@ -318,9 +1223,323 @@ class TestVEDomainGraphs(unittest.TestCase):
         self.assertEqual(analysis['source'], "Problem Space")
         self.assertEqual(analysis['target'], "Strategy")
         self.assertIn('paths', analysis)
+        self.assertFalse(analysis['paths_truncated'])
         self.assertIn('metrics', analysis)
 
 
+RECIPE_CONTEXT = {
+    "recipe": "https://viridian.app/ontology/vhf/recipe/",
+    "client": "https://viridian.app/ontology/vhf/client/",
+    "recipe:excludesAllergen": {"@type": "@id"},
+    "client:hasAllergen": {"@type": "@id"},
+}
+
+
+class TestRecipeEligibility(unittest.TestCase):
+    """Tests for recipe_eligibility.py"""
+
+    def _load(self, graph):
+        """Instance data through the loader, as from the recipe/persona files."""
+        loader = OntologyLoader(include_instances=True, context=RECIPE_CONTEXT)
+        return loader.parse_ontology({"@context": RECIPE_CONTEXT, "@graph": graph}, "test.jsonld")
+
+    def test_client_eligibility_from_instance_data(self):
+        """Test diets, allergens and themes resolve to the expected recipes."""
+        def recipe(n, diets, free, themes):
+            return {"@id": f"recipe:r-{n}", "@type": ["recipe:Recipe", "Recipe"], "name": f"R{n}",
+                    "recipe:suitableForDietType": diets, "recipe:excludesAllergen": free,
+                    "recipe:belongsToTheme": [{"@id": t} for t in themes]}
+        halal = {"@id": "diet:halal"}
+        data = self._load([
+            recipe(1, [{"@id": "diet:halal", "note": "if halal chicken used"}, {"@id": "diet:anti-inflammatory"}],
+                   ["client:allergen-sesame"], ["theme:Mediterranean"]),
+            recipe(2, [halal, {"@id": "diet:anti-inflammatory"}], ["client:allergen-sesame"], ["theme:HighProtein"]),
+            recipe(3, [halal, {"@id": "diet:anti-inflammatory"}], [], ["theme:Mediterranean"]),
+            recipe(4, [halal], ["client:allergen-sesame"], ["theme:Mediterranean"]),
+            {"@id": "client:tp-003", "@type": ["client:Client", "Patient"],
+             "client:followsDiet": [halal, {"@id": "diet:anti-inflammatory"}],
+             "client:hasAllergen": [{"@id": "client:allergen-sesame"}],
+             "client:prefersTheme": [{"@id": "theme:Mediterranean"}]},
+        ])
+        index = RecipeEligibilityIndex.from_ontology(data)
+        client = client_profiles(data)["client:tp-003"]
+
+        self.assertEqual(index.recipes, ["recipe:r-1", "recipe:r-2", "recipe:r-3", "recipe:r-4"])
+        self.assertEqual(client.diets, ["diet:halal", "diet:anti-inflammatory"])
+        self.assertEqual(index.recipe_ids(index.eligible_for(client)), ["recipe:r-1", "recipe:r-2"])
+        self.assertEqual(index.recipe_ids(index.eligible_for(client, strict=True)), ["recipe:r-2"])
+        self.assertEqual(index.recipe_ids(index.eligible_for(client, require_theme=True)), ["recipe:r-1"])
+        self.assertEqual(index.eligible(diets=["diet:unknown"]), 0)
+        self.assertEqual(index.count(index.eligible()), 4)
+
+    def test_conditions_read_through_health_profile(self):
+        """Test named profile conditions constrain eligibility and blank ones do not."""
+        data = self._load([
+            {"@id": "recipe:r-1", "@type": "recipe:Recipe", "name": "R1",
+             "recipe:suitableForCondition": [{"@id": "condition:t2d"}]},
+            {"@id": "recipe:r-2", "@type": "recipe:Recipe", "name": "R2"},
+            {"@id": "client:tp-001", "@type": ["client:Client", "Patient"],
+             "client:hasProfile": {
+                 "@type": "client:HealthProfile", "bmi": 29.1,
+                 "medicalCondition": [{"@id": "condition:t2d", "name": "Type 2 Diabetes"}]}},
+            {"@id": "client:tp-002", "@type": "client:Client",
+             "client:hasProfile": {
+                 "@type": "client:HealthProfile",
+                 "medicalCondition": [{"@type": "MedicalCondition", "name": "PCOS"}]}},
+        ])
+        index = RecipeEligibilityIndex.from_ontology(data)
+        clients = client_profiles(data)
+
+        self.assertEqual(clients["client:tp-001"].conditions, ["condition:t2d"])
+        self.assertEqual(index.recipe_ids(index.eligible_for(clients["client:tp-001"])), ["recipe:r-1"])
+        self.assertEqual(clients["client:tp-002"].conditions, [])
+        self.assertEqual(index.recipe_ids(index.eligible_for(clients["client:tp-002"])),
+                         ["recipe:r-1", "recipe:r-2"])
+
+    def test_bitsets_match_brute_force(self):
+        """Test bitset queries equal filtering recipe references directly."""
+        ontology = synthetic_recipes(400, seed=3)
+        index = RecipeEligibilityIndex.from_ontology(ontology)
+        refs = {}
+        for rel in ontology.relationships:
+            refs.setdefault(rel.source, set()).add(rel.target)
+
+        profile = ClientProfile("client:x", diets=["diet:d1", "diet:d7"], allergens=["client:allergen-a2"],
+                                themes=["theme:T3", "theme:T5"])
+        expected = [
+            r for r in index.recipes
+            if {"diet:d1", "diet:d7", "client:allergen-a2"} <= refs[r] and refs[r] & {"theme:T3", "theme:T5"}
+        ]
+        bits = index.eligible_for(profile, require_theme=True)
+        self.assertEqual(index.recipe_ids(bits), expected)
+        self.assertEqual(index.count(bits), len(expected))
+        self.assertEqual(index.recipe_ids(bits, limit=2), expected[:2])
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestNutrition(unittest.TestCase):
+    """Tests for nutrition.py"""
+
+    def test_parse_nutrition_and_targets(self):
+        """Test unit strings and nested QuantitativeValues parse to numbers."""
+        self.assertEqual(parse_quantity("380 kcal", "kcal"), 380)
+        self.assertAlmostEqual(parse_quantity("180mg", "g"), 0.18)
+        self.assertTrue(math.isnan(parse_quantity("42g", "kcal")))
+
+        loader = OntologyLoader(include_instances=True, context=RECIPE_CONTEXT)
+        data = loader.parse_ontology({"@context": RECIPE_CONTEXT, "@graph": [
+            {"@id": "recipe:r-1", "@type": "recipe:Recipe",
+             "nutrition": {"@type": "NutritionInformation", "calories": "380 kcal", "proteinContent": "42g",
+                           "sodiumContent": "180mg"}},
+            {"@id": "recipe:r-2", "@type": "recipe:Recipe"},
+            {"@id": "client:tp-1", "@type": "client:Client",
+             "client:hasMacroTarget": {"dailyCalories": 1650, "proteinGrams": {"value": 120, "unitCode": "GRM"},
+                                       "carbsGrams": "140 g", "fatsGrams": 55}},
+            {"@id": "client:tp-2", "@type": "client:Client", "client:hasMacroTarget": None},
+        ]}, "test.jsonld")
+        table = NutritionTable.from_ontology(data)
+
+        self.assertEqual(table.recipes, ["recipe:r-1", "recipe:r-2"])
+        self.assertEqual(table.values[0]['protein'], 42)
+        self.assertEqual(table.values[0]['sodium'], 180)
+        self.assertTrue(math.isnan(table.values[1]['calories']))
+        self.assertEqual(macro_targets(data), {"client:tp-1": MacroTarget(1650, 120, 140, 55)})
+
+    def test_rank_matches_per_recipe_scoring(self):
+        """Test vectorised ranking equals scoring recipes one at a time."""
+        ontology = synthetic_recipes(300, seed=5)
+        table = NutritionTable.from_ontology(ontology)
+        index = RecipeEligibilityIndex.from_ontology(ontology)
+        target = MacroTarget(2100, 150, 210, 70)
+        meal = target.per_meal(3)
+
+        def distance(row):
+            return (abs(row['calories'] - meal.calories) / meal.calories
+                    + abs(row['protein'] - meal.protein) / meal.protein
+                    + 0.5 * abs(row['carbs'] - meal.carbs) / meal.carbs
+                    + 0.5 * abs(row['fat'] - meal.fat) / meal.fat)
+
+        bits = index.eligible(diets=["diet:d2"])
+        allowed = set(index.recipe_ids(bits))
+        expected = sorted((distance(table.values[i]), recipe) for i, recipe in enumerate(table.recipes)
+                          if recipe in allowed)
+        ranked = table.rank(target, k=5, eligible=bitset_mask(bits, len(table)))
+
+        self.assertEqual([recipe for recipe, _ in ranked], [recipe for _, recipe in expected[:5]])
+        for (_, score), (best, _) in zip(ranked, expected):
+            self.assertAlmostEqual(score, best, places=4)
+        self.assertEqual(len(table.rank(target)), len(table))
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestMealPlanner(unittest.TestCase):
+    """Tests for meal_planner.py"""
+
+    def test_plan_meets_constraints_and_best_day(self):
+        """Test plans use eligible recipes within the repeat limit and day 1 is optimal."""
+        ontology = synthetic_recipes(300, seed=7)
+        planner = MealPlanner.from_ontology(ontology, candidates=12, max_repeats=2)
+        profile = ClientProfile("client:x", diets=["diet:d4"], allergens=["client:allergen-a1"])
+        target = MacroTarget(2200, 140, 250, 70)
+        plan = planner.plan(profile, target)
+
+        eligible = set(planner.index.recipe_ids(planner.index.eligible_for(profile)))
+        self.assertTrue(plan.complete)
+        self.assertEqual(len(plan.days), 7)
+        self.assertLessEqual(max(plan.recipe_counts().values()), 2)
+        for day, totals in zip(plan.days, plan.totals):
+            self.assertEqual(len(set(day)), 3)
+            self.assertLessEqual(set(day), eligible)
+            self.assertAlmostEqual(totals[0], sum(planner.table.values[planner.table.position[r]]['calories']
+                                                  for r in day), places=3)
+
+        pools = planner._candidate_pools(profile, target)
+        goal = target.per_meal(1)
+        macros = planner.table.values
+
+        def distance(day):
+            total = {name: sum(float(macros[i][name]) for i in day) for name in ('calories', 'protein', 'carbs', 'fat')}
+            return (abs(total['calories'] - goal.calories) / goal.calories
+                    + abs(total['protein'] - goal.protein) / goal.protein
+                    + 0.5 * abs(total['carbs'] - goal.carbs) / goal.carbs
+                    + 0.5 * abs(total['fat'] - goal.fat) / goal.fat)
+        best = min(distance(day) for day in itertools.product(*pools) if len(set(day)) == 3)
+        first = [planner.table.position[r] for r in plan.days[0]]
+        self.assertAlmostEqual(distance(first), best, places=4)
+
+    def test_coach_plans_in_parallel(self):
+        """Test coach plans follow meal slots, skip clients without targets and match serial planning."""
+        def recipe(n, category, kcal, protein, carbs, fat):
+            return {"@id": f"recipe:r-{n}", "@type": "recipe:Recipe", "recipeCategory": category,
+                    "recipe:excludesAllergen": ["client:allergen-sesame"] if n != 4 else [],
+                    "nutrition": {"calories": f"{kcal} kcal", "proteinContent": f"{protein}g",
+                                  "carbohydrateContent": f"{carbs}g", "fatContent": f"{fat}g"}}
+        loader = OntologyLoader(include_instances=True, context=RECIPE_CONTEXT)
+        recipes = loader.parse_ontology({"@context": RECIPE_CONTEXT, "@graph": [
+            recipe(1, "Breakfast", 400, 30, 40, 12), recipe(2, "Breakfast", 350, 20, 45, 10),
+            recipe(3, "Dinner", 600, 45, 60, 20), recipe(4, "Dinner", 650, 50, 55, 22),
+            recipe(5, "Lunch", 500, 35, 50, 18), recipe(6, "Lunch", 550, 40, 45, 20),
+        ]}, "recipes.jsonld")
+        personas = loader.parse_ontology({"@context": RECIPE_CONTEXT, "@graph": [
+            {"@id": "coach:c", "@type": "coach:Coach", "coach:manages": [{"@id": "client:a"}, {"@id": "client:b"},
+                                                                          {"@id": "client:c"}]},
+            {"@id": "client:a", "@type": "client:Client", "client:hasAllergen": ["client:allergen-sesame"],
+             "client:hasMacroTarget": {"dailyCalories": 1600, "proteinGrams": 120, "carbsGrams": 150, "fatsGrams": 50}},
+            {"@id": "client:b", "@type": "client:Client",
+             "client:hasMacroTarget": {"dailyCalories": 1800, "proteinGrams": 110, "carbsGrams": 160, "fatsGrams": 60}},
+            {"@id": "client:c", "@type": "client:Client"},
+        ]}, "personas.jsonld")
+        planner = MealPlanner.from_ontology(recipes, max_repeats=7)
+
+        plans = plan_for_coach(planner, personas, "coach:c", workers=2)
+        self.assertEqual(list(plans), ["client:a", "client:b"])
+        self.assertEqual(plans, plan_for_coach(planner, personas, "coach:c", workers=1))
+        for day in plans["client:a"].days:
+            self.assertIn(day[0], {"recipe:r-1", "recipe:r-2"})
+            self.assertNotIn("recipe:r-4", day)
+        node = plans["client:a"].to_jsonld()
+        self.assertEqual(node["meal:assignedToClient"], "client:a")
+        self.assertEqual(len(node["hasPart"]), 7)
+        self.assertIn("meal:containsRecipe", node["hasPart"][0]["hasPart"][0])
+
+
+@unittest.skipUnless(NUMPY_AVAILABLE, "numpy not installed")
+class TestRecipeSubstitution(unittest.TestCase):
+    """Tests for recipe_substitution.py"""
+
+    def test_alternatives_match_brute_force(self):
+        """Test eligible alternatives equal a full scan, with explicit substitutes first."""
+        ontology = synthetic_recipes(500, seed=11)
+        ontology.relationships.append(
+            Relationship("sub", "recipe:substitutableWith", "recipe:syn-40", "recipe:syn-3", "", "")
+        )
+        subs = SubstitutionIndex.from_ontology(ontology, k=4)
+        profile = ClientProfile("client:x", diets=["diet:d0"], allergens=["client:allergen-a5"])
+        eligible = set(subs.index.recipe_ids(subs.index.eligible_for(profile)))
+
+        for recipe in ("recipe:syn-3", "recipe:syn-17"):
+            i = subs.table.position[recipe]
+            scan = sorted(
+                math.dist(subs.vectors[j], subs.vectors[i])
+                for j, other in enumerate(subs.table.recipes) if other in eligible and j != i
+            )
+            found = subs.alternatives(recipe, profile, k=8)
+            self.assertEqual(len(found), 8)
+            self.assertLessEqual({r for r, _, _ in found}, eligible)
+            nearest = [d for _, d, explicit in found if not explicit]
+            for d, expected in zip(nearest, scan):
+                self.assertAlmostEqual(d, expected, places=4)
+
+        found = subs.alternatives("recipe:syn-3", k=3)
+        self.assertEqual(found[0][0], "recipe:syn-40")
+        self.assertTrue(found[0][2])
+        self.assertEqual(subs.alternatives("recipe:syn-3", eligible=0), [])
+
+    @unittest.skipUnless(SCIPY_AVAILABLE, "scipy not installed")
+    def test_backends_agree(self):
+        """Test the k-d tree and brute-force neighbour tables agree."""
+        ontology = synthetic_recipes(300, seed=12)
+        kdtree = SubstitutionIndex.from_ontology(ontology, backend='kdtree')
+        brute = SubstitutionIndex(kdtree.index, kdtree.table, backend='brute')
+        for a, b in zip(kdtree.distances.ravel().tolist(), brute.distances.ravel().tolist()):
+            self.assertAlmostEqual(a, b, places=4)
+        self.assertEqual(kdtree.neighbours.shape, (300, 16))
+
+
+class TestRelationIndex(unittest.TestCase):
+    """Tests for relation_index.py"""
+
+    def _scan(self, G):
+        """Forward and reverse adjacency per label from an edge scan."""
+        forward, reverse = {}, {}
+        for u, v, label in G.edges(data='label'):
+            forward.setdefault((label, u), []).append(v)
+            reverse.setdefault((label, v), []).append(u)
+        return forward, reverse
+
+    def test_queries_match_edge_scan(self):
+        """Test targets/sources equal filtering G.edges by label, for every node and predicate."""
+        G = OntologyGraphBuilder(index_relations=True).build_graph(synthetic_ontology(300, seed=4))
+        index = G.graph['relation_index']
+        self.assertIsInstance(index, RelationIndex)
+        self.assertIs(relation_index(G), index)
+
+        forward, reverse = self._scan(G)
+        self.assertEqual(set(index.predicates()), {label for label, _ in forward})
+        for label in index.predicates():
+            for node in G:
+                self.assertEqual(set(index.targets(label, node)), set(forward.get((label, node), ())))
+                self.assertEqual(set(index.sources(label, node)), set(reverse.get((label, node), ())))
+                self.assertEqual(index.degree(label, node, reverse=True), len(reverse.get((label, node), ())))
+            self.assertEqual(sorted(index.edges(label)),
+                             sorted((u, v) for u, v, d in G.edges(data='label') if d == label))
+        self.assertEqual(index.targets('unknown', 'syn:E1'), [])
+        self.assertEqual(index.sources('subClassOf', 'missing'), [])
+
+    def test_index_follows_graph_updates(self):
+        """Test the index is rebuilt after update_graph, reattached after pickling, and not stored by views."""
+        builder = OntologyGraphBuilder(index_relations=True)
+        old = synthetic_ontology(200, seed=5)
+        relabelled = replace(old, relationships=[replace(old.relationships[0], label="renamedLink"),
+                                                 *old.relationships[1:]])
+        G = builder.build_graph(old)
+        before = relation_index(G)
+        builder.update_graph(G, old, relabelled)  # same node and edge counts
+        u, v = old.relationships[0].source, old.relationships[0].target
+
+        self.assertIsNot(relation_index(G), before)
+        self.assertIn(v, relation_index(G).targets("renamedLink", u))
+        builder.update_graph(G, relabelled, revise_ontology(relabelled))
+        self.assertEqual(relation_index(G).size, (len(G), G.number_of_edges()))
+        self.assertEqual(relation_index(G).sources("relatesTo", "ext:Elsewhere"), ["syn:New"])
+
+        H = pickle.loads(pickle.dumps(G))
+        self.assertIs(relation_index(H), H.graph['relation_index'])
+        view = G.subgraph(list(G)[:50])
+        self.assertIsNot(relation_index(view), G.graph['relation_index'])
+        self.assertEqual(relation_index(view).size, (len(view), view.number_of_edges()))
+
+
 class TestIntegration(unittest.TestCase):
     """Integration tests across modules."""
 
@@ -376,9 +1595,19 @@ def run_tests():
 
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestOntologyLoader))
+    suite.addTests(loader.loadTestsFromTestCase(TestOntologyCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestOntologyStore))
     suite.addTests(loader.loadTestsFromTestCase(TestGraphBuilder))
     suite.addTests(loader.loadTestsFromTestCase(TestVisualiser))
+    suite.addTests(loader.loadTestsFromTestCase(TestLayoutEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestGraphExport))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchRender))
     suite.addTests(loader.loadTestsFromTestCase(TestVEDomainGraphs))
+    suite.addTests(loader.loadTestsFromTestCase(TestRecipeEligibility))
+    suite.addTests(loader.loadTestsFromTestCase(TestNutrition))
+    suite.addTests(loader.loadTestsFromTestCase(TestMealPlanner))
+    suite.addTests(loader.loadTestsFromTestCase(TestRecipeSubstitution))
+    suite.addTests(loader.loadTestsFromTestCase(TestRelationIndex))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
 
     # Run with verbosity
@@ -5,18 +5,24 @@ Value Engineering specific graph templates and analysis.
 Features:
 - W4M 8-layer business framework
 - Value chain path analysis
-- Agent context integration
+- Agent context integration (single agent or whole roster, indexed binding lookup)
+- Per-agent contexts as layered views over one shared VE graph
 - Cross-domain relationship mapping
 - VE metric tracking
 """
 
+import time
 import networkx as nx
-from typing import Dict, List, Any, Optional, Tuple
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 from dataclasses import dataclass, field
 
 from ontology_loader import OntologyLoader, Ontology
-from graph_builder import OntologyGraphBuilder, get_graph_stats
+from graph_builder import OntologyGraphBuilder, GraphDelta, get_graph_stats
+from graph_metrics import BottleneckAnalyzer, default_bottleneck_analyzer
+from node_id_index import NodeIdIndex, node_id_index
+from graph_layers import layered_view
 
 
 @dataclass
@@ -71,11 +77,18 @@ class W4MFramework:
 class VEDomainGraphBuilder:
     """Build VE-specific domain graphs."""
 
-    def __init__(self):
-        """Initialize VE domain graph builder."""
+    def __init__(self, bottlenecks: Optional[BottleneckAnalyzer] = None):
+        """
+        Initialize VE domain graph builder.
+
+        Args:
+            bottlenecks: Betweenness engine for analyze_value_flow; pass e.g.
+                BottleneckAnalyzer(k=200, seed=0) for large merged graphs
+        """
         self.framework = W4MFramework()
         self.loader = OntologyLoader()
         self.builder = OntologyGraphBuilder()
+        self.bottlenecks = bottlenecks or default_bottleneck_analyzer()
 
     def build_w4m_framework_graph(self) -> nx.DiGraph:
         """
@@ -171,6 +184,30 @@ class VEDomainGraphBuilder:
 
         return G
 
+    def update_ve_value_chain(self, G: nx.DiGraph, layer_name: str, delta: GraphDelta) -> None:
+        """
+        Patch a value chain graph after one layer's ontology changed.
+
+        Args:
+            G: Graph from build_ve_value_chain
+            layer_name: Key the ontology was passed under in layer_ontologies
+            delta: Changes from OntologyGraphBuilder.diff(old, new)
+        """
+        layer = self.framework.get_layer(layer_name)
+        if not layer:
+            return
+
+        delta.apply(G, node_map=lambda node: f"{layer_name}_{node}")
+
+        # New ontology nodes join the layer, as in build_ve_value_chain
+        layer_node = f"layer_{layer.index}"
+        G.add_edges_from(
+            ((layer_node, f"{layer_name}_{node}") for node in delta.nodes_added),
+            label='contains',
+            edge_type='layer_content',
+            color='#90A4AE'
+        )
+
     def build_vsom_graph(self, vsom_ontology: Ontology) -> nx.DiGraph:
         """
         Build VSOM (Vision-Strategy-Objectives-Metrics) specific graph.
@@ -256,7 +293,11 @@ class VEDomainGraphBuilder:
         self,
         G: nx.DiGraph,
         source_layer: int = 0,
-        target_layer: int = 7
+        target_layer: int = 7,
+        max_paths: int = 5,
+        path_order: str = 'first',
+        weight: str = 'weight',
+        time_budget: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Analyze value flow through the W4M layers.
@@ -265,6 +306,10 @@ class VEDomainGraphBuilder:
             G: Value chain graph
             source_layer: Starting layer index
             target_layer: Ending layer index
+            max_paths: Number of paths to report
+            path_order: 'first' (DFS order) or 'shortest' (by weight)
+            weight: Edge attribute used by 'shortest'
+            time_budget: Seconds allowed for path search (None for no limit)
 
         Returns:
             Analysis results including paths and metrics
@@ -276,24 +321,25 @@ class VEDomainGraphBuilder:
             'source': self.framework.LAYERS[source_layer].name,
             'target': self.framework.LAYERS[target_layer].name,
             'paths': [],
+            'paths_truncated': False,
             'bottlenecks': [],
             'metrics': {}
         }
 
-        # Find all paths
-        try:
-            all_paths = list(nx.all_simple_paths(G, source, target, cutoff=10))
-            analysis['paths'] = [
-                [G.nodes[n].get('label', n) for n in path]
-                for path in all_paths[:5]
-            ]
-        except nx.NetworkXNoPath:
-            pass
+        # Find the first/shortest paths without enumerating them all
+        search = find_value_paths(
+            G, source, target,
+            k=max_paths, order=path_order, weight=weight, time_budget=time_budget
+        )
+        analysis['paths'] = [
+            [G.nodes[n].get('label', n) for n in path]
+            for path in search.paths
+        ]
+        analysis['paths_truncated'] = search.truncated
 
-        # Identify bottlenecks (nodes with high betweenness)
+        # Identify bottlenecks (nodes with high betweenness, cached per graph version)
         if G.number_of_nodes() > 2:
-            betweenness = nx.betweenness_centrality(G)
-            top_bottlenecks = sorted(betweenness.items(), key=lambda x: x[1], reverse=True)[:5]
+            top_bottlenecks = self.bottlenecks.top_nodes(G, 5)
             analysis['bottlenecks'] = [
                 {'node': G.nodes[n].get('label', n), 'score': score}
                 for n, score in top_bottlenecks
@@ -312,6 +358,188 @@ class VEDomainGraphBuilder:
         return analysis
 
 
+@dataclass
+class PathSearchResult:
+    """Paths found by find_value_paths."""
+    paths: List[List[Any]]
+    truncated: bool = False
+    timed_out: bool = False
+
+
+def iter_value_paths(
+    G: nx.DiGraph,
+    source: Any,
+    target: Any,
+    cutoff: int = 10,
+    order: str = 'first',
+    weight: str = 'weight',
+    deadline: Optional[float] = None
+) -> Iterator[List[Any]]:
+    """
+    Lazily yield simple paths from source to target.
+
+    Args:
+        G: Graph to search
+        source: Start node
+        target: End node
+        cutoff: Maximum path length in edges
+        order: 'first' for depth-first order (as nx.all_simple_paths),
+            'shortest' for increasing total weight
+        weight: Edge attribute used by 'shortest' (missing weights count as
+            1; None for hop count)
+        deadline: time.perf_counter() value at which to stop yielding
+
+    Yields:
+        Paths as node lists
+    """
+    for node in (source, target):
+        if node not in G:
+            raise nx.NodeNotFound(f"Node {node} not in graph")
+
+    # Hops to the target: prunes branches that cannot reach it within cutoff
+    distance = nx.single_target_shortest_path_length(G, target, cutoff=cutoff)
+    if source not in distance or source == target:
+        return
+
+    if order == 'first':
+        yield from _dfs_simple_paths(G, source, target, cutoff, distance, deadline)
+    elif order == 'shortest':
+        if weight is None:
+            # Yen's algorithm on the part of the graph that can reach the
+            # target; unweighted paths come in non-decreasing hop order
+            H = G.subgraph(distance) if len(distance) < len(G) else G
+            for path in nx.shortest_simple_paths(H, source, target):
+                if len(path) - 1 > cutoff or (deadline is not None and time.perf_counter() > deadline):
+                    return
+                yield path
+        else:
+            yield from _hop_limited_shortest_paths(G, source, target, cutoff, distance, weight, deadline)
+    else:
+        raise ValueError(f"Unknown path order: {order}")
+
+
+def find_value_paths(
+    G: nx.DiGraph,
+    source: Any,
+    target: Any,
+    k: int = 5,
+    cutoff: int = 10,
+    order: str = 'first',
+    weight: str = 'weight',
+    time_budget: Optional[float] = None
+) -> PathSearchResult:
+    """
+    Find up to k paths without materialising the full path set.
+
+    Args:
+        G: Graph to search
+        source: Start node
+        target: End node
+        k: Maximum number of paths
+        cutoff: Maximum path length in edges
+        order: 'first' or 'shortest' (see iter_value_paths)
+        weight: Edge attribute used by 'shortest'
+        time_budget: Seconds allowed for the search (None for no limit)
+
+    Returns:
+        PathSearchResult; truncated is True when more paths exist or the
+        time budget ran out before the search finished
+    """
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    paths = iter_value_paths(G, source, target, cutoff, order, weight, deadline)
+
+    found = list(islice(paths, k))
+    # Look one path ahead to tell "exactly k" from "more than k"
+    more = len(found) == k and next(paths, None) is not None
+    timed_out = deadline is not None and time.perf_counter() > deadline
+
+    return PathSearchResult(paths=found, truncated=more or timed_out, timed_out=timed_out)
+
+
+_SINK = object()
+
+
+def _hop_limited_shortest_paths(
+    G: nx.DiGraph,
+    source: Any,
+    target: Any,
+    cutoff: int,
+    distance: Dict[Any, int],
+    weight: str,
+    deadline: Optional[float]
+) -> Iterator[List[Any]]:
+    """
+    Simple paths of at most cutoff edges in increasing total weight.
+
+    Weighted paths do not come in hop order, so Yen's algorithm runs on a
+    layered graph of (node, hops) states instead of G: it only contains
+    walks within cutoff, which bounds the search. Walks revisiting a node
+    are skipped.
+    """
+    L = nx.DiGraph()
+    frontier = [source]
+    for hops in range(cutoff):
+        next_frontier = set()
+        for u in frontier:
+            if u == target:
+                continue
+            for v, data in G[u].items():
+                if v in distance and hops + 1 + distance[v] <= cutoff:
+                    L.add_edge((u, hops), (v, hops + 1), weight=data.get(weight, 1))
+                    next_frontier.add(v)
+        frontier = next_frontier
+    for state in [state for state in L if state[0] == target]:
+        L.add_edge(state, _SINK, weight=0)
+
+    if _SINK not in L:
+        return
+    for walk in nx.shortest_simple_paths(L, (source, 0), _SINK, weight='weight'):
+        if deadline is not None and time.perf_counter() > deadline:
+            return
+        path = [node for node, _ in walk[:-1]]
+        if len(set(path)) == len(path):
+            yield path
+
+
+def _dfs_simple_paths(
+    G: nx.DiGraph,
+    source: Any,
+    target: Any,
+    cutoff: int,
+    distance: Dict[Any, int],
+    deadline: Optional[float]
+) -> Iterator[List[Any]]:
+    """Depth-first simple paths, skipping nodes too far from the target."""
+    path = [source]
+    on_path = {source}
+    stack = [iter(G[source])]
+    steps = 0
+
+    while stack:
+        child = next(stack[-1], _EXHAUSTED)
+        if child is _EXHAUSTED:
+            stack.pop()
+            on_path.discard(path.pop())
+            continue
+
+        if child in on_path or len(path) + distance.get(child, cutoff + 1) > cutoff:
+            continue
+
+        steps += 1
+        if deadline is not None and not steps % 1024 and time.perf_counter() > deadline:
+            return
+
+        if child == target:
+            yield path + [child]
+        else:
+            path.append(child)
+            on_path.add(child)
+            stack.append(iter(G[child]))
+
+
+_EXHAUSTED = object()
+
+
 class AgentVEIntegration:
     """Integrate agent context with VE domain graphs."""
 
@@ -332,10 +560,93 @@ class AgentVEIntegration:
             ve_graph: VE domain graph
 
         Returns:
-            Combined agent-VE graph
+            Combined agent-VE graph (a modifiable copy; see
+            build_layered_contexts to avoid copying ve_graph)
         """
         G = ve_graph.copy()
+        self._add_agent(G, agent_spec, node_id_index(ve_graph))
+        return G
+
+    def build_agent_ve_delta(
+        self,
+        agent_spec: Dict[str, Any],
+        ve_graph: nx.DiGraph
+    ) -> nx.DiGraph:
+        """
+        Agent-specific part of build_agent_ve_context only.
+
+        Holds the agent node, its layer and binding edges, and the VE nodes
+        those edges touch (without their attributes).
+
+        Args:
+            agent_spec: Agent specification with W4M alignment
+            ve_graph: VE domain graph
 
+        Returns:
+            Delta graph to layer over ve_graph
+        """
+        delta = nx.DiGraph()
+        self._add_agent(delta, agent_spec, node_id_index(ve_graph))
+        return delta
+
+    def build_layered_contexts(
+        self,
+        agent_specs: Iterable[Dict[str, Any]],
+        ve_graph: nx.DiGraph
+    ) -> Dict[str, nx.DiGraph]:
+        """
+        Context graph per agent, sharing ve_graph instead of copying it.
+
+        Each context is a read-only layered view (see graph_layers) of
+        ve_graph plus the agent's delta, equal in content to
+        build_agent_ve_context. Memory grows with the agent-specific nodes
+        and edges only. ve_graph should not be modified while the views
+        are in use (changes show through).
+
+        Args:
+            agent_specs: Agent specifications with W4M alignment
+            ve_graph: Shared VE domain graph
+
+        Returns:
+            Dict mapping agent IDs to context views
+        """
+        return {
+            agent_spec.get('agentId', 'agent'): layered_view(ve_graph, self.build_agent_ve_delta(agent_spec, ve_graph))
+            for agent_spec in agent_specs
+        }
+
+    def build_roster_ve_context(
+        self,
+        agent_specs: Iterable[Dict[str, Any]],
+        ve_graph: nx.DiGraph
+    ) -> nx.DiGraph:
+        """
+        Build one graph relating a whole agent roster to VE layers.
+
+        The VE graph is copied once and its node id index built once;
+        each distinct ontology reference is resolved once for all agents.
+        The result equals composing build_agent_ve_context for every agent.
+
+        Args:
+            agent_specs: Agent specifications with W4M alignment
+            ve_graph: VE domain graph
+
+        Returns:
+            Combined roster-VE graph
+        """
+        G = ve_graph.copy()
+        index = node_id_index(ve_graph)
+        for agent_spec in agent_specs:
+            self._add_agent(G, agent_spec, index)
+        return G
+
+    def _add_agent(self, G: nx.DiGraph, agent_spec: Dict[str, Any], index: NodeIdIndex) -> None:
+        """
+        Add one agent, its layer edges and its ontology binding edges to G.
+
+        Bindings match VE graph nodes whose id contains the ontology id
+        (looked up in index) plus this agent's own new nodes.
+        """
         # Extract agent info
         agent_id = agent_spec.get('agentId', 'agent')
         agent_name = agent_spec.get('agentName', agent_id)
@@ -349,6 +660,7 @@ class AgentVEIntegration:
             color='#E91E63',
             size=55
         )
+        own_nodes = [agent_id]
 
         # Connect agent to relevant W4M layers
         primary_layers = w4m_alignment.get('primaryLayers', [])
@@ -356,6 +668,7 @@ class AgentVEIntegration:
             layer = self.ve_builder.framework.get_layer(layer_name)
             if layer:
                 layer_node = f"layer_{layer.index}"
+                own_nodes.append(layer_node)
                 G.add_edge(
                     agent_id,
                     layer_node,
@@ -364,6 +677,7 @@ class AgentVEIntegration:
                     weight=1.0,
                     color='#E91E63'
                 )
+        own_nodes = [node for node in dict.fromkeys(own_nodes) if node not in index]
 
         # Add ontology bindings if present
         bindings = agent_spec.get('ontologyBindings', {})
@@ -371,8 +685,8 @@ class AgentVEIntegration:
             for ont_ref in bindings.get(binding_type, []):
                 ont_id = ont_ref if isinstance(ont_ref, str) else ont_ref.get('ontologyId', '')
                 if ont_id:
-                    # Check if ontology node exists in graph
-                    matching_nodes = [n for n in G.nodes() if ont_id in str(n)]
+                    # Ontology nodes whose id contains the reference
+                    matching_nodes = index.find(ont_id) + [n for n in own_nodes if ont_id in str(n)]
                     for node in matching_nodes:
                         edge_dir = (agent_id, node) if binding_type == 'PRODUCES' else (node, agent_id)
                         G.add_edge(
@@ -383,8 +697,6 @@ class AgentVEIntegration:
                             color='#9C27B0'
                         )
 
-        return G
-
 
 def build_ve_framework() -> nx.DiGraph:
     """Convenience function to build W4M framework graph."""
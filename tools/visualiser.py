@@ -6,14 +6,23 @@ Features:
 - PyVis interactive HTML graphs
 - Matplotlib static exports
 - Domain filtering
-- Value chain path highlighting
-- Export to PNG/SVG
+- Value chain path highlighting (style overlays merged at draw time, no graph copy)
+- Export to PNG/SVG (collection-based drawing with label culling for large graphs)
+- Clustered (level-of-detail) HTML for large graphs, expanded on demand
 """
 
+import json
+import math
 import networkx as nx
 from typing import Dict, List, Any, Optional, Set
 from pathlib import Path
 
+from layout_engine import LayoutEngine
+from graph_lod import LOD_NODE_THRESHOLD, MAX_CLUSTERS, group_nodes, summarize_groups
+from graph_export import NODE_SIZES, NODE_SHAPES, EDGE_WIDTHS, edge_width, write_vis_html
+from domain_index import DomainClassifier, DomainRule, domain_index
+from style_overlay import HIGHLIGHT_COLOR, StyleOverlay, iter_styled_edges, iter_styled_nodes
+
 try:
     from pyvis.network import Network
     PYVIS_AVAILABLE = True
@@ -21,8 +30,11 @@ except ImportError:
     PYVIS_AVAILABLE = False
 
 try:
+    import numpy as np
     import matplotlib.pyplot as plt
     import matplotlib.patches as mpatches
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.colors import to_rgba_array
     MATPLOTLIB_AVAILABLE = True
 except ImportError:
     MATPLOTLIB_AVAILABLE = False
@@ -45,17 +57,76 @@ class OntologyVisualiser:
         'Framework': '#FF9800', # Orange - Frameworks
     }
 
-    def __init__(self, height: str = "800px", width: str = "100%"):
-        """Initialize visualiser with default dimensions."""
+    # Pixel extent of precomputed layouts in PyVis output
+    PYVIS_LAYOUT_SCALE = 1000
+
+    # render_matplotlib draws with collections and culls labels above this size
+    FAST_RENDER_NODES = 500
+    LABELS_PER_SQ_INCH = 1.0
+    EDGE_LABELS_PER_SQ_INCH = 0.25
+    # Node/edge collections are embedded as images in SVG/PDF above this many elements
+    RASTERIZE_ELEMENTS = 20000
+
+    # Pixel spacing of members around an expanded cluster
+    CLUSTER_MEMBER_SPACING = 40
+
+    # Expand-on-demand handler injected into clustered HTML (uses PyVis globals)
+    LOD_SCRIPT = """
+    <script type="text/javascript">
+      var vhfLod = {dir: __DATA_DIR__, expanded: {}, loading: {}};
+      function vhfLodEndpoint(node, group) {
+        return vhfLod.expanded[group] ? node : "cluster:" + group;
+      }
+      function vhfLodLoaded(group, data) {
+        var cluster = "cluster:" + group;
+        edges.remove(edges.getIds({filter: function (e) { return e.from === cluster || e.to === cluster; }}));
+        nodes.remove(cluster);
+        vhfLod.expanded[group] = true;
+        nodes.add(data.nodes);
+        data.edges.forEach(function (e) {
+          var from = vhfLodEndpoint(e.from, e.fromGroup), to = vhfLodEndpoint(e.to, e.toGroup);
+          var id = from + "->" + to;
+          if (from === to || edges.get(id) !== null) { return; }
+          edges.add(Object.assign({}, e, {id: id, from: from, to: to, arrows: "to"}));
+        });
+      }
+      network.on("doubleClick", function (params) {
+        params.nodes.forEach(function (id) {
+          if (String(id).indexOf("cluster:") !== 0) { return; }
+          var group = String(id).slice(8);
+          if (vhfLod.loading[group]) { return; }
+          vhfLod.loading[group] = true;
+          var script = document.createElement("script");
+          script.src = vhfLod.dir + "/" + group + ".js";
+          document.body.appendChild(script);
+        });
+      });
+    </script>
+"""
+
+    def __init__(
+        self,
+        height: str = "800px",
+        width: str = "100%",
+        layout_engine: Optional[LayoutEngine] = None,
+        domain_classifier: Optional[DomainClassifier] = None
+    ):
+        """Initialize visualiser with default dimensions, a (caching) layout engine and domain rules."""
         self.height = height
         self.width = width
+        self.layout_engine = layout_engine or LayoutEngine()
+        self.domain_classifier = domain_classifier or DomainClassifier()
 
     def render_pyvis(
         self,
         G: nx.DiGraph,
         output_path: Optional[str] = None,
         physics: bool = True,
-        notebook: bool = False
+        notebook: bool = False,
+        layout: Optional[str] = None,
+        cluster_by: Optional[str] = 'auto',
+        max_clusters: int = MAX_CLUSTERS,
+        overlay: Optional[StyleOverlay] = None
     ) -> Optional[str]:
         """
         Render graph as interactive HTML using PyVis.
@@ -65,6 +136,14 @@ class OntologyVisualiser:
             output_path: Path for HTML output (default: graph_name.html)
             physics: Enable physics simulation
             notebook: Render inline in Jupyter
+            layout: Precompute positions with this layout (see
+                render_matplotlib) and embed them with physics off, so the
+                browser does not simulate on load
+            cluster_by: Level-of-detail grouping (layer, namespace,
+                community); 'auto' picks one for graphs above
+                LOD_NODE_THRESHOLD nodes, None never clusters
+            max_clusters: Maximum number of super-nodes
+            overlay: Styles (e.g. from path_overlay) drawn over the graph's own
 
         Returns:
             Path to generated HTML file
@@ -72,6 +151,9 @@ class OntologyVisualiser:
         if not PYVIS_AVAILABLE:
             raise ImportError("PyVis not installed. Run: pip install pyvis")
 
+        if cluster_by and (cluster_by != 'auto' or G.number_of_nodes() > LOD_NODE_THRESHOLD):
+            return self._render_pyvis_clustered(G, output_path, notebook, layout, cluster_by, max_clusters, overlay)
+
         net = Network(
             height=self.height,
             width=self.width,
@@ -79,6 +161,16 @@ class OntologyVisualiser:
             notebook=notebook
         )
 
+        # Precomputed coordinates (vis.js y axis points down)
+        coords = {}
+        if layout:
+            scale = self.PYVIS_LAYOUT_SCALE * max(1.0, (G.number_of_nodes() / 100) ** 0.5)
+            coords = {
+                node: {'x': x * scale, 'y': -y * scale, 'physics': False}
+                for node, (x, y) in self.layout_engine.compute(G, layout).items()
+            }
+            physics = False
+
         # Configure physics
         if physics:
             net.barnes_hut(gravity=-3000, spring_length=200)
@@ -86,45 +178,16 @@ class OntologyVisualiser:
             net.toggle_physics(False)
 
         # Add nodes with styling
-        for node, data in G.nodes(data=True):
-            label = data.get('label', str(node))
-            title = self._build_node_tooltip(node, data)
-            color = data.get('color', '#607D8B')
-            node_type = data.get('node_type', 'entity')
-
-            size = self._get_node_size(node_type)
-            shape = self._get_node_shape(node_type)
-
-            net.add_node(
-                str(node),
-                label=label,
-                title=title,
-                color=color,
-                size=size,
-                shape=shape
-            )
+        for node, data in iter_styled_nodes(G, overlay):
+            net.add_node(str(node), **self._pyvis_node_options(node, data), **coords.get(node, {}))
 
         # Add edges with styling
-        for u, v, data in G.edges(data=True):
-            label = data.get('label', '')
-            title = self._build_edge_tooltip(data)
-            color = data.get('color', '#666666')
-            width = self._get_edge_width(data.get('edge_type', 'relationship'))
-
-            net.add_edge(
-                str(u),
-                str(v),
-                label=label,
-                title=title,
-                color=color,
-                width=width,
-                arrows='to'
-            )
+        for u, v, data in iter_styled_edges(G, overlay):
+            net.add_edge(str(u), str(v), **self._pyvis_edge_options(data))
 
         # Set output path
         if output_path is None:
-            name = G.graph.get('name', 'ontology').replace(' ', '_').lower()
-            output_path = f"{name}_graph.html"
+            output_path = self._default_html_path(G)
 
         # Generate HTML
         if notebook:
@@ -133,6 +196,161 @@ class OntologyVisualiser:
             net.save_graph(output_path)
             return output_path
 
+    def export_html(
+        self,
+        G: nx.DiGraph,
+        output_path: Optional[str] = None,
+        layout: Optional[str] = None,
+        overlay: Optional[StyleOverlay] = None
+    ) -> str:
+        """
+        Write interactive HTML without building a PyVis Network.
+
+        Nodes and edges are streamed to the file in chunks (see
+        graph_export), so memory use does not grow with the graph.
+
+        Args:
+            G: NetworkX graph
+            output_path: Path for HTML output (default: graph_name.html)
+            layout: Embed positions from this layout (physics off)
+            overlay: Styles drawn over the graph's own
+
+        Returns:
+            Path to generated HTML file
+        """
+        positions = self.layout_engine.compute(G, layout) if layout else None
+        return write_vis_html(
+            G, output_path or self._default_html_path(G), positions,
+            height=self.height, width=self.width, overlay=overlay
+        )
+
+    def _render_pyvis_clustered(
+        self,
+        G: nx.DiGraph,
+        output_path: Optional[str],
+        notebook: bool,
+        layout: Optional[str],
+        cluster_by: str,
+        max_clusters: int,
+        overlay: Optional[StyleOverlay] = None
+    ) -> Optional[str]:
+        """
+        Render one super-node per group; members load when a cluster is double-clicked.
+
+        Each group's members and incident edges are written to
+        <output>_lod/<n>.js next to the HTML and loaded through a script
+        tag (works from file://), so the initial page only holds the
+        summary graph.
+        """
+        groups = group_nodes(G, cluster_by, max_clusters)
+        summary = summarize_groups(G, groups)
+        group_ids = {group: i for i, group in enumerate(summary)}
+
+        if output_path is None:
+            output_path = self._default_html_path(G)
+        data_dir = Path(output_path).with_name(f"{Path(output_path).stem}_lod")
+        data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Super-node positions, members on a sunflower spiral around them
+        scale = self.PYVIS_LAYOUT_SCALE * max(1.0, (G.number_of_nodes() / 100) ** 0.5)
+        centres = {
+            group: (x * scale, -y * scale)
+            for group, (x, y) in self.layout_engine.compute(summary, layout or 'spring').items()
+        }
+
+        net = Network(height=self.height, width=self.width, directed=True, notebook=notebook)
+        net.toggle_physics(False)
+        for group, data in summary.nodes(data=True):
+            x, y = centres[group]
+            net.add_node(
+                f"cluster:{group_ids[group]}",
+                label=f"{group} ({data['members']:,})",
+                title=f"{group}\nNodes: {data['members']:,}\nDouble-click to expand",
+                color=data['color'],
+                size=15 + 5 * math.log2(data['members'] + 1),
+                shape='dot',
+                x=x, y=y, physics=False
+            )
+        for u, v, data in summary.edges(data=True):
+            source, target = f"cluster:{group_ids[u]}", f"cluster:{group_ids[v]}"
+            net.add_edge(
+                source, target,
+                id=f"{source}->{target}",
+                title=f"{data['weight']:,} edges",
+                width=1 + math.log2(data['weight']),
+                color='#999999',
+                arrows='to'
+            )
+
+        # Expand data: member nodes and every edge touching the group
+        payloads = {group: {'nodes': [], 'edges': []} for group in summary}
+        placed = dict.fromkeys(summary, 0)
+        golden_angle = math.pi * (3 - math.sqrt(5))
+        for node, data in iter_styled_nodes(G, overlay):
+            group = groups[node]
+            k = placed[group]
+            placed[group] += 1
+            radius = self.CLUSTER_MEMBER_SPACING * math.sqrt(k + 0.5)
+            x, y = centres[group]
+            payloads[group]['nodes'].append({
+                'id': str(node),
+                **self._pyvis_node_options(node, data),
+                'x': x + radius * math.cos(k * golden_angle),
+                'y': y + radius * math.sin(k * golden_angle),
+                'physics': False
+            })
+        for u, v, data in iter_styled_edges(G, overlay):
+            edge = {
+                'from': str(u), 'to': str(v),
+                'fromGroup': group_ids[groups[u]], 'toGroup': group_ids[groups[v]],
+                **self._pyvis_edge_options(data)
+            }
+            payloads[groups[u]]['edges'].append(edge)
+            if groups[v] != groups[u]:
+                payloads[groups[v]]['edges'].append(edge)
+
+        for group, payload in payloads.items():
+            with open(data_dir / f"{group_ids[group]}.js", 'w', encoding='utf-8') as f:
+                f.write(f"vhfLodLoaded({group_ids[group]}, {json.dumps(payload)});\n")
+        del payloads
+
+        net.save_graph(output_path)
+        script = self.LOD_SCRIPT.replace('__DATA_DIR__', json.dumps(data_dir.name))
+        html = Path(output_path).read_text(encoding='utf-8')
+        head, sep, tail = html.rpartition('</body>')
+        Path(output_path).write_text(head + script + sep + tail if sep else html + script, encoding='utf-8')
+
+        if notebook:
+            from IPython.display import IFrame
+            return IFrame(output_path, width=self.width, height=self.height)
+        return output_path
+
+    def _default_html_path(self, G: nx.DiGraph) -> str:
+        """Default HTML output path from the graph name."""
+        name = G.graph.get('name', 'ontology').replace(' ', '_').lower()
+        return f"{name}_graph.html"
+
+    def _pyvis_node_options(self, node: Any, data: Dict) -> Dict[str, Any]:
+        """PyVis/vis.js styling options for a node."""
+        node_type = data.get('node_type', 'entity')
+        return {
+            'label': data.get('label', str(node)),
+            'title': self._build_node_tooltip(node, data),
+            'color': data.get('color', '#607D8B'),
+            'size': self._get_node_size(node_type),
+            'shape': self._get_node_shape(node_type)
+        }
+
+    def _pyvis_edge_options(self, data: Dict) -> Dict[str, Any]:
+        """PyVis/vis.js styling options for an edge."""
+        return {
+            'label': data.get('label', ''),
+            'title': self._build_edge_tooltip(data),
+            'color': data.get('color', '#666666'),
+            'width': edge_width(data),
+            'arrows': 'to'
+        }
+
     def render_matplotlib(
         self,
         G: nx.DiGraph,
@@ -141,7 +359,9 @@ class OntologyVisualiser:
         layout: str = 'spring',
         show_labels: bool = True,
         show_edge_labels: bool = True,
-        dpi: int = 150
+        dpi: int = 150,
+        fast: Optional[bool] = None,
+        overlay: Optional[StyleOverlay] = None
     ) -> Optional[str]:
         """
         Render graph as static image using Matplotlib.
@@ -150,10 +370,15 @@ class OntologyVisualiser:
             G: NetworkX graph
             output_path: Path for image output (PNG/SVG)
             figsize: Figure dimensions
-            layout: Layout algorithm (spring, circular, kamada_kawai, shell)
+            layout: Layout algorithm (spring, circular, kamada_kawai, shell,
+                large for big graphs, layered for W4M/VSOM layers)
             show_labels: Show node labels
             show_edge_labels: Show edge labels
             dpi: Image resolution
+            fast: Draw nodes/edges as single collections and show only as
+                many labels as fit (default: above FAST_RENDER_NODES nodes)
+            overlay: Styles drawn over the graph's own; styled nodes and
+                edges are drawn on top
 
         Returns:
             Path to generated image
@@ -166,23 +391,64 @@ class OntologyVisualiser:
         # Calculate layout
         pos = self._calculate_layout(G, layout)
 
+        if fast is None:
+            fast = G.number_of_nodes() > self.FAST_RENDER_NODES
+        if fast:
+            self._draw_collections(ax, G, pos, figsize, show_labels, show_edge_labels, overlay)
+        else:
+            self._draw_networkx(G, pos, ax, show_labels, show_edge_labels, overlay)
+
+        # Add legend
+        self._add_legend(ax, G)
+
+        # Add title
+        title = G.graph.get('name', 'Ontology Graph')
+        ax.set_title(title, fontsize=16, fontweight='bold')
+        ax.axis('off')
+
+        plt.tight_layout()
+
+        # Save or show
+        if output_path:
+            plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
+            plt.close()
+            return output_path
+        else:
+            plt.show()
+            return None
+
+    def _draw_networkx(
+        self,
+        G: nx.DiGraph,
+        pos: Dict,
+        ax,
+        show_labels: bool,
+        show_edge_labels: bool,
+        overlay: Optional[StyleOverlay] = None
+    ) -> None:
+        """Draw with the networkx helpers (one artist per label and arrow)."""
+        node_items, edge_items = _styled_items(G, overlay)
+
         # Get node colors and sizes
-        node_colors = [G.nodes[n].get('color', '#607D8B') for n in G.nodes()]
-        node_sizes = [self._get_node_size(G.nodes[n].get('node_type', 'entity')) * 20 for n in G.nodes()]
+        node_colors = [data.get('color', '#607D8B') for _, data in node_items]
+        node_sizes = [self._get_node_size(data.get('node_type', 'entity')) * 20 for _, data in node_items]
 
         # Draw nodes
         nx.draw_networkx_nodes(
             G, pos,
+            nodelist=[node for node, _ in node_items],
             node_color=node_colors,
             node_size=node_sizes,
             ax=ax
         )
 
         # Draw edges
-        edge_colors = [G.edges[e].get('color', '#666666') for e in G.edges()]
+        edge_colors = [data.get('color', '#666666') for _, _, data in edge_items]
         nx.draw_networkx_edges(
             G, pos,
+            edgelist=[(u, v) for u, v, _ in edge_items],
             edge_color=edge_colors,
+            width=[data.get('width', 1.0) for _, _, data in edge_items],
             arrows=True,
             arrowsize=15,
             ax=ax
@@ -207,97 +473,178 @@ class OntologyVisualiser:
                 ax=ax
             )
 
-        # Add legend
-        self._add_legend(ax, G)
-
-        # Add title
-        title = G.graph.get('name', 'Ontology Graph')
-        ax.set_title(title, fontsize=16, fontweight='bold')
-        ax.axis('off')
+    def _draw_collections(
+        self,
+        ax,
+        G: nx.DiGraph,
+        pos: Dict,
+        figsize: tuple,
+        show_labels: bool,
+        show_edge_labels: bool,
+        overlay: Optional[StyleOverlay] = None
+    ) -> None:
+        """
+        Draw nodes, edges and arrowheads as three collections built from arrays.
 
-        plt.tight_layout()
+        Labels are culled to LABELS_PER_SQ_INCH (EDGE_LABELS_PER_SQ_INCH for
+        edges) of figure area: at most one per grid cell, higher-degree
+        nodes first. Above RASTERIZE_ELEMENTS the collections are rasterized
+        so vector output stays small; labels remain text.
+        """
+        node_items, edge_data = _styled_items(G, overlay)
+        if not node_items:
+            return
+        nodes = [node for node, _ in node_items]
+        node_data = [data for _, data in node_items]
+        index = {node: i for i, node in enumerate(nodes)}
+        xy = np.array([pos[node] for node in nodes], dtype=float)
+
+        rasterized = len(nodes) + G.number_of_edges() > self.RASTERIZE_ELEMENTS
+        colors = _rgba([data.get('color', '#607D8B') for data in node_data])
+        sizes = np.array([self._get_node_size(data.get('node_type', 'entity')) for data in node_data]) * 20
+        ax.scatter(xy[:, 0], xy[:, 1], s=sizes, c=colors, linewidths=0, zorder=2, rasterized=rasterized)
+
+        if edge_data:
+            src = np.fromiter((index[u] for u, _, _ in edge_data), dtype=np.int64, count=len(edge_data))
+            dst = np.fromiter((index[v] for _, v, _ in edge_data), dtype=np.int64, count=len(edge_data))
+            edge_colors = _rgba([data.get('color', '#666666') for _, _, data in edge_data])
+            ax.add_collection(LineCollection(
+                np.stack([xy[src], xy[dst]], axis=1), colors=edge_colors, zorder=1,
+                linewidths=[data.get('width', 0.8) for _, _, data in edge_data],
+                rasterized=rasterized
+            ))
+
+            # Arrowheads: one triangle per edge, just short of the target
+            delta = xy[dst] - xy[src]
+            length = np.maximum(np.hypot(delta[:, 0], delta[:, 1]), 1e-12)
+            unit = delta / length[:, None]
+            normal = np.stack([-unit[:, 1], unit[:, 0]], axis=1)
+            extent = max(np.ptp(xy, axis=0).max(), 1e-12)
+            head = np.minimum(0.012 * extent, 0.3 * length)[:, None]
+            tip = xy[dst] - unit * np.minimum(0.01 * extent, 0.3 * length)[:, None]
+            base = tip - unit * head
+            triangles = np.stack([tip, base + normal * head / 2, base - normal * head / 2], axis=1)
+            ax.add_collection(PolyCollection(
+                triangles, facecolors=edge_colors, linewidths=0, zorder=1, rasterized=rasterized
+            ))
+        ax.autoscale_view()
+
+        area = figsize[0] * figsize[1]
+        degree = np.bincount(np.concatenate([src, dst]), minlength=len(nodes)) if edge_data else np.zeros(len(nodes))
+        if show_labels:
+            for i in _cull_labels(xy, degree, int(self.LABELS_PER_SQ_INCH * area)):
+                ax.text(xy[i, 0], xy[i, 1], node_data[i].get('label', str(nodes[i])),
+                        fontsize=self.DEFAULT_FONT_SIZE, ha='center', va='center', clip_on=True, zorder=3)
 
-        # Save or show
-        if output_path:
-            plt.savefig(output_path, dpi=dpi, bbox_inches='tight')
-            plt.close()
-            return output_path
-        else:
-            plt.show()
-            return None
+        if show_edge_labels and edge_data:
+            middle = (xy[src] + xy[dst]) / 2
+            for i in _cull_labels(middle, degree[src] + degree[dst], int(self.EDGE_LABELS_PER_SQ_INCH * area)):
+                if label := edge_data[i][2].get('label', ''):
+                    ax.text(middle[i, 0], middle[i, 1], label, fontsize=self.DEFAULT_FONT_SIZE - 2,
+                            ha='center', va='center', clip_on=True, zorder=3)
 
     def filter_by_domain(
         self,
         G: nx.DiGraph,
         domain: str,
-        include_connected: bool = True
+        include_connected: bool = True,
+        copy: bool = False
     ) -> nx.DiGraph:
         """
         Filter graph to show only nodes from a specific domain.
 
+        Domains come from the graph's domain index (see domain_index), which
+        is built on the first call and reused afterwards.
+
         Args:
             G: Source graph
             domain: Domain to filter (VE, CE, Agent, etc.)
             include_connected: Include nodes connected to domain nodes
+            copy: Return an independent graph instead of a read-only view
 
         Returns:
-            Filtered subgraph
+            Filtered subgraph (a view of G unless copy=True)
         """
-        domain_nodes: Set[str] = set()
-
-        # Find nodes matching domain
-        for node, data in G.nodes(data=True):
-            node_domain = self._infer_domain(node, data)
-            if node_domain == domain:
-                domain_nodes.add(node)
+        domain_nodes: Set[str] = domain_index(G, self.domain_classifier).nodes(domain)
 
         # Include connected nodes if requested
         if include_connected:
+            domain_nodes = set(domain_nodes)
             for node in list(domain_nodes):
                 domain_nodes.update(G.predecessors(node))
                 domain_nodes.update(G.successors(node))
 
-        return G.subgraph(domain_nodes).copy()
+        subgraph = G.subgraph(domain_nodes)
+        return subgraph.copy() if copy else subgraph
 
-    def highlight_path(
+    def register_domain_rule(self, domain: str, rule: DomainRule, first: bool = True) -> None:
+        """
+        Add a domain classification rule, e.g. lambda node, data: 'nutri' in node.
+
+        Args:
+            domain: Domain assigned when the rule matches
+            rule: predicate(node, data) -> bool
+            first: Check before existing rules (False: after them)
+        """
+        self.domain_classifier.register(domain, rule, first)
+
+    def path_overlay(
         self,
         G: nx.DiGraph,
         start: str,
         end: str,
-        highlight_color: str = '#FF5722'
-    ) -> nx.DiGraph:
+        highlight_color: str = HIGHLIGHT_COLOR,
+        overlay: Optional[StyleOverlay] = None
+    ) -> StyleOverlay:
         """
-        Highlight shortest path between two nodes.
+        Style overlay highlighting the shortest path between two nodes.
+
+        G is not modified or copied; pass the overlay to a renderer
+        (overlay=...). Reusing one overlay across calls collects several
+        paths for a single render.
 
         Args:
             G: Source graph
             start: Start node ID
             end: End node ID
             highlight_color: Color for highlighted path
+            overlay: Overlay to add the path to (default: a new one)
 
         Returns:
-            Graph with highlighted path
+            Overlay with the path's nodes and edges styled
         """
-        H = G.copy()
+        overlay = overlay if overlay is not None else StyleOverlay()
 
         try:
             path = nx.shortest_path(G, start, end)
+            overlay.add_path(path, highlight_color, G=G)
+        except nx.NetworkXNoPath:
+            print(f"No path found between {start} and {end}")
 
-            # Highlight path nodes
-            for node in path:
-                H.nodes[node]['color'] = highlight_color
-                H.nodes[node]['highlighted'] = True
+        return overlay
 
-            # Highlight path edges
-            for i in range(len(path) - 1):
-                if H.has_edge(path[i], path[i+1]):
-                    H.edges[path[i], path[i+1]]['color'] = highlight_color
-                    H.edges[path[i], path[i+1]]['width'] = 4
+    def highlight_path(
+        self,
+        G: nx.DiGraph,
+        start: str,
+        end: str,
+        highlight_color: str = HIGHLIGHT_COLOR
+    ) -> nx.DiGraph:
+        """
+        Highlight shortest path between two nodes.
 
-        except nx.NetworkXNoPath:
-            print(f"No path found between {start} and {end}")
+        Copies the graph; use path_overlay to highlight without copying.
 
-        return H
+        Args:
+            G: Source graph
+            start: Start node ID
+            end: End node ID
+            highlight_color: Color for highlighted path
+
+        Returns:
+            Graph with highlighted path
+        """
+        return self.path_overlay(G, start, end, highlight_color).apply(G)
 
     def _build_node_tooltip(self, node: str, data: Dict) -> str:
         """Build HTML tooltip for node."""
@@ -328,62 +675,23 @@ class OntologyVisualiser:
 
     def _get_node_size(self, node_type: str) -> int:
         """Get node size based on type."""
-        sizes = {
-            'agent': 40,
-            'ontology': 35,
-            've_layer': 45,
-            'entity': 25,
-            'external': 20
-        }
-        return sizes.get(node_type, self.DEFAULT_NODE_SIZE)
+        return NODE_SIZES.get(node_type, self.DEFAULT_NODE_SIZE)
 
     def _get_node_shape(self, node_type: str) -> str:
         """Get node shape based on type."""
-        shapes = {
-            'agent': 'star',
-            'ontology': 'database',
-            've_layer': 'box',
-            'entity': 'dot',
-            'external': 'triangle'
-        }
-        return shapes.get(node_type, 'dot')
+        return NODE_SHAPES.get(node_type, 'dot')
 
     def _get_edge_width(self, edge_type: str) -> int:
         """Get edge width based on type."""
-        widths = {
-            'relationship': 2,
-            'inheritance': 1,
-            'binding': 3,
-            'value_chain': 4
-        }
-        return widths.get(edge_type, self.DEFAULT_EDGE_WIDTH)
+        return EDGE_WIDTHS.get(edge_type, self.DEFAULT_EDGE_WIDTH)
 
     def _calculate_layout(self, G: nx.DiGraph, layout: str) -> Dict:
-        """Calculate node positions using specified layout."""
-        layouts = {
-            'spring': lambda: nx.spring_layout(G, k=2, iterations=50),
-            'circular': lambda: nx.circular_layout(G),
-            'kamada_kawai': lambda: nx.kamada_kawai_layout(G),
-            'shell': lambda: nx.shell_layout(G),
-            'spectral': lambda: nx.spectral_layout(G)
-        }
-        return layouts.get(layout, layouts['spring'])()
+        """Calculate node positions using specified layout (cached by graph structure)."""
+        return self.layout_engine.compute(G, layout)
 
     def _infer_domain(self, node: str, data: Dict) -> str:
         """Infer domain from node data."""
-        node_lower = str(node).lower()
-        label_lower = data.get('label', '').lower()
-
-        if 'agent' in node_lower or data.get('node_type') == 'agent':
-            return 'Agent'
-        elif any(x in node_lower for x in ['vsom', 'vesm', 'value']):
-            return 'VE'
-        elif any(x in node_lower for x in ['context', 'org']):
-            return 'CE'
-        elif data.get('entity_type') == 'Framework':
-            return 'Framework'
-        else:
-            return 'Core'
+        return self.domain_classifier.classify(node, data)
 
     def _add_legend(self, ax, G: nx.DiGraph) -> None:
         """Add legend to matplotlib figure."""
@@ -400,6 +708,35 @@ class OntologyVisualiser:
             ax.legend(handles=patches, loc='upper left', fontsize=10)
 
 
+def _styled_items(G: nx.DiGraph, overlay: Optional[StyleOverlay]) -> tuple:
+    """Node and edge (id, data) lists with overlay styles merged, styled items last (drawn on top)."""
+    node_items = list(iter_styled_nodes(G, overlay))
+    edge_items = list(iter_styled_edges(G, overlay))
+    if overlay:
+        node_items.sort(key=lambda item: item[0] in overlay.nodes)
+        edge_items.sort(key=lambda item: (item[0], item[1]) in overlay.edges)
+    return node_items, edge_items
+
+
+def _rgba(colors: List[str]) -> 'np.ndarray':
+    """RGBA array for color specs, converting each distinct value once."""
+    unique, inverse = np.unique(np.asarray(colors, dtype=object).astype(str), return_inverse=True)
+    return to_rgba_array(list(unique))[inverse]
+
+
+def _cull_labels(xy: 'np.ndarray', priority: 'np.ndarray', budget: int) -> 'np.ndarray':
+    """Indices of at most budget points, one per grid cell, highest priority first."""
+    if len(xy) <= budget:
+        return np.arange(len(xy))
+    cells = max(int(budget ** 0.5), 1)
+    low = xy.min(axis=0)
+    span = np.maximum(np.ptp(xy, axis=0), 1e-12)
+    cell = np.minimum(((xy - low) / span * cells).astype(np.int64), cells - 1)
+    order = np.argsort(-priority, kind='stable')
+    _, first = np.unique(cell[order, 0] * cells + cell[order, 1], return_index=True)
+    return order[np.sort(first)]
+
+
 def render_interactive(G: nx.DiGraph, output_path: str = None) -> str:
     """Convenience function for interactive HTML rendering."""
     vis = OntologyVisualiser()
@@ -415,15 +752,17 @@ def render_static(G: nx.DiGraph, output_path: str = None) -> str:
 if __name__ == "__main__":
     import sys
     from graph_builder import build_ontology_graph
+    from ontology_cache import default_cache
+    from layout_engine import default_layout_cache
 
     if len(sys.argv) < 2:
         print("Usage: python visualiser.py <ontology_file.json> [output.html|output.png]")
         sys.exit(1)
 
-    G = build_ontology_graph(sys.argv[1])
+    G = build_ontology_graph(sys.argv[1], cache=default_cache())
     output = sys.argv[2] if len(sys.argv) > 2 else None
 
-    vis = OntologyVisualiser()
+    vis = OntologyVisualiser(layout_engine=LayoutEngine(default_layout_cache()))
 
     if output and output.endswith(('.png', '.svg', '.pdf')):
         path = vis.render_matplotlib(G, output)